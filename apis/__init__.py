@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from auth.auth_bearer import JWTBearer
+from db import get_pool_stats
+from services.counter import postCounterService
 
 router = APIRouter(
     prefix="",
@@ -11,3 +15,15 @@ router = APIRouter(
 @router.get("/")
 async def root():
     return {'hello': 'world'}
+
+
+# DB 커넥션 풀 상태 (checkedOut, overflow, 대기 시간)
+@router.get("/db/pool", dependencies=[Depends(JWTBearer())])
+async def get_db_pool():
+    return get_pool_stats()
+
+
+# 게시물 카운터 쓰기 지연 상태 (반영 대기 게시물 수, 반영 횟수)
+@router.get("/counter/stats", dependencies=[Depends(JWTBearer())])
+async def get_counter_stats():
+    return postCounterService.stats()
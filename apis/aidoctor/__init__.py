@@ -1,19 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
-from starlette.status import HTTP_400_BAD_REQUEST, HTTP_406_NOT_ACCEPTABLE
+from fastapi import APIRouter, HTTPException, Depends, Response
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_406_NOT_ACCEPTABLE, HTTP_503_SERVICE_UNAVAILABLE
 from auth.auth_bearer import JWTBearer
-from services.aidoctor import AiDoctorService
+from services.aidoctor import AiDoctorService, StubLLM
+from services.vectorstore import vectorStoreService, VectorStoreNotReady
+from services.embedding import embeddingService
+from services.answercache import answerCacheService
 from schemas.aidoctor import *
 from typing import Optional
+import asyncio
 
 from error.exception.customerror import *
-from constants.path import *
-import os
-import pandas as pd
-from langchain_openai import ChatOpenAI
-from langchain.docstore.document import Document
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain_community.vectorstores.utils import DistanceStrategy
 from core.env import env
 
 
@@ -24,50 +20,51 @@ router = APIRouter(
 )
 
 
-def create_vectordb():
-    # 임베딩 모델 초기화
-    embeddings_model = HuggingFaceEmbeddings(
-        model_name='jhgan/ko-sbert-nli',
-        model_kwargs={'device': 'cpu'},
-        encode_kwargs={'normalize_embeddings': True}
-    )
+# 임베딩 모델과 FAISS 인덱스는 import 시 불러오지 않는다. (services/vectorstore.py)
+# 서버 시작 후 백그라운드에서 불러오고, 준비되기 전에는 /chat이 503을 반환한다.
+_llm = None
 
-    if not os.path.exists(f'{ASSET_DIR}/faiss_index'):
-        file_path = os.path.join(AIDOCTOR_DIR, "data.csv")
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
 
-        # Document 객체 생성 (메타데이터 포함)
-        documents = [
-            Document(
-                page_content=row['질문'],
-                metadata={'탭': row['탭'], '질문': row['질문'], '답변': row['답변']}
-            ) for _, row in df.iterrows()
-        ]
+# AIDOCTOR_LLM=stub이면 OpenAI 대신 테스트용 LLM을 사용한다.
+def get_llm():
+    global _llm
+    if _llm is None and env.get("AIDOCTOR_LLM") == "stub":
+        _llm = StubLLM()
+    if _llm is None:
+        from langchain_openai import ChatOpenAI
 
-        # FAISS 벡터 저장소 생성
-        vectorstore = FAISS.from_documents(documents,
-                                           embedding=embeddings_model,
-                                           distance_strategy=DistanceStrategy.COSINE)
+        _llm = ChatOpenAI(
+            model='gpt-4o',
+            temperature=0,
+            max_tokens=500,
+            openai_api_key=env.get("OPEN_API_KEY")
+        )
+    return _llm
 
-        vectorstore.save_local(f'{ASSET_DIR}/faiss_index')
 
-    else:
-        vectorstore = FAISS.load_local(
-            f'{ASSET_DIR}/faiss_index', embeddings=embeddings_model, allow_dangerous_deserialization=True)
+aiDoctorService = AiDoctorService()
 
-    return vectorstore
 
+@router.get("/ready")
+async def get_ready(response: Response) -> VectorStoreStatusOutput:
+    '''
+    AI 의사 준비 상태 (벡터 저장소를 불러오는 중이면 503)
+    '''
+    if not vectorStoreService.ready:
+        vectorStoreService.warmup()
+        response.status_code = HTTP_503_SERVICE_UNAVAILABLE
 
-vectorstore = create_vectordb()
+    return vectorStoreService.status()
 
 
-llm = ChatOpenAI(
-    model='gpt-4o',
-    temperature=0,
-    max_tokens=500,
-    openai_api_key=env.get("OPEN_API_KEY")
-)
-aiDoctorService = AiDoctorService()
+@router.get("/stats", dependencies=[Depends(JWTBearer())])
+async def get_stats():
+    '''
+    AI 의사 캐시 상태 (질문 임베딩/답변 캐시 적중률, 묶음 처리 횟수)
+    '''
+    return {'vectorstore': vectorStoreService.status(),
+            'embedding': embeddingService.stats(),
+            'answer': answerCacheService.stats()}
 
 
 @router.post("/chat", dependencies=[Depends(JWTBearer())])
@@ -80,40 +77,69 @@ async def new_ai_chat(newAiChatInput: NewAiChatInput, parent_id: str = Depends(J
     '''
 
     try:
-        print("newAiChatInput", newAiChatInput)
+        ask = newAiChatInput.ask
+
+        # 이전 채팅 내역 가져오기 (새 채팅방이면 없음)
+        previos_chat = None
+        if newAiChatInput.chatroom_id is not None:
+            previos_chat = aiDoctorService.load_chat_history(
+                parent_id, newAiChatInput.chatroom_id)
+
+        # 이전 채팅 내역이 없는 질문만 답변 캐시를 사용한다.
+        cacheable = previos_chat is None or not previos_chat["chat_history"]
+        cached = answerCacheService.get(ask) if cacheable else None
+
+        embedding = None
+        if cached is None:
+            # 벡터 저장소가 준비되지 않았으면 바로 503
+            vectorstore = vectorStoreService.get()
+
+            # 질문 임베딩은 캐시/묶음 처리 후 전용 스레드에서 계산
+            embedding = await embeddingService.embed(ask)
+            if cacheable:
+                cached = answerCacheService.get_similar(embedding)
+
         # 채팅방 유무 확인(존재하지 않을 경우 생성, 존재할 경우 가져오기)
         room_id = aiDoctorService.create_aichatroom(
             parent_id, newAiChatInput.chatroom_id)
 
-        # RAG에서 k는 5로 설정되어 있음 수정 가능
-        result = aiDoctorService.search_in_rag(
-            vectorstore, newAiChatInput.ask, 5)
+        if cached is not None:
+            # 같은/비슷한 질문의 답변이 있으면 RAG와 LLM을 건너뛴다.
+            llm_prompt = cached["prompt"]
+            response = cached["response"]
 
-        # 프롬프트의 context 부분 생성
-        llm_prompt = aiDoctorService.format_for_llm_prompt(result)
+        else:
+            # RAG에서 k는 5로 설정되어 있음 수정 가능
+            result = await asyncio.to_thread(
+                aiDoctorService.search_in_rag, vectorstore, ask, 5, embedding)
 
-        # 이전 채팅 내역 가져오기
-        previos_chat = aiDoctorService.load_chat_history(
-            parent_id, newAiChatInput.chatroom_id)
-        print("previos_chat", previos_chat)
+            # 프롬프트의 context 부분 생성
+            llm_prompt = aiDoctorService.format_for_llm_prompt(result)
+
+            previos_prompt = "이전 채팅 내역:\n"
 
-        previos_prompt = "이전 채팅 내역:\n"
+            # 이전 채팅 내역이 있을 경우 이전 채팅 내역을 추가하여 질문 생성
+            if previos_chat != None and 'chat_history' in previos_chat:
+                # 각 chat의 ask와 res를 가져와서 previos_prompt에 추가
+                for chat in previos_chat["chat_history"]:
+                    previos_prompt += f"\n질문: {chat.ask}\n답변: {chat.res}\n"
 
-        # 이전 채팅 내역이 있을 경우 이전 채팅 내역을 추가하여 질문 생성
-        if previos_chat != None and 'chat_history' in previos_chat:
-            print("previos_chat", previos_chat)
-            # 각 chat의 ask와 res를 가져와서 previos_prompt에 추가
-            for chat in previos_chat["chat_history"]:
-                previos_prompt += f"\n질문: {chat.ask}\n답변: {chat.res}\n"
+                llm_prompt = previos_prompt + "\n" + llm_prompt
 
-            llm_prompt = previos_prompt + "\n" + llm_prompt
+            response = await asyncio.to_thread(
+                aiDoctorService.ask_gpt, get_llm(), llm_prompt, ask)
 
-        response = aiDoctorService.ask_gpt(llm, llm_prompt, newAiChatInput.ask)
+            if cacheable:
+                answerCacheService.set(
+                    ask, embedding, {"prompt": llm_prompt, "response": response})
 
         # 채팅방에 채팅 추가
         chat = aiDoctorService.add_chat(
-            parent_id, room_id, newAiChatInput.ask, response, "강남대학교")
+            parent_id, room_id, ask, response, "강남대학교")
 
+    except VectorStoreNotReady as error:
+        raise HTTPException(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE, detail=error.message)
     except CustomException as error:
         raise HTTPException(
             status_code=HTTP_406_NOT_ACCEPTABLE, detail=error.message)
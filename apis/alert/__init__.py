@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_406_NOT_ACCEPTABLE
 from auth.auth_bearer import JWTBearer
 from services.alert import AlertService
+from services.alertqueue import alertQueueService
 from schemas.alert import *
 from typing import Optional
 
@@ -77,6 +78,61 @@ async def alert(parent_id: str = Depends(JWTBearer())) -> GetAlertOutput:
             }
 
 
+@router.get("/unread", dependencies=[Depends(JWTBearer())])
+async def unread_count(parent_id: str = Depends(JWTBearer())) -> GetUnreadCountOutput:
+    '''
+    확인하지 않은 알림 수 조회
+    input:
+        - parent_id: 부모 id
+    output:
+        - unread: 확인하지 않은 알림 수
+    '''
+
+    try:
+        result = alertService.get_unread_count(parent_id)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail="Failed to get unread count")
+
+    return {"status": 200, "unread": result}
+
+
+@router.get("/page", dependencies=[Depends(JWTBearer())])
+async def alert_page(size: int = 20, cursor: Optional[str] = None, unchecked: bool = True,
+                     parent_id: str = Depends(JWTBearer())) -> GetAlertPageOutput:
+    '''
+    알림 리스트 페이지 조회 (최신순)
+    input:
+        - size: 가져올 알림 수
+        - cursor: 이전 결과의 nextCursor
+        - unchecked: True면 확인하지 않은 알림만
+        - parent_id: 부모 id
+    output:
+        - 알림 리스트, nextCursor
+    '''
+
+    try:
+        if size < 1 or size > 100:
+            raise CustomException("size must be between 1 and 100")
+
+        result = alertService.get_alert_page(parent_id, size, cursor, unchecked)
+
+    except CustomException as error:
+        raise HTTPException(
+            status_code=HTTP_406_NOT_ACCEPTABLE, detail=error.message)
+    except Exception as e:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail="Failed to get alert")
+
+    return {"status": 200,
+            "message": "Successfully get alerts",
+            "createTime": datetime.now(),
+            "alerts": result['alerts'],
+            "nextCursor": result['nextCursor']
+            }
+
+
 @router.get("/subscribe/{creater_id}", dependencies=[Depends(JWTBearer())])
 async def toggle_subscribe(creater_id: str, parent_id: str = Depends(JWTBearer())) -> GetToggleSubscribeOutput:
     '''
@@ -131,3 +187,15 @@ async def has_subscribe(creater_id: str, parent_id: str = Depends(JWTBearer()))
     return {"state": result,
             "message": f"Successfully get subscribe {creater_id} status" if result else f"Successfully get unsubscribe {creater_id} status"
             }
+
+
+@router.get("/queue/stats", dependencies=[Depends(JWTBearer())])
+async def alert_queue_stats():
+    '''
+    알림 생성 큐 상태
+    output:
+        - enabled: 큐 사용 여부
+        - queued: 처리 대기 이벤트 수
+        - published, processed, inserted, failures
+    '''
+    return alertQueueService.stats()
@@ -5,7 +5,8 @@ from typing import List, Optional, Dict
 from fastapi import Query
 import json
 
-from services.chat import ChatService
+from services.chat import chatService
+from services.chatprotocol import ChatProtocol
 # from services.postmain import PostMainService
 # from schemas.search import *
 # from schemas.postmain import *
@@ -18,18 +19,45 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-chat_service = ChatService()
+chat_service = chatService
+
+
+# 채팅 연결/백플레인 상태 (이 워커의 연결 수, 전달/저장한 메시지 수)
+@router.get("/stats", dependencies=[Depends(JWTBearer())])
+async def get_chat_stats():
+    return chat_service.get_stats()
 
 @router.websocket("/ws/{parent_id}")
 async def websocket_endpoint(
     websocket: WebSocket, 
-    parent_id: str
+    parent_id: str,
+    v: int = 1,
+    encoding: str = 'json'
 ):
-    
+    '''
+    채팅 웹소켓
+    --input
+        - parent_id: 부모 아이디
+        - v: 프로토콜 버전 (1: 기존 문자열 메시지, 2: 봉투/ack/여러 메시지 프레임)
+        - encoding: v2 프레임 인코딩 ('json' | 'msgpack')
+    '''
     client_id = parent_id
     
     try:
-        await chat_service.connect(websocket, client_id)
+        protocol = ChatProtocol(v, encoding)
+        await chat_service.connect(websocket, client_id, protocol)
+
+        # v2: {"v": 2, "type": "chat", "id": ..., "room_id": ..., "chatType": ..., "content": ...}
+        if protocol.enveloped:
+            chat_service.send_message(websocket, {'type': 'connected', 'node': chat_service.node_id,
+                                           'encoding': protocol.encoding})
+            while True:
+                frame = await websocket.receive()
+                if frame['type'] == 'websocket.disconnect':
+                    raise WebSocketDisconnect(frame.get('code', 1000))
+                await chat_service.handle_frame(
+                    websocket, client_id, frame.get('bytes') or frame.get('text'))
+
         await websocket.send_text("connected")
         while True:
             data = await websocket.receive_text()
@@ -42,12 +70,16 @@ async def websocket_endpoint(
                 await websocket.send_text(status)
                 print(f"Sending status: {status}")
             else:
-                await chat_service.broadcast(client_id, json.dumps(json_data))
+                await chat_service.broadcast(client_id, json_data)
 
     except CustomException as e:
-        chat_service.disconnect(websocket)
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST, detail=e.message)
     
     except WebSocketDisconnect:
-        chat_service.disconnect(websocket)
\ No newline at end of file
+        pass
+
+    finally:
+        # 어떤 오류로 끝나든 연결과 접속 정보(presence)를 정리한다.
+        # (남아 있으면 다른 워커에서도 중복 접속으로 거부된다)
+        await chat_service.disconnect(websocket)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_406_NOT_ACCEPTABLE
 from auth.auth_bearer import JWTBearer
-from typing import List
+from typing import List, Optional
 
 from services.chatroom import ChatRoomService
 from schemas.chatroom import *
@@ -130,6 +130,40 @@ async def update_chatroom(updateChatRoomInput:UpdateChatRoomInput, parent_id: st
     
     return { 'success': 200 if chatroom else 403 }
 
+# 채팅방 채팅 기록 조회 (chat_id 커서)
+@router.get("/history/{chatroom_id}", dependencies=[Depends(JWTBearer())])
+async def get_chatroom_history(chatroom_id: int, size: int = 20, cursor: Optional[int] = None,
+                               parent_id: str = Depends(JWTBearer())) -> GetChatHistoryOutput:
+    '''
+    채팅방 채팅 기록 조회
+    --input
+        - chatroom_id: 채팅방 아이디
+        - size: 가져올 채팅 수 (1 ~ 100)
+        - cursor: 이 chat_id 이전의 채팅을 가져온다. 없으면 최근 채팅
+        - parent_id: 부모 아이디
+    --output
+        - chatList: 채팅 리스트 (최근 순)
+        - nextCursor: 다음 페이지 커서
+    '''
+    try:
+        if size < 1 or size > 100:
+            raise CustomException("size must be between 1 and 100")
+
+        result = chatRoomService.getChatHistory(chatroom_id, parent_id, size, cursor)
+
+    except CustomException as e:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail=e.message)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail="Failed to get chatroom history")
+
+    return { 'status': 'success' if result['chats'] else 'failed',
+            'chatroom_id': chatroom_id,
+            'chatList': result['chats'],
+            'nextCursor': result['nextCursor'] }
+
 # 채팅방 채팅 내용 조회
 @router.get("/{chatroom_id}/{chat_id}", dependencies=[Depends(JWTBearer())])
 async def get_chatroom_chat(chatroom_id: int, chat_id: str, parent_id: str = Depends(JWTBearer())):
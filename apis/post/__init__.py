@@ -8,6 +8,9 @@ from db import get_db_session
 from services.setting import SettingService
 from services.postmain import PostMainService
 from services.post import PostService
+from services.postsummary import PostSummaryService
+from services.counter import postCounterService
+from services.viewerstate import viewerStateService
 from schemas.post import *
 from error.exception.customerror import *
 
@@ -18,17 +21,16 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-db = get_db_session()
-
 postService = PostService()
 settingService = SettingService()
 postMainService = PostMainService()
+postSummaryService = PostSummaryService()
 
 
-# 게시물 생성
+# 게시물 생성 (요약/검색/해시태그 인덱싱과 타임라인 fan-out이 동기 DB 작업이므로 스레드풀에서 실행)
 @router.post("/create", dependencies=[Depends(JWTBearer())])
-async def create_post(createPostInput: CreatePostInput,
-                      parent_id: str = Depends(JWTBearer())) -> CreatePostOutput:
+def create_post(createPostInput: CreatePostInput,
+                parent_id: str = Depends(JWTBearer())) -> CreatePostOutput:
     try:
         post = postService.createPost(parent_id, createPostInput)
     except CustomException as error:
@@ -97,12 +99,12 @@ async def get_post(post_id: str, parent_id: str = Depends(JWTBearer())):
     return post
 
 
-# 게시물 수정
+# 게시물 수정 (동기 세션과 파일 쓰기를 사용하므로 스레드풀에서 실행)
 @router.put("/update/{post_id}", dependencies=[Depends(JWTBearer())])
-async def update_post(updatePostInput: UpdatePostInput,
+def update_post(updatePostInput: UpdatePostInput,
                       parent_id: str = Depends(JWTBearer())) -> UpdatePostOutput:
     try:
-        post = await postService.updatePost(updatePostInput, parent_id)
+        post = postService.updatePost(updatePostInput, parent_id)
     except CustomException as error:
         raise HTTPException(
             status_code=HTTP_406_NOT_ACCEPTABLE, detail=str(error))
@@ -113,13 +115,13 @@ async def update_post(updatePostInput: UpdatePostInput,
     return {"success": 200 if post else 403, "post": post}
 
 
-# 게시물 post 사진 수정
+# 게시물 post 사진 수정 (스레드풀에서 실행)
 @router.put("/photoUpdate/{post_id}", dependencies=[Depends(JWTBearer())])
-async def update_post_photo(fileList: List[UploadFile],
+def update_post_photo(fileList: List[UploadFile],
                             post_id: int,
                             parent_id: str = Depends(JWTBearer())) -> UpdatePhotoOutput:
     try:
-        success = await postService.updatePhoto(fileList, post_id, parent_id)
+        success = postService.updatePhoto(fileList, post_id, parent_id)
     except CustomException as error:
         raise HTTPException(
             status_code=HTTP_406_NOT_ACCEPTABLE, detail=str(error))
@@ -130,12 +132,12 @@ async def update_post_photo(fileList: List[UploadFile],
     return {'success': success, 'message': 'Success to update photo'}
 
 
-# 게시물 삭제
+# 게시물 삭제 (스레드풀에서 실행)
 @router.delete("/delete/{post_id}", dependencies=[Depends(JWTBearer())])
-async def delete_post(deletePostInput: DeletePostInput,
+def delete_post(deletePostInput: DeletePostInput,
                       parent_id: str = Depends(JWTBearer())) -> DeletePostOutput:
     try:
-        success = await postService.deletePost(deletePostInput, parent_id)
+        success = postService.deletePost(deletePostInput, parent_id)
     except CustomException as error:
         raise HTTPException(
             status_code=HTTP_406_NOT_ACCEPTABLE, detail=str(error))
@@ -146,6 +148,27 @@ async def delete_post(deletePostInput: DeletePostInput,
     return {"success": 200 if success else 403, "post": success}
 
 
+# 여러 게시물의 하트/스크랩/조회 여부 한 번에 가져오기
+@router.post("/state", dependencies=[Depends(JWTBearer())])
+async def get_post_state(getPostStateInput: GetPostStateInput,
+                         parent_id: str = Depends(JWTBearer())) -> GetPostStateOutput:
+    try:
+        if len(getPostStateInput.post_ids) > 100:
+            raise CustomException("Too many post_ids (max 100)")
+
+        states = viewerStateService.getStates(
+            parent_id, getPostStateInput.post_ids)
+    except CustomException as error:
+        raise HTTPException(
+            status_code=HTTP_406_NOT_ACCEPTABLE, detail=error.message)
+    except Exception:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail="Failed to get post state")
+
+    return {"status": 200,
+            "states": [{"post_id": post_id, **state} for post_id, state in states.items()]}
+
+
 # 해당 부모의 프로필과 모든 게시물 가져오기
 @router.get("/poster/profile/{parent_id}", dependencies=[Depends(JWTBearer())])
 async def get_poster_profile(parent_id: str) -> GetPosterProfileOutput:
@@ -154,6 +177,8 @@ async def get_poster_profile(parent_id: str) -> GetPosterProfileOutput:
         if parent_id is None:
             raise CustomException("parent_id is required")
 
+        db = get_db_session()
+
         # 존재하지 않는 부모일 경우 에러
         parent = db.query(ParentTable).filter(
             ParentTable.parent_id == parent_id).first()
@@ -163,6 +188,8 @@ async def get_poster_profile(parent_id: str) -> GetPosterProfileOutput:
         counts = settingService.getOverview(parent_id)
         posts = db.query(PostTable).filter(
             PostTable.parent_id == parent_id).all()
+        summaries = postSummaryService.getSummaries(
+            [post.post_id for post in posts])
 
     except CustomException as error:
         raise HTTPException(
@@ -172,6 +199,7 @@ async def get_poster_profile(parent_id: str) -> GetPosterProfileOutput:
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST, detail="Failed to get poster profile")
 
+    postCounts = {post.post_id: postCounterService.getCounts(post) for post in posts}
     result = {'parent': {
         "parentId": parent_id,
         "photoId": parent_id + ".jpeg",
@@ -181,13 +209,11 @@ async def get_poster_profile(parent_id: str) -> GetPosterProfileOutput:
         "friendCount": counts['friendCount'],
         "myStoryCount": counts['myStoryCount']},
         'posts': [{"postid": post.post_id,
-                   **dict(zip(["photoId", "desc"], postMainService._get_photoId_and_desc(
-                       open(os.path.join(POST_CONTENT_DIR,
-                            f"{post.post_id}.txt"), 'r', encoding='UTF-8').read()
-                   ))),
+                   "photoId": summaries[post.post_id]['photoId'],
+                   "desc": summaries[post.post_id]['desc'],
                    "title": post.title,
-                   "pHeart": post.pHeart if post.pHeart else 0,
-                   "comment": post.pComment if post.pComment else 0,
+                   "pHeart": postCounts[post.post_id]['pHeart'],
+                   "comment": postCounts[post.post_id]['pComment'],
                    "author_name": parent.name
                    } for post in posts]
     }
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, UploadFile, HTTPException, Depends, File, Header
+from fastapi import APIRouter, UploadFile, HTTPException, Depends, File, Header, Query
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_406_NOT_ACCEPTABLE
 from auth.auth_bearer import JWTBearer
 
@@ -49,6 +49,50 @@ async def get_all_comment(post_id: int) -> GetAllPCommentOutput:
     }
 
 
+# 댓글 페이지 가져오기 (작성 순, 대댓글 수와 하트 여부 포함)
+@router.get("/page/{post_id}")
+async def get_comment_page(post_id: int, size: int = Query(20, ge=1, le=100),
+                           cursor: Optional[str] = None,
+                           parent_id: str = Depends(JWTBearer())) -> GetPCommentPageOutput:
+    try:
+        result = pcommentService.getPCommentPage(post_id, parent_id, size, cursor)
+    except CustomException as e:
+        raise HTTPException(
+            status_code=HTTP_406_NOT_ACCEPTABLE, detail=e.message)
+    except Exception:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail="Failed to get comment page")
+    return {
+        'success': 200,
+        'message': 'successfull get comment page',
+        'post_id': post_id,
+        'comments': result['comments'],
+        'nextCursor': result['nextCursor']
+    }
+
+
+# 대댓글 페이지 가져오기
+@router.get("/reply/page/{comment_id}")
+async def get_reply_comment_page(comment_id: int, size: int = Query(20, ge=1, le=100),
+                                 cursor: Optional[str] = None,
+                                 parent_id: str = Depends(JWTBearer())) -> GetReplyPCommentPageOutput:
+    try:
+        result = pcommentService.getReplyPCommentPage(comment_id, parent_id, size, cursor)
+    except CustomException as e:
+        raise HTTPException(
+            status_code=HTTP_406_NOT_ACCEPTABLE, detail=e.message)
+    except Exception:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail="Failed to get reply comment page")
+    return {
+        'success': 200,
+        'message': 'successfull get reply comment page',
+        'comment_id': comment_id,
+        'comments': result['comments'],
+        'nextCursor': result['nextCursor']
+    }
+
+
 # 댓글에 대댓글이 있는 경우 대댓글 가져오기
 @router.get("/reply", dependencies=[Depends(JWTBearer())])
 async def get_reply_comment(comment_id: int) -> List[PComment]:
@@ -53,7 +53,8 @@ async def delete_heart(deletePHeartInput: DeletePHeartInput,
         print(e)
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST, detail="Failed to delete pheart")
-    return {"success": 200, "message": "Success to delete pheart", "pheart": pheart}
+    return {"success": 200, "message": "Success to delete pheart",
+            "pheart": pheart['deleted'], "missing": pheart['missing']}
 
 
 # 하트 조회
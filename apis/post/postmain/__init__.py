@@ -3,6 +3,7 @@ from starlette.status import HTTP_400_BAD_REQUEST, HTTP_406_NOT_ACCEPTABLE
 from auth.auth_bearer import JWTBearer
 
 from services.postmain import PostMainService
+from services.banner import bannerService
 from schemas.postmain import *
 from error.exception.customerror import *
 
@@ -102,3 +103,70 @@ async def create_postmain(parent_id: str = Depends(JWTBearer())):
             'highview': createpostmainhighview,
             'hashtag': createpostmainhashtag
             }
+
+
+
+# 친구가 쓴 게시물 (커서 페이지네이션)
+@router.get("/friend_read", dependencies=[Depends(JWTBearer())])
+async def get_postmain_friend_read(size: int = -1, page: int = -1, cursor: Optional[str] = None,
+                                   parent_id: str = Depends(JWTBearer())):
+    """
+    친구가 쓴 게시물
+    --input
+        - size: 게시물 개수 default -1
+        - page: 페이지 수 default -1 (cursor가 없을 때만 사용)
+        - cursor: 이전 결과의 nextCursor
+    --output
+        - result: List<{postid, photoId, title, pHeart, comment, author_name, desc}>
+        - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
+    """
+    try:
+        result = postMainService.createPostMainFriendReadPage(
+            CreatePostMainInput(parent_id=parent_id, size=size, page=page, cursor=cursor))
+    except CustomException as error:
+        raise HTTPException(
+            status_code=HTTP_406_NOT_ACCEPTABLE, detail=error.message)
+    except Exception as error:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail=str(error))
+
+    return {'result': result['banners'], 'nextCursor': result['nextCursor']}
+
+
+# 이웃들이 쓴 게시물 (커서 페이지네이션)
+@router.get("/neighbor_post", dependencies=[Depends(JWTBearer())])
+async def get_postmain_neighbor_post(size: int = -1, page: int = -1, cursor: Optional[str] = None,
+                                     parent_id: str = Depends(JWTBearer())):
+    """
+    이웃들이 쓴 게시물
+    --input
+        - size: 게시물 개수 default -1
+        - page: 페이지 수 default -1 (cursor가 없을 때만 사용)
+        - cursor: 이전 결과의 nextCursor
+    --output
+        - result: List<{postid, photoId, title, pHeart, comment, author_name, desc}>
+        - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
+    """
+    try:
+        result = postMainService.createPostMainNeighborPage(
+            CreatePostMainInput(parent_id=parent_id, size=size, page=page, cursor=cursor))
+    except CustomException as error:
+        raise HTTPException(
+            status_code=HTTP_406_NOT_ACCEPTABLE, detail=error.message)
+    except Exception as error:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail=str(error))
+
+    return {'result': result['banners'], 'nextCursor': result['nextCursor']}
+
+# 메인페이지 배너 캐시 상태
+@router.get("/banner/stats", dependencies=[Depends(JWTBearer())])
+async def get_banner_stats():
+    """
+    메인페이지 배너 캐시 상태
+    --output
+        - hits, misses, hitRate: 메모리 캐시 적중/미스 수
+        - builds, fileLoads: 배너 계산/파일 로드 횟수
+        - window, builtAt, size: 현재 배너의 집계 기간 시작, 계산 시각, 배너 수
+    """
+    return bannerService.stats()
@@ -53,7 +53,8 @@ async def delete_pscript(deletePScriptInput: DeletePScriptInput,
         print(e)
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST, detail="Failed to delete pscript")
-    return {"success": 200, "message": "Success to delete pscript", "pscript": script}
+    return {"success": 200, "message": "Success to delete pscript",
+            "pscript": script['deleted'], "missing": script['missing']}
 
 
 # 스크립트 조회
@@ -53,4 +53,5 @@ async def delete_view(deletePViewInput: DeletePViewInput,
         print(e)
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST, detail="Failed to delete pview")
-    return {"success": 200, "message": "Success to delete pview", "pview": result}
\ No newline at end of file
+    return {"success": 200, "message": "Success to delete pview",
+            "pview": result['deleted'], "missing": result['missing']}
\ No newline at end of file
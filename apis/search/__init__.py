@@ -28,9 +28,11 @@ async def create_recommend(createSearchRecommendInput: CreateSearchRecommendInpu
         - createSearchRecommendInput.type: 짝꿍이야기, 친구이야기, 이웃이야기(friend, friend_read, neighbor)
         - createSearchRecommendInput.size: 게시물 개수
         - createSearchRecommendInput.page: 페이지 수
+        - createSearchRecommendInput.cursor: 이전 결과의 nextCursor (선택)
     --output
         - List<{postid, photoid, title, author_photo, author_name}> : 짝꿍이야기
         - List<{postid, photoid, title, heart, comment, author_name, desc}> : 친구이야기, 이웃이야기
+        - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
     """
     # 부모 아이디가 없으면 에러
     if parent_id is None:
@@ -56,10 +58,11 @@ async def create_recommend(createSearchRecommendInput: CreateSearchRecommendInpu
 
         # 짝꿍이 쓴 게시물
         if createSearchRecommendInput.type == 'friend':
-            result = postMainService.createPostMainFriendSearch(
+            result = postMainService.createPostMainFriendPage(
                 CreatePostMainInput(parent_id=parent_id,
                                     size=createSearchRecommendInput.size,
-                                    page=createSearchRecommendInput.page
+                                    page=createSearchRecommendInput.page,
+                                    cursor=createSearchRecommendInput.cursor
                                     ))
 
             if result is None:
@@ -68,10 +71,11 @@ async def create_recommend(createSearchRecommendInput: CreateSearchRecommendInpu
 
         # 친구가 쓴 게시물
         elif createSearchRecommendInput.type == 'friend_read':
-            result = postMainService.createPostMainFriendRead(
+            result = postMainService.createPostMainFriendReadPage(
                 CreatePostMainInput(parent_id=parent_id,
                                     size=createSearchRecommendInput.size,
-                                    page=createSearchRecommendInput.page
+                                    page=createSearchRecommendInput.page,
+                                    cursor=createSearchRecommendInput.cursor
                                     ))
             if result is None:
                 raise HTTPException(
@@ -79,10 +83,11 @@ async def create_recommend(createSearchRecommendInput: CreateSearchRecommendInpu
 
         # 이웃들이 쓴 게시물
         elif createSearchRecommendInput.type == 'neighbor':
-            result = postMainService.createPostMainNeighbor(
+            result = postMainService.createPostMainNeighborPage(
                 CreatePostMainInput(parent_id=parent_id,
                                     size=createSearchRecommendInput.size,
-                                    page=createSearchRecommendInput.page
+                                    page=createSearchRecommendInput.page,
+                                    cursor=createSearchRecommendInput.cursor
                                     ))
             if result is None:
                 raise HTTPException(
@@ -102,7 +107,8 @@ async def create_recommend(createSearchRecommendInput: CreateSearchRecommendInpu
 
     # 결과값 리턴
     return {
-        "result": result
+        "result": result['banners'],
+        "nextCursor": result['nextCursor']
     }
 
 
@@ -115,9 +121,11 @@ async def create_result(createSearchInput: CreateSearchInput, parent_id: str = D
         - createSearchInput.search: 검색어
         - createSearchInput.size: 게시물 개수
         - createSearchInput.page: 페이지 수
+        - createSearchInput.cursor: 이전 검색결과의 nextCursor (선택)
     --output
         - search: 검색어
         - List<{title, photoid,  author_name, heart, commnet, desc}> : 검색결과
+        - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
     """
     # 부모 아이디가 없으면 에러
     if parent_id is None:
@@ -141,7 +149,6 @@ async def create_result(createSearchInput: CreateSearchInput, parent_id: str = D
 
     try:
         # 검색 결과 생성
-        print('createSearchInput', createSearchInput)
         result = searchService.createSearch(createSearchInput)
 
     except CustomException as e:
@@ -156,5 +163,6 @@ async def create_result(createSearchInput: CreateSearchInput, parent_id: str = D
     # 검색어와 결과값 리턴
     return {
         "search": createSearchInput.search,
-        "result": result
+        "result": result['banners'],
+        "nextCursor": result['nextCursor']
     }
@@ -28,9 +28,9 @@ async def get_overview(parent_id: str = Depends(JWTBearer())) -> SettingOverview
 
 # 친구들 불러오기
 @router.get("/myfriends/{page}", dependencies=[Depends(JWTBearer())])
-async def get_my_friends(page: int, parent_id: str = Depends(JWTBearer())) -> MyFriendsOutput:
+async def get_my_friends(page: int, cursor: Optional[str] = None, parent_id: str = Depends(JWTBearer())) -> MyFriendsOutput:
     try:
-        result = settingService.getMyFriends(page, parent_id)
+        result = settingService.getMyFriends(page, parent_id, cursor)
         if (result == None):
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST, detail="Failed to get my friends")
@@ -46,9 +46,9 @@ async def get_my_friends(page: int, parent_id: str = Depends(JWTBearer())) -> My
 
 # 유저가 조회한 post
 @router.get("/myviews/{page}", dependencies=[Depends(JWTBearer())])
-async def get_my_views(page: int, parent_id: str = Depends(JWTBearer())) -> MyViewsPostOutput:
+async def get_my_views(page: int, cursor: Optional[str] = None, parent_id: str = Depends(JWTBearer())) -> MyViewsPostOutput:
     try:
-        result = settingService.getMyViews(page, parent_id)
+        result = settingService.getMyViews(page, parent_id, cursor)
         if (result == None):
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST, detail="Failed to get view post")
@@ -64,9 +64,9 @@ async def get_my_views(page: int, parent_id: str = Depends(JWTBearer())) -> MyVi
 
 # 유저가 script한 post
 @router.get("/scripts/{page}", dependencies=[Depends(JWTBearer())])
-async def get_scripts(page: int, parent_id: str = Depends(JWTBearer())) -> MyScriptsPostOutput:
+async def get_scripts(page: int, cursor: Optional[str] = None, parent_id: str = Depends(JWTBearer())) -> MyScriptsPostOutput:
     try:
-        result = settingService.getScripts(page, parent_id)
+        result = settingService.getScripts(page, parent_id, cursor)
         if (result == None):
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST, detail="Failed to get script post")
@@ -82,9 +82,9 @@ async def get_scripts(page: int, parent_id: str = Depends(JWTBearer())) -> MyScr
 
 # 유저가 좋아요한 post
 @router.get("/likes/{page}", dependencies=[Depends(JWTBearer())])
-async def get_likes(page: int, parent_id: str = Depends(JWTBearer())) -> MyLikesPostOutput:
+async def get_likes(page: int, cursor: Optional[str] = None, parent_id: str = Depends(JWTBearer())) -> MyLikesPostOutput:
     try:
-        result = settingService.getLikes(page, parent_id)
+        result = settingService.getLikes(page, parent_id, cursor)
         if (result == None):
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST, detail="Failed to get like post")
@@ -100,9 +100,9 @@ async def get_likes(page: int, parent_id: str = Depends(JWTBearer())) -> MyLikes
 
 # 유저 post
 @router.get("/mystories/{page}", dependencies=[Depends(JWTBearer())])
-async def get_my_stories(page: int, parent_id: str = Depends(JWTBearer())) -> MyStoriesOutput:
+async def get_my_stories(page: int, cursor: Optional[str] = None, parent_id: str = Depends(JWTBearer())) -> MyStoriesOutput:
     try:
-        result = settingService.getMyStories(page, parent_id)
+        result = settingService.getMyStories(page, parent_id, cursor)
         if (result == None):
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST, detail="Failed to get my post")
@@ -118,9 +118,9 @@ async def get_my_stories(page: int, parent_id: str = Depends(JWTBearer())) -> My
 
 # 유저의 짝꿍 불러오기
 @router.get("/mymates/{page}", dependencies=[Depends(JWTBearer())])
-async def get_my_mates(page: int, parent_id: str = Depends(JWTBearer())) -> MyMatesOutput:
+async def get_my_mates(page: int, cursor: Optional[str] = None, parent_id: str = Depends(JWTBearer())) -> MyMatesOutput:
     try:
-        result = settingService.getMyMates(page, parent_id)
+        result = settingService.getMyMates(page, parent_id, cursor)
         if (result == None):
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST, detail="Failed to get my mates")
@@ -0,0 +1,109 @@
+import argparse
+import os
+import time
+import numpy as np
+
+
+# 현재 AI 의사 flat 인덱스의 벡터 (rebuild.py aidoctor로 만든 인덱스)
+def load_corpus() -> np.ndarray:
+    import faiss
+    from services.vectorstore import FAISS_INDEX_DIR, read_index_name
+    from services.ragindex import read_vectors
+
+    index_name = read_index_name()
+    if index_name is None:
+        raise SystemExit("AI doctor index not found. Run: python rebuild.py aidoctor")
+    return read_vectors(faiss.read_index(os.path.join(FAISS_INDEX_DIR, f'{index_name}.faiss')))
+
+
+# 군집이 있는 정규화 랜덤 벡터 (말뭉치가 커졌을 때를 가정)
+def synthetic_corpus(n: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.standard_normal((max(n // 100, 1), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), n)] + \
+        0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+# 말뭉치 질문을 조금 바꾼 질문 (비슷한 질문이 들어온 경우)
+def make_queries(vectors: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    queries = vectors[rng.choice(len(vectors), min(count, len(vectors)), replace=False)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+# 질문 하나씩 검색 (서버와 같은 방식) -> (결과, 질문별 시간(ms))
+def run(index, queries: np.ndarray, k: int):
+    results, times = [], []
+    for query in queries:
+        start = time.perf_counter()
+        _, ids = index.search(query[None, :], k)
+        times.append((time.perf_counter() - start) * 1000)
+        results.append(ids[0])
+    return np.array(results), np.array(times)
+
+
+def recall(results: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    return float(np.mean([len(set(r) & set(t)) / k for r, t in zip(results, truth)]))
+
+
+def report(name: str, build: float, size: int, results, times, truth):
+    print(f"{name:<24} recall@{truth.shape[1]}={recall(results, truth):.4f}  "
+          f"mean={times.mean():.3f}ms  p50={np.percentile(times, 50):.3f}ms  "
+          f"p99={np.percentile(times, 99):.3f}ms  build={build:.2f}s  size={size / 2**20:.1f}MB")
+
+
+def main(args):
+    import faiss
+    from services.ragindex import build_ann_index
+    from services.vectorstore import tune_index
+
+    rng = np.random.default_rng(args.seed)
+    if args.synthetic:
+        vectors = synthetic_corpus(args.synthetic, args.dim, rng)
+    else:
+        vectors = load_corpus()
+    queries = make_queries(vectors, args.queries, rng)
+    print(f"corpus={vectors.shape[0]} dim={vectors.shape[1]} queries={len(queries)} k={args.k}")
+
+    start = time.perf_counter()
+    flat = build_ann_index(vectors, 'flat')
+    build = time.perf_counter() - start
+    truth, times = run(flat, queries, args.k)
+    report('flat', build, len(faiss.serialize_index(flat)), truth, times, truth)
+
+    for index_type in args.types:
+        start = time.perf_counter()
+        index = build_ann_index(vectors, index_type)
+        build = time.perf_counter() - start
+        size = len(faiss.serialize_index(index))
+
+        params = args.nprobe if index_type.startswith('ivf') else args.ef_search
+        for value in params:
+            if index_type.startswith('ivf'):
+                tune_index(index, nprobe=value)
+                name = f'{index_type} nprobe={value}'
+            else:
+                tune_index(index, ef_search=value)
+                name = f'{index_type} efSearch={value}'
+            results, times = run(index, queries, args.k)
+            report(name, build, size, results, times, truth)
+
+
+if __name__ == '__main__':
+    # python benchmark_rag.py
+    # python benchmark_rag.py --synthetic 300000 --types ivf_flat ivf_pq hnsw --nprobe 8 16 32
+    parser = argparse.ArgumentParser(
+        description='AI 의사 RAG 검색 인덱스 recall/지연 시간 비교 (flat 기준)')
+    parser.add_argument('--types', nargs='+', default=['ivf_flat', 'ivf_pq', 'hnsw'],
+                        choices=['ivf_flat', 'ivf_pq', 'hnsw'], help='비교할 인덱스 종류')
+    parser.add_argument('--k', type=int, default=5, help='검색 결과 수 (RAG_FETCH_K)')
+    parser.add_argument('--queries', type=int, default=200, help='질문 수')
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[4, 16, 64])
+    parser.add_argument('--ef-search', type=int, nargs='+', default=[16, 64, 128])
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='현재 인덱스 대신 랜덤 벡터 N개 사용')
+    parser.add_argument('--dim', type=int, default=768, help='--synthetic 벡터 차원')
+    parser.add_argument('--seed', type=int, default=0)
+
+    main(parser.parse_args())
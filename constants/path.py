@@ -15,6 +15,7 @@ DIARY_DAY_CONTENT_DIR = f'{PROJECT_DIR}/dataset/diary/day/content'
 TEST_ASSET_DIR = f'{PROJECT_DIR}/tests/assets'
 POSTMAIN_BANNER_DIR = f'{PROJECT_DIR}/dataset/post/postmain/banner'
 AIDOCTOR_DIR = f'{PROJECT_DIR}/dataset/aidoctor'
+AIDOCTOR_EMBEDDING_CACHE_DIR = f'{PROJECT_DIR}/dataset/aidoctor/embedding_cache'
 
 
 os.makedirs(BABY_CRY_DATASET_DIR, exist_ok=True)
@@ -12,5 +12,19 @@ class Env:
     def get(self, key: str) -> Optional[str]:
         return os.environ.get(key)
 
+    def get_int(self, key: str, default: int) -> int:
+        value = self.get(key)
+        return int(value) if value not in (None, '') else default
+
+    def get_float(self, key: str, default: float) -> float:
+        value = self.get(key)
+        return float(value) if value not in (None, '') else default
+
+    def get_bool(self, key: str, default: bool) -> bool:
+        value = self.get(key)
+        if value in (None, ''):
+            return default
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
 
 env = Env()
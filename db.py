@@ -1,28 +1,175 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+import threading
+import logging
+import time
 
 from core.env import env
 
 
+# 커넥션 풀 설정 (.env로 변경 가능)
+def get_pool_options() -> dict:
+    return {
+        'pool_size': env.get_int("DB_POOL_SIZE", 20),
+        'max_overflow': env.get_int("DB_MAX_OVERFLOW", 20),
+        'pool_timeout': env.get_float("DB_POOL_TIMEOUT", 30),
+        'pool_recycle': env.get_int("DB_POOL_RECYCLE", 3600),
+        'pool_pre_ping': env.get_bool("DB_POOL_PRE_PING", True),
+    }
+
+
+class TimedQueuePool(QueuePool):
+    """
+    커넥션을 얻기까지 기다린 시간을 기록하는 QueuePool
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.waitCount = 0
+        self.waitTotal = 0.0
+        self.waitMax = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            with self._stats_lock:
+                self.waitCount += 1
+                self.waitTotal += wait
+                self.waitMax = max(self.waitMax, wait)
+
+
 def create_db_sessionLocal():
     # autopep8: off
     DB_URL = f'mysql+pymysql://{env.get("MYSQL_USER")}:{env.get("MYSQL_PASSWORD")}@{env.get("MYSQL_HOST")}:{env.get("MYSQL_PORT")}/{env.get("MYSQL_DATABASE")}'
-    engine = create_engine(DB_URL, pool_size=20, max_overflow=20)
+    engine = create_engine(DB_URL, poolclass=TimedQueuePool, **get_pool_options())
     return sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 SessionLocal = create_db_sessionLocal()
 DB_Base = declarative_base()
 
+logger = logging.getLogger(__name__)
+
+
+class _RequestScope:
+    # 요청이 끝나면 session을 None으로 바꿔, 요청보다 오래 사는 태스크가 닫힌 세션을 쓰지 않게 한다.
+    __slots__ = ('session',)
+
+    def __init__(self, session: Session):
+        self.session = session
+
+
+# 요청 단위 세션 (get_request_db_session 의존성이 설정)
+_request_scope: ContextVar[Optional[_RequestScope]] = ContextVar('request_db_session', default=None)
+
+
 # Dependency
-# try finally문을 통해 db 연결이 종료되거나 문제가 생겼을 때 무조건 close 해준다.
-# db 연결 과정에서 생긴 문제가 아닌 경우 아래에 except를 추가하여도 처리되지 않는다.
+# 요청마다 하나의 세션을 만들고, 응답이 끝나면 닫아서 커넥션을 풀에 반환한다.
+# 요청 안에서 호출되는 get_db_session()은 모두 이 세션을 사용한다.
+# - 세션을 여러 서비스가 함께 쓰므로, 각 서비스는 자신의 변경을 바로 commit()하고
+#   commit하지 않은 변경을 남긴 채 다른 서비스를 호출하지 않는다.
+#   (다른 서비스의 오류 처리에서 rollback()하면 남아 있던 변경도 함께 취소된다)
+# - 요청이 끝날 때 commit하지 않은 추가/삭제가 남아 있으면 오류로 기록하고 버린다.
+# - LLM 호출처럼 오래 걸리는 라우터(aidoctor)는 커넥션을 잡고 있지 않도록 사용하지 않는다.
+async def get_request_db_session():
+    db = SessionLocal()
+    scope = _RequestScope(db)
+    token = _request_scope.set(scope)
+    try:
+        yield db
+    finally:
+        scope.session = None
+        _request_scope.reset(token)
+        if db.new or db.deleted:
+            logger.error("Request ended with uncommitted changes (new=%d, deleted=%d). Rolling back.",
+                         len(db.new), len(db.deleted))
+        await run_in_threadpool(db.close)
+
+
+# 요청 중에 시작한 백그라운드 태스크에서 호출한다.
+# 태스크는 요청의 컨텍스트를 복사해서 시작하므로, 그대로 두면 요청 세션(스레드에 안전하지 않음)을 함께 쓴다.
+# 호출 후의 get_db_session()은 태스크 자신의 세션을 만든다.
+def detach_request_session():
+    _request_scope.set(None)
 
 
 def get_db_session():
+    # 요청 안에서는 요청 단위 세션을 반환한다.
+    scope = _request_scope.get()
+    if scope is not None and scope.session is not None:
+        return scope.session
+
+    # 요청 밖(스케줄러, rebuild.py 등)에서는 새 세션을 만든다.
+    # try finally문을 통해 db 연결이 종료되거나 문제가 생겼을 때 무조건 close 해준다.
+    # 닫힌 세션은 다음 쿼리에서 다시 커넥션을 가져온다.
     db = SessionLocal()
     try:
         return db
     finally:
         db.close()
+
+
+# 커넥션 풀 상태
+def get_pool_stats() -> dict:
+    pool = SessionLocal.kw['bind'].pool
+    stats = {
+        'size': pool.size(),
+        'checkedIn': pool.checkedin(),
+        'checkedOut': pool.checkedout(),
+        'overflow': pool.overflow(),
+        'maxOverflow': pool._max_overflow,
+    }
+    if isinstance(pool, TimedQueuePool):
+        stats.update({
+            'waitCount': pool.waitCount,
+            'waitTotal': pool.waitTotal,
+            'waitAvg': pool.waitTotal / pool.waitCount if pool.waitCount else 0.0,
+            'waitMax': pool.waitMax,
+            'timeouts': pool.timeouts,
+        })
+    return stats
+
+
+# 비동기 세션 (async def 라우터/서비스에서 이벤트 루프를 막지 않도록 사용)
+# ASYNC_DB_URL이 있으면 사용한다. (예: 테스트용 sqlite+aiosqlite:///./test.db)
+def create_async_db_sessionLocal():
+    # autopep8: off
+    DB_URL = env.get("ASYNC_DB_URL") or f'mysql+aiomysql://{env.get("MYSQL_USER")}:{env.get("MYSQL_PASSWORD")}@{env.get("MYSQL_HOST")}:{env.get("MYSQL_PORT")}/{env.get("MYSQL_DATABASE")}'
+    options = {} if DB_URL.startswith('sqlite') else get_pool_options()
+    engine = create_async_engine(DB_URL, **options)
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+# 드라이버(aiomysql)는 처음 사용할 때 불러온다.
+AsyncSessionLocal = None
+
+
+@asynccontextmanager
+async def get_async_db_session():
+    """
+    비동기 세션
+    사용법: async with get_async_db_session() as db:
+                result = await db.execute(select(...))
+    """
+    global AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        AsyncSessionLocal = create_async_db_sessionLocal()
+
+    async with AsyncSessionLocal() as db:
+        yield db
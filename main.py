@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
+import asyncio
 
 from apis import router as main_router
 from apis.cry import router as cry_router
@@ -25,34 +26,100 @@ from apis.alert import router as alert_router
 
 from fastapi.staticfiles import StaticFiles
 from apis.setting import router as setting_router
+from services.banner import bannerService
+from services.counter import postCounterService
+from services.alertqueue import alertQueueService
+from services.chat import chatService
+from services.vectorstore import vectorStoreService
+from core.env import env
+from db import get_request_db_session
 
 app = FastAPI()
 
-app.include_router(main_router)
-app.include_router(parent_router)
-app.include_router(cry_router)
-app.include_router(baby_router)
-app.include_router(raws_router)
-app.include_router(post_router)
-app.include_router(pheart_router)
-app.include_router(pscript_router)
-app.include_router(pview_router)
-app.include_router(pcomment_router)
-app.include_router(cheart_router)
-app.include_router(friend_router)
-app.include_router(postmain_router)
-
-app.include_router(search_router)
-app.include_router(setting_router)
+# 요청마다 하나의 DB 세션을 사용하고, 응답이 끝나면 커넥션을 풀에 반환한다.
+# (chat_router는 웹소켓 연결이 끝날 때까지, aidoctor_router는 LLM 응답을 기다리는 동안
+#  커넥션을 잡지 않도록 제외. 두 라우터의 서비스는 get_db_session()이 호출마다 세션을 만든다)
+db_session = [Depends(get_request_db_session)]
+
+app.include_router(main_router, dependencies=db_session)
+app.include_router(parent_router, dependencies=db_session)
+app.include_router(cry_router, dependencies=db_session)
+app.include_router(baby_router, dependencies=db_session)
+app.include_router(raws_router, dependencies=db_session)
+app.include_router(post_router, dependencies=db_session)
+app.include_router(pheart_router, dependencies=db_session)
+app.include_router(pscript_router, dependencies=db_session)
+app.include_router(pview_router, dependencies=db_session)
+app.include_router(pcomment_router, dependencies=db_session)
+app.include_router(cheart_router, dependencies=db_session)
+app.include_router(friend_router, dependencies=db_session)
+app.include_router(postmain_router, dependencies=db_session)
+
+app.include_router(search_router, dependencies=db_session)
+app.include_router(setting_router, dependencies=db_session)
 app.include_router(chat_router)
-app.include_router(chatroom_router)
-app.include_router(diary_router)
-app.include_router(dday_router)
-app.include_router(hospital_router)
-app.include_router(milk_router)
+app.include_router(chatroom_router, dependencies=db_session)
+app.include_router(diary_router, dependencies=db_session)
+app.include_router(dday_router, dependencies=db_session)
+app.include_router(hospital_router, dependencies=db_session)
+app.include_router(milk_router, dependencies=db_session)
 app.mount("/qq", StaticFiles(directory="static", html=True), name="static")
 app.include_router(aidoctor_router)
-app.include_router(alert_router)
+app.include_router(alert_router, dependencies=db_session)
+
+
+# 메인 페이지 배너 사전 계산 (시작 시 + 매일 00시)
+@app.on_event("startup")
+async def start_banner_scheduler():
+    app.state.banner_task = asyncio.create_task(bannerService.runScheduler())
+
+
+# 게시물 카운터 쓰기 지연 (POST_COUNTER_WRITE_BEHIND=true 일 때만 동작)
+@app.on_event("startup")
+async def start_counter_flusher():
+    # sql.txt의 카운터 트리거가 남아 있으면 쓰기 지연을 끈다.
+    await asyncio.to_thread(postCounterService.checkTriggers)
+    app.state.counter_task = asyncio.create_task(postCounterService.runFlusher())
+
+
+# 알림 생성 워커 (ALERT_QUEUE=true 일 때만 동작)
+@app.on_event("startup")
+async def start_alert_worker():
+    # sql.txt의 알림 트리거가 남아 있으면 큐를 끈다.
+    await asyncio.to_thread(alertQueueService.checkTriggers)
+    app.state.alert_task = asyncio.create_task(alertQueueService.runWorker())
+
+
+# 채팅 백플레인 구독 (CHAT_BACKPLANE_URL이 있으면 워커 간 메시지 전달)
+@app.on_event("startup")
+async def start_chat_backplane():
+    await chatService.start()
+
+
+# AI 의사 벡터 저장소를 백그라운드에서 불러오기 (AIDOCTOR_WARMUP=false 이면 첫 요청 때)
+@app.on_event("startup")
+async def start_vectorstore_warmup():
+    if env.get_bool("AIDOCTOR_WARMUP", True):
+        vectorStoreService.warmup()
+
+
+# 종료 전에 남은 카운터 증감을 반영
+@app.on_event("shutdown")
+async def flush_counter():
+    await asyncio.to_thread(postCounterService.flush)
+
+
+# 종료 전에 큐에 남은 알림 이벤트 처리
+@app.on_event("shutdown")
+async def flush_alert():
+    await alertQueueService.flush()
+
+
+# 종료 전에 남은 채팅을 저장하고 접속 정보를 해제
+@app.on_event("shutdown")
+async def flush_chat():
+    await chatService.flush()
+    await chatService.close()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, TEXT, DateTime, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, TEXT, DateTime, Boolean, JSON, ForeignKey, Index
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
 from db import DB_Base
@@ -53,3 +53,8 @@ class AlertTable(DB_Base):
     alert_type = Column(String(255), nullable=True)
     message = Column(String(255), nullable=False)
     action = Column(JSON, nullable=True)
+
+    # 부모별 확인하지 않은 알림 수/최신순 목록 조회용 인덱스
+    __table_args__ = (
+        Index('ix_alert_parent_checked', 'parent_id', 'hasChecked', 'alert_id'),
+    )
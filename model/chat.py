@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, TEXT, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, TEXT, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel
 from datetime import datetime
@@ -49,5 +49,9 @@ class ChatTable(DB_Base):
     chatType = Column(String(255), nullable=False)
     content = Column(TEXT, nullable=False)
 
+    __table_args__ = (
+        Index('ix_chat_room_chat', 'room_id', 'chat_id'),
+    )
+
     # chat = relationship(ChatRoomTable, back_populates='chat', passive_deletes=True)
     # parent = relationship(ParentTable, back_populates='chat', passive_deletes=True)
@@ -1,19 +1,24 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel
 from db import DB_Base
 from typing import Optional
+from datetime import datetime
 from model.parent import ParentTable
 
 # 채팅방 테이블
-# +-----------+--------------+------+-----+---------+----------------+
-# | Field     | Type         | Null | Key | Default | Extra          |
-# +-----------+--------------+------+-----+---------+----------------+
-# | room_id   | int(11)      | NO   | PRI | NULL    | auto_increment |
-# | parent_id | varchar(255) | NO   | MUL | NULL    |                |
-# | lastChat  | int(11)      | NO   | MUL | NULL    |                |
-# | name      | varchar(100) | NO   |     | NULL    |                |
-# +-----------+--------------+------+-----+---------+----------------+
+# +--------------+--------------+------+-----+---------+----------------+
+# | Field        | Type         | Null | Key | Default | Extra          |
+# +--------------+--------------+------+-----+---------+----------------+
+# | room_id      | int(11)      | NO   | PRI | NULL    | auto_increment |
+# | parent_id    | varchar(255) | NO   | MUL | NULL    |                |
+# | name         | varchar(100) | NO   |     | NULL    |                |
+# | memberCount  | int(11)      | NO   |     | NULL    |                |
+# | chatCount    | int(11)      | NO   |     | 0       |                |
+# | lastChatId   | int(11)      | YES  |     | NULL    |                |
+# | lastChatTime | datetime     | YES  |     | NULL    |                |
+# | lastChat     | varchar(255) | YES  |     | NULL    |                |
+# +--------------+--------------+------+-----+---------+----------------+
 
 
 class ChatRoom(BaseModel):
@@ -21,6 +26,10 @@ class ChatRoom(BaseModel):
     parent_id: str
     name: str
     memberCount: int = 0
+    chatCount: int = 0
+    lastChatId: Optional[int] = None
+    lastChatTime: Optional[datetime] = None
+    lastChat: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -41,6 +50,10 @@ class ChatRoomTable(DB_Base):
         'parent.parent_id'), nullable=False)
     name = Column(String(100), nullable=False)
     memberCount = Column(Integer, nullable=False)
+    chatCount = Column(Integer, nullable=False, default=0, server_default='0')
+    lastChatId = Column(Integer, nullable=True)
+    lastChatTime = Column(DateTime, nullable=True)
+    lastChat = Column(String(255), nullable=True)
 
     # chat = relationship("ChatTable", back_populates='chat', passive_deletes=True)
     # parent = relationship(ParentTable, back_populates='chat', passive_deletes=True)
@@ -22,6 +22,7 @@ from typing import Optional
 # | mainAddr      | varchar(50)  | YES  |     | NULL    |       |
 # | subAddr       | varchar(255) | YES  |     | NULL    |       |
 # | hashList      | varchar(100) | YES  |     | NULL    |       |
+# | alertUnread   | int          | NO   |     | 0       |       |
 # +---------------+--------------+------+-----+---------+-------+
 
 
@@ -65,3 +66,5 @@ class ParentTable(DB_Base):
     mainAddr = Column(String(50), nullable=True)
     subAddr = Column(String(255), nullable=True)
     hashList = Column(String(100), nullable=True)
+    # 확인하지 않은 알림 수 (sql.txt의 alertunread_* 트리거가 갱신)
+    alertUnread = Column(Integer, nullable=False, default=0, server_default='0')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, TEXT, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, TEXT, ForeignKey, Index
 from sqlalchemy.orm import relationship, backref
 from pydantic import BaseModel
 from db import DB_Base
@@ -60,6 +60,11 @@ class PCommentTable(DB_Base):
     deleteTime = Column(DateTime, nullable=True)
     cheart = Column(Integer, nullable=True)
 
+    # 게시물별 댓글(reply_id IS NULL)/대댓글을 작성 순으로 읽는 인덱스
+    __table_args__ = (
+        Index('ix_pcomment_tree', 'post_id', 'reply_id', 'createTime', 'comment_id'),
+    )
+
     parent = relationship(
         "ParentTable", backref='pcomment', passive_deletes=True)
     post = relationship("PostTable", backref='pcomment', passive_deletes=True)
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from pydantic import BaseModel
+from db import DB_Base
+from datetime import datetime
+from model.post import PostTable
+
+
+# 해시태그 -> 게시물 인덱스 테이블 (post.hashList를 태그 단위로 분리)
+# +------------+-------------+------+-----+---------+-------+
+# | Field      | Type        | Null | Key | Default | Extra |
+# +------------+-------------+------+-----+---------+-------+
+# | hash       | varchar(50) | NO   | PRI | NULL    |       |
+# | post_id    | int(11)     | NO   | PRI | NULL    |       |
+# | createTime | datetime    | NO   |     | NULL    |       |
+# +------------+-------------+------+-----+---------+-------+
+
+
+class PostHash(BaseModel):
+    hash: str
+    post_id: int
+    createTime: datetime
+
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+    def __init__(self, **kwargs):
+        if '_sa_instance_state' in kwargs:
+            kwargs.pop('_sa_instance_state')
+        super().__init__(**kwargs)
+
+
+class PostHashTable(DB_Base):
+    __tablename__ = 'posthash'
+
+    hash = Column(String(50), primary_key=True, nullable=False)
+    post_id = Column(Integer, ForeignKey('post.post_id'),
+                     primary_key=True, nullable=False)
+    createTime = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('ix_posthash_hash_time', 'hash', 'createTime', 'post_id'),
+        Index('ix_posthash_post_id', 'post_id'),
+    )
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from pydantic import BaseModel
+from db import DB_Base
+from model.post import PostTable
+
+
+# 게시물 검색 인덱스 테이블 (제목/해시태그/본문의 문자 2-gram -> 게시물)
+# weight: gram이 제목(3), 해시태그(2), 본문(1)에 등장한 횟수의 가중합
+# +---------+-------------+------+-----+---------+-------+
+# | Field   | Type        | Null | Key | Default | Extra |
+# +---------+-------------+------+-----+---------+-------+
+# | gram    | varchar(16) | NO   | PRI | NULL    |       |
+# | post_id | int(11)     | NO   | PRI | NULL    |       |
+# | weight  | int(11)     | NO   |     | NULL    |       |
+# +---------+-------------+------+-----+---------+-------+
+
+
+class PostNgram(BaseModel):
+    gram: str
+    post_id: int
+    weight: int
+
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+    def __init__(self, **kwargs):
+        if '_sa_instance_state' in kwargs:
+            kwargs.pop('_sa_instance_state')
+        super().__init__(**kwargs)
+
+
+class PostNgramTable(DB_Base):
+    __tablename__ = 'postngram'
+
+    gram = Column(String(16), primary_key=True, nullable=False)
+    post_id = Column(Integer, ForeignKey('post.post_id'),
+                     primary_key=True, nullable=False)
+    weight = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index('ix_postngram_post_id', 'post_id'),
+    )
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from pydantic import BaseModel
+from db import DB_Base
+from datetime import datetime
+from typing import Optional
+from model.post import PostTable
+
+
+# 게시물 요약 테이블 (피드에서 content 파일을 읽지 않기 위해 미리 계산)
+# +-------------+--------------+------+-----+---------+-------+
+# | Field       | Type         | Null | Key | Default | Extra |
+# +-------------+--------------+------+-----+---------+-------+
+# | post_id     | int(11)      | NO   | PRI | NULL    |       |
+# | photoId     | varchar(255) | YES  |     | NULL    |       |
+# | description | varchar(255) | NO   |     | NULL    |       |
+# | photoCount  | int(11)      | NO   |     | 0       |       |
+# | modifyTime  | datetime     | NO   |     | NULL    |       |
+# +-------------+--------------+------+-----+---------+-------+
+
+
+class PostSummary(BaseModel):
+    post_id: int
+    photoId: Optional[str]
+    description: str
+    photoCount: int
+    modifyTime: datetime
+
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+    def __init__(self, **kwargs):
+        if '_sa_instance_state' in kwargs:
+            kwargs.pop('_sa_instance_state')
+        super().__init__(**kwargs)
+
+
+class PostSummaryTable(DB_Base):
+    __tablename__ = 'postsummary'
+
+    post_id = Column(Integer, ForeignKey('post.post_id'),
+                     primary_key=True, nullable=False)
+    photoId = Column(String(255), nullable=True)
+    description = Column(String(255), nullable=False)
+    photoCount = Column(Integer, nullable=False, default=0)
+    modifyTime = Column(DateTime, nullable=False)
@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from pydantic import BaseModel
+from db import DB_Base
+from datetime import datetime
+from model.post import PostTable
+
+
+# 피드 타임라인 테이블 (게시물 작성 시 미리 배포)
+# kind = 'friend'   : owner(부모)가 친구로 등록한 부모의 게시물
+# kind = 'district' : owner(mainAddr) 지역에 사는 부모의 게시물
+# +------------+--------------+------+-----+---------+-------+
+# | Field      | Type         | Null | Key | Default | Extra |
+# +------------+--------------+------+-----+---------+-------+
+# | owner      | varchar(255) | NO   | PRI | NULL    |       |
+# | kind       | varchar(10)  | NO   | PRI | NULL    |       |
+# | post_id    | int(11)      | NO   | PRI | NULL    |       |
+# | author_id  | varchar(255) | NO   |     | NULL    |       |
+# | createTime | datetime     | NO   |     | NULL    |       |
+# +------------+--------------+------+-----+---------+-------+
+
+
+class Timeline(BaseModel):
+    owner: str
+    kind: str
+    post_id: int
+    author_id: str
+    createTime: datetime
+
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+    def __init__(self, **kwargs):
+        if '_sa_instance_state' in kwargs:
+            kwargs.pop('_sa_instance_state')
+        super().__init__(**kwargs)
+
+
+class TimelineTable(DB_Base):
+    __tablename__ = 'timeline'
+
+    owner = Column(String(255), primary_key=True, nullable=False)
+    kind = Column(String(10), primary_key=True, nullable=False)
+    post_id = Column(Integer, ForeignKey('post.post_id'),
+                     primary_key=True, nullable=False)
+    author_id = Column(String(255), nullable=False)
+    createTime = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('ix_timeline_read', 'owner', 'kind', 'createTime', 'post_id'),
+        Index('ix_timeline_post_id', 'post_id'),
+    )
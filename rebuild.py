@@ -0,0 +1,149 @@
+import argparse
+import logging
+
+
+# 게시물 요약 재생성
+def rebuild_summary(args):
+    from services.postsummary import PostSummaryService
+
+    count = PostSummaryService().rebuildAll()
+    print(f"post summary rebuilt: {count} posts")
+
+
+# 게시물 검색 인덱스 재생성
+def rebuild_search(args):
+    from services.searchindex import SearchIndexService
+
+    count = SearchIndexService().rebuildAll()
+    print(f"search index rebuilt: {count} posts")
+
+
+# 해시태그 인덱스 재생성
+def rebuild_hashtag(args):
+    from services.hashtag import HashtagService
+
+    count = HashtagService().rebuildAll()
+    print(f"hashtag index rebuilt: {count} posts")
+
+
+# 친구/지역 피드 타임라인 재생성
+def rebuild_timeline(args):
+    from services.timeline import TimelineService
+
+    count = TimelineService().rebuildAll()
+    print(f"timeline rebuilt: {count} posts")
+
+
+# 게시물 하트/스크랩/조회/댓글 수 재계산
+def rebuild_counter(args):
+    from services.counter import PostCounterService
+
+    service = PostCounterService()
+    if args.drop_triggers:
+        dropped = service.dropTriggers()
+        print(f"counter triggers dropped: {', '.join(dropped) or 'none'}")
+
+    count = service.rebuildAll()
+    print(f"post counters rebuilt: {count} posts")
+
+
+# 확인하지 않은 알림 수 재계산, 알림 트리거 확인/삭제 (ALERT_QUEUE=true로 옮길 때 --drop-triggers)
+def rebuild_alert(args):
+    from services.alert import AlertService
+    from services.alertqueue import AlertQueueService
+
+    service = AlertQueueService()
+    if args.drop_triggers:
+        dropped = service.dropTriggers()
+        print(f"alert triggers dropped: {', '.join(dropped) or 'none'}")
+    else:
+        print(f"alert triggers: {', '.join(service.findTriggers()) or 'none'}")
+
+    count = AlertService().rebuildUnread()
+    print(f"alert unread counts rebuilt: {count} parents")
+
+
+# 채팅방 채팅 수/마지막 채팅 재계산
+def rebuild_chatroom(args):
+    from services.chatroom import ChatRoomService
+
+    count = ChatRoomService().rebuildAll()
+    print(f"chatroom rebuilt: {count} rooms")
+
+
+# AI 의사 FAISS 인덱스 갱신 (추가/변경된 질문만 임베딩, --full이면 전체)
+def rebuild_aidoctor(args):
+    from services.ragindex import RagIndexService
+
+    service = RagIndexService()
+    if args.delete:
+        result = service.delete(args.delete)
+        print(f"aidoctor index {result['index']}: deleted {len(result['deleted'])}, "
+              f"missing {result['missing']}")
+        return
+
+    result = service.sync(full=args.full)
+    print(f"aidoctor index {result['index']}: added {result['added']}, "
+          f"changed {result['changed']}, deleted {result['deleted']}")
+
+
+if __name__ == '__main__':
+    # python rebuild.py summary
+    # python rebuild.py search
+    # python rebuild.py hashtag
+    # python rebuild.py timeline
+    # python rebuild.py counter [--drop-triggers]
+    # python rebuild.py alert [--drop-triggers]
+    # python rebuild.py chatroom
+    # python rebuild.py aidoctor [--full] [--delete ID ...]
+    parser = argparse.ArgumentParser(
+        description='babystory 캐시/인덱스 재생성')
+    subparsers = parser.add_subparsers(dest='target', required=True)
+
+    summary_parser = subparsers.add_parser(
+        'summary', help='게시물 요약(첫번째 이미지, 설명, 이미지 수) 재생성')
+    summary_parser.set_defaults(func=rebuild_summary)
+
+    search_parser = subparsers.add_parser(
+        'search', help='게시물 검색 인덱스(제목/해시태그/본문 2-gram) 재생성')
+    search_parser.set_defaults(func=rebuild_search)
+
+    hashtag_parser = subparsers.add_parser(
+        'hashtag', help='해시태그 -> 게시물 인덱스 재생성')
+    hashtag_parser.set_defaults(func=rebuild_hashtag)
+
+    timeline_parser = subparsers.add_parser(
+        'timeline', help='친구/지역 피드 타임라인 재생성')
+    timeline_parser.set_defaults(func=rebuild_timeline)
+
+    counter_parser = subparsers.add_parser(
+        'counter', help='게시물 하트/스크랩/조회/댓글 수 재계산')
+    counter_parser.add_argument(
+        '--drop-triggers', action='store_true',
+        help='카운터 트리거를 삭제 (POST_COUNTER_WRITE_BEHIND=true로 옮길 때)')
+    counter_parser.set_defaults(func=rebuild_counter)
+
+    alert_parser = subparsers.add_parser(
+        'alert', help='확인하지 않은 알림 수 재계산, 알림 트리거 확인')
+    alert_parser.add_argument(
+        '--drop-triggers', action='store_true',
+        help='알림 트리거를 삭제 (ALERT_QUEUE=true로 옮길 때)')
+    alert_parser.set_defaults(func=rebuild_alert)
+
+    chatroom_parser = subparsers.add_parser(
+        'chatroom', help='채팅방 채팅 수/마지막 채팅 재계산')
+    chatroom_parser.set_defaults(func=rebuild_chatroom)
+
+    aidoctor_parser = subparsers.add_parser(
+        'aidoctor', help='AI 의사 FAISS 인덱스를 data.csv에 맞춰 갱신')
+    aidoctor_parser.add_argument(
+        '--full', action='store_true', help='모든 질문을 다시 임베딩')
+    aidoctor_parser.add_argument(
+        '--delete', nargs='+', metavar='ID', help='인덱스에서 아이디로 삭제')
+    aidoctor_parser.set_defaults(func=rebuild_aidoctor)
+
+    # 임베딩 진행 상황 등 서비스 로그를 출력한다.
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    args = parser.parse_args()
+    args.func(args)
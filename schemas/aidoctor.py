@@ -32,3 +32,13 @@ class LoadChatHistoryOutput(BaseModel):
 class LoadChatHistoryServiceOutput(BaseModel):
     roomCreateTime: datetime
     chat_history: List[AIDoctorChat]
+
+
+class VectorStoreStatusOutput(BaseModel):
+    ready: bool
+    state: str
+    index: Optional[str] = None
+    indexType: Optional[str] = None
+    reloading: bool = False
+    error: Optional[str] = None
+    loadSeconds: Optional[float] = None
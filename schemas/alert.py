@@ -32,6 +32,19 @@ class GetAlertOutput(BaseModel):
     alerts: List[GetAlertListOutput]
 
 
+class GetAlertPageOutput(BaseModel):
+    status: int
+    message: str
+    createTime: datetime
+    alerts: List[GetAlertListOutput]
+    nextCursor: Optional[str] = None
+
+
+class GetUnreadCountOutput(BaseModel):
+    status: int
+    unread: int
+
+
 class GetToggleSubscribeOutput(BaseModel):
     hasSubscribe: bool
 
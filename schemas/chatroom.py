@@ -49,3 +49,8 @@ class GetChatRoomChatOutput(BaseModel):
 class GetChatRoomOutput(BaseModel):
     chatroom: List[ChatRoom]
 
+class GetChatHistoryOutput(BaseModel):
+    status: str
+    chatroom_id: int
+    chatList: List[Chat]
+    nextCursor: Optional[int] = None
@@ -5,4 +5,5 @@ from pydantic import BaseModel
 class PaginationInfo(BaseModel):
     page: int
     take: int
-    total: int
\ No newline at end of file
+    total: int
+    nextCursor: Optional[str] = None
@@ -27,6 +27,8 @@ class CommentOutput(BaseModel):
     createTime: datetime
     modifyTime: Optional[datetime]
     cheart: Optional[int] = 0
+    parentHeart: Optional[bool] = None
+    replyCount: Optional[int] = None
     replies: Optional[List["CommentOutput"]] = None
     parent: CommentParent
 
@@ -39,6 +41,24 @@ class GetAllPCommentOutput(BaseModel):
     comments: List[CommentOutput]
 
 
+# 댓글 페이지 가져오기
+class GetPCommentPageOutput(BaseModel):
+    success: int
+    message: str
+    post_id: int
+    comments: List[CommentOutput]
+    nextCursor: Optional[str] = None
+
+
+# 대댓글 페이지 가져오기
+class GetReplyPCommentPageOutput(BaseModel):
+    success: int
+    message: str
+    comment_id: int
+    comments: List[CommentOutput]
+    nextCursor: Optional[str] = None
+
+
 # 댓글 수정
 class UpdatePCommentInput(BaseModel):
     comment_id: int
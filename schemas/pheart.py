@@ -32,6 +32,7 @@ class DeletePHeartOutput(BaseModel):
     success: int
     message: str
     pheart: Optional[List[PHeart]] = None
+    missing: List[int] = []
 
 
 # 하트 조회
@@ -68,6 +68,23 @@ class DeletePostOutput(BaseModel):
     post: Optional[Post] = None
 
 
+# 여러 게시물의 하트/스크랩/조회 여부
+class GetPostStateInput(BaseModel):
+    post_ids: List[int]
+
+
+class PostState(BaseModel):
+    post_id: int
+    heart: bool
+    script: bool
+    view: bool
+
+
+class GetPostStateOutput(BaseModel):
+    status: int
+    states: List[PostState]
+
+
 # poster/profile
 class GetPosterProfileParent(BaseModel):
     parentId: str
@@ -22,6 +22,7 @@ class CreatePostMainInput(BaseModel):
     parent_id: str
     size: int = -1
     page: int = -1
+    cursor: Optional[str] = None
 
 
 class CreatePostMainFriendOutput(BaseModel):
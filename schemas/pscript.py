@@ -32,6 +32,7 @@ class DeletePScriptOutput(BaseModel):
     success: int
     message: str
     pscript: Optional[List[PScript]] = None
+    missing: List[int] = []
 
 
 # 스크립트 조회
@@ -32,3 +32,4 @@ class DeletePViewOutput(BaseModel):
     success: int
     message: str
     pview: Optional[List[PView]] = None
+    missing: List[int] = []
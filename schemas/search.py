@@ -10,6 +10,7 @@ class CreateSearchInput(BaseModel):
     search: str
     size: int
     page: int
+    cursor: Optional[str] = None
 
 
 class CreateSearchOutput(BaseModel):
@@ -24,9 +25,11 @@ class CreateSearchOutput(BaseModel):
 
 class CreateSearchOutputListOutput(BaseModel):
     banners: List[CreateSearchOutput]
+    nextCursor: Optional[str] = None
 
 
 class CreateSearchRecommendInput(BaseModel):
     type: str
     size: int
     page: int
+    cursor: Optional[str] = None
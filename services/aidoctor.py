@@ -3,8 +3,6 @@ from typing import Optional, List, Set
 from db import get_db_session
 from datetime import datetime
 
-from langchain_core.output_parsers import StrOutputParser
-from langchain.prompts import ChatPromptTemplate
 import os
 import json
 import urllib.request
@@ -13,30 +11,53 @@ import requests
 from model.aidoctorroom import AIDoctorRoomTable, AIDoctorRoom
 from model.aidoctorchat import AIDoctorChatTable, AIDoctorChat
 from schemas.aidoctor import *
+from services.vectorstore import RAG_FETCH_K, RAG_MMR_LAMBDA
 from error.exception.customerror import *
 
 
+class StubLLM:
+    """
+    테스트용 LLM (AIDOCTOR_LLM=stub)
+    - OpenAI를 호출하지 않고 질문과 검색된 질문 수로 정해진 답변을 만든다.
+    - calls로 실제로 LLM까지 요청이 왔는지 확인할 수 있다.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def ask(self, llm_prompt: str, query: str) -> str:
+        self.calls += 1
+        return (f"[stub] {query} (참고한 질문 {llm_prompt.count('질문 ')}개) "
+                "더 정확한 진단과 치료가 필요하시면 가까운 소아과를 방문하는 것이 좋습니다.")
+
+
 class AiDoctorService:
     # RAG 검색
-    def search_in_rag(self, vectorstore, query: str, k: int):
+    def search_in_rag(self, vectorstore, query: str, k: int, embedding=None):
         """
         query를 RAG로 검색하여 답변을 얻는 함수
         --input
             - query: 질문
             - k: RAG로부터 나올 output 개수
-            - parent_id: 부모 id
+            - embedding: 미리 계산한 질문 임베딩 (services/embedding.py), 없으면 여기서 계산
         --output
             - 답변 리스트
                 - 탭: 탭 이름
                 - 질문: 질문 내용
                 - 답변: 답변 내용
         """
-        retriever = vectorstore.as_retriever(
-            search_type='mmr',
-            search_kwargs={'k': k, 'lambda_mult': 0.9}
-        )
+        if embedding is not None:
+            results = vectorstore.max_marginal_relevance_search_by_vector(
+                list(map(float, embedding)), k=k,
+                fetch_k=max(RAG_FETCH_K, k), lambda_mult=RAG_MMR_LAMBDA)
+        else:
+            retriever = vectorstore.as_retriever(
+                search_type='mmr',
+                search_kwargs={'k': k, 'fetch_k': max(RAG_FETCH_K, k),
+                               'lambda_mult': RAG_MMR_LAMBDA}
+            )
 
-        results = retriever.get_relevant_documents(query)
+            results = retriever.get_relevant_documents(query)
 
         return [
             {
@@ -78,6 +99,13 @@ class AiDoctorService:
             - 답변 리스트
         """
 
+        if isinstance(llm, StubLLM):
+            return llm.ask(llm_prompt, query)
+
+        # langchain은 무거우므로 처음 사용할 때 불러온다.
+        from langchain_core.output_parsers import StrOutputParser
+        from langchain.prompts import ChatPromptTemplate
+
         template = """
         {context}
         위의 정보를 참고하여 질환에 대해서 자세히 설명하고 다음 질문에 답해주세요:
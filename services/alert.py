@@ -1,13 +1,19 @@
 from fastapi import HTTPException
-from typing import Optional, List, Set
+from typing import Optional, List, Set, Dict
 from db import get_db_session
 from datetime import datetime
+from sqlalchemy import update, select, func
 
 from model.alert import AlertTable
 from model.alertsub import AlertSubscribeTable
 from model.parent import ParentTable
 from schemas.alert import *
+from services.author import AuthorService
 from error.exception.customerror import *
+from utils.cursor import keyset_page
+
+
+authorService = AuthorService()
 
 
 class AlertService:
@@ -23,20 +29,22 @@ class AlertService:
         db = get_db_session()
 
         try:
-            for alert_id in alert_ids:
-                alert = db.query(AlertTable).filter(
-                    AlertTable.alert_id == alert_id).first()
-
-                if alert is None:
-                    db.rollback()
-                    return False
+            alert_ids = list(dict.fromkeys(int(i) for i in alert_ids))
+        except ValueError:
+            raise CustomException("Invalid alert_ids")
 
-                alert.hasChecked = True
+        # UPDATE alert SET hasChecked = TRUE WHERE alert_id IN (...)
+        # 존재하지 않는 알람이 있으면 하나도 확인 처리하지 않는다.
+        # 확인하지 않은 알림 수(parent.alertUnread)는 alertunread_update 트리거가 줄인다.
+        try:
+            result = db.execute(update(AlertTable).where(
+                AlertTable.alert_id.in_(alert_ids)).values(hasChecked=True))
 
-                db.add(alert)
+            if result.rowcount != len(alert_ids):
+                db.rollback()
+                return False
 
             db.commit()
-            db.refresh(alert)
 
         except Exception as e:
             db.rollback()
@@ -44,6 +52,102 @@ class AlertService:
 
         return True
 
+    def get_unread_count(self, parent_id: str) -> int:
+        '''
+        확인하지 않은 알림 수 조회
+        input:
+            - parent_id: 부모 id
+        output:
+            - 확인하지 않은 알림 수
+        '''
+
+        return self.get_unread_counts([parent_id]).get(parent_id, 0)
+
+    def get_unread_counts(self, parent_ids: List[str]) -> Dict[str, int]:
+        '''
+        여러 부모의 확인하지 않은 알림 수 조회
+        (parent.alertUnread는 sql.txt의 alertunread_* 트리거가 알림 INSERT/확인/삭제 시 갱신한다.)
+        input:
+            - parent_ids: 부모 id 리스트
+        output:
+            - {parent_id: 확인하지 않은 알림 수}
+        '''
+
+        if not parent_ids:
+            return {}
+
+        db = get_db_session()
+
+        rows = db.query(ParentTable.parent_id, ParentTable.alertUnread).filter(
+            ParentTable.parent_id.in_(set(parent_ids))).all()
+        return {parent_id: unread for parent_id, unread in rows}
+
+    def rebuildUnread(self) -> int:
+        '''
+        모든 부모의 확인하지 않은 알림 수 재계산 (alertUnread 컬럼 추가 후 한 번 실행)
+        output:
+            - 갱신한 부모 수
+        '''
+
+        db = get_db_session()
+
+        try:
+            result = db.execute(update(ParentTable).values(
+                alertUnread=select(func.count()).where(
+                    AlertTable.parent_id == ParentTable.parent_id,
+                    AlertTable.hasChecked == False).scalar_subquery()))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+        return result.rowcount
+
+    def _to_alert_list(self, alerts: list) -> list:
+        # 알림을 생성한 부모의 정보를 한 번에 가져온다.
+        authors = authorService.getAuthors(
+            [alert.createrId for alert in alerts])
+
+        return [{"alert_id": alert.alert_id,
+                 "alert_type": alert.alert_type,
+                 "message": alert.message,
+                 "creater": {
+                     "parent_id": alert.createrId,
+                     "nickname": authors.get(alert.createrId, {}).get('nickname'),
+                     "photo_id": alert.createrId + ".jpeg"
+                 },
+                 "action": alert.action
+                 } for alert in alerts]
+
+    def get_alert_page(self, parent_id: str, size: int = 20, cursor: Optional[str] = None,
+                       unchecked: bool = True) -> dict:
+        '''
+        알림 리스트 페이지 조회 (최신순)
+        input:
+            - parent_id: 부모 id
+            - size: 가져올 알림 수
+            - cursor: 이전 결과의 nextCursor (없으면 처음부터)
+            - unchecked: True면 확인하지 않은 알림만
+        output:
+            - alerts: 알림 리스트
+            - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
+        '''
+
+        db = get_db_session()
+
+        query = db.query(AlertTable).filter(AlertTable.parent_id == parent_id)
+        if unchecked:
+            query = query.filter(AlertTable.hasChecked == False)
+
+        try:
+            alerts, nextCursor = keyset_page(
+                query, [AlertTable.alert_id], cursor, size,
+                key=lambda alert: (alert.alert_id,))
+        except ValueError:
+            raise CustomException("Invalid cursor")
+
+        return {'alerts': self._to_alert_list(alerts), 'nextCursor': nextCursor}
+
     def get_alert_list(self, parent_id: str) -> List[GetAlertListOutput]:
         '''
         확인하지 않은 알림 리스트 조회
@@ -60,17 +164,7 @@ class AlertService:
             AlertTable.parent_id == parent_id, AlertTable.hasChecked == False).all()
 
         # alerts에서 필요한 정보로 변환
-        alerts = [{"alert_id": alert.alert_id,
-                   "alert_type": alert.alert_type,
-                   "message": alert.message,
-                   "creater": {
-                       "parent_id": alert.createrId,
-                       "nickname": getattr(db.query(ParentTable).filter(
-                           ParentTable.parent_id == alert.createrId).first(), 'nickname', None),
-                       "photo_id": alert.createrId + ".jpeg"
-                   },
-                   "action": alert.action
-                   } for alert in alerts]
+        alerts = self._to_alert_list(alerts)
 
         alerts.reverse()
         return alerts
@@ -0,0 +1,349 @@
+from typing import Optional, List, Dict
+from datetime import datetime
+from sqlalchemy import insert, text, bindparam
+import asyncio
+import logging
+
+from model.alert import AlertTable
+from model.alertsub import AlertSubscribeTable
+from model.post import PostTable
+from model.friend import FriendTable
+from services.author import AuthorService
+from services.alert import AlertService
+from services.chat import chatService
+from db import get_db_session, detach_request_session
+from core.env import env
+
+
+# 알림 종류
+SUBSCRIBE_POST = 'subscribe_post'
+POST_HEART = 'post_heart'
+POST_SCRIPT = 'post_script'
+NEW_COMMENT = 'new_comment'
+NEW_FRIEND = 'new_friend'
+
+# 한 번에 처리할 최대 이벤트 수, 한 번의 INSERT로 넣을 최대 알림 수
+EVENT_BATCH = 100
+INSERT_CHUNK = 1000
+
+# 처리에 실패한 이벤트를 다시 시도하는 횟수, 다시 시도하기 전 기다리는 시간(초)
+EVENT_RETRIES = 3
+EVENT_RETRY_DELAY = 1.0
+
+# 워커 종료 신호 (flush()가 큐에 넣는다)
+_STOP_WORKER = object()
+
+# 큐와 함께 사용하면 알림을 두 번 만드는 sql.txt의 트리거
+ALERT_TRIGGERS = ['alert_createPost', 'alert_friendHeart', 'alert_friendScript',
+                  'alert_newFriend', 'alert_postComment']
+
+logger = logging.getLogger(__name__)
+
+
+authorService = AuthorService()
+alertService = AlertService()
+
+
+class AlertQueueService:
+    """
+    알림 생성 파이프라인
+    - ALERT_QUEUE=true 이면 게시물/하트/스크랩/댓글/친구 이벤트를 프로세스 내 asyncio 큐에 넣고,
+      백그라운드 워커가 구독자/수신자를 펼쳐 알림을 INSERT_CHUNK 단위로 한 번에 저장한다.
+      이때 sql.txt의 alert_* 트리거는 삭제해야 한다. (python rebuild.py alert --drop-triggers)
+      서버 시작 시 트리거가 남아 있으면 큐를 끄고 트리거가 알림을 만들게 둔다.
+    - false(기본값)이면 기존처럼 MySQL 트리거가 알림을 만들고 publish()는 아무것도 하지 않는다.
+    """
+
+    def __init__(self):
+        self.enabled = env.get_bool("ALERT_QUEUE", False)
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.published = 0
+        self.processed = 0
+        self.inserted = 0
+        self.failures = 0
+        self.dropped = 0
+
+    # 데이터베이스에 남아 있는 알림 트리거 이름
+    def findTriggers(self) -> List[str]:
+        db = get_db_session()
+        rows = db.execute(text(
+            "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS "
+            "WHERE TRIGGER_SCHEMA = DATABASE() AND TRIGGER_NAME IN :names"
+        ).bindparams(bindparam('names', expanding=True)), {'names': ALERT_TRIGGERS}).all()
+        return [row[0] for row in rows]
+
+    # 알림 트리거 삭제 (큐로 옮길 때 한 번 실행)
+    def dropTriggers(self) -> List[str]:
+        """
+        알림 트리거 삭제
+        --output
+            - 삭제한 트리거 이름
+        """
+        db = get_db_session()
+
+        triggers = self.findTriggers()
+        try:
+            for name in triggers:
+                db.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        return triggers
+
+    # 서버 시작 시 확인: 트리거가 남아 있으면 알림이 두 번 저장되지 않도록 큐를 끈다.
+    def checkTriggers(self) -> bool:
+        if not self.enabled:
+            return False
+
+        try:
+            triggers = self.findTriggers()
+        except Exception:
+            logger.exception("Failed to check alert triggers")
+            return self.enabled
+
+        if triggers:
+            logger.error("ALERT_QUEUE is disabled because alert triggers still exist: %s. "
+                         "Run 'python rebuild.py alert --drop-triggers' to migrate.",
+                         ', '.join(triggers))
+            self.enabled = False
+        return self.enabled
+
+    # 이벤트 발행 (요청 처리 스레드에서 호출)
+    def publish(self, alert_type: str, creater_id: str, **data):
+        """
+        알림 이벤트 발행
+        --input
+            - alert_type: SUBSCRIBE_POST | POST_HEART | POST_SCRIPT | NEW_COMMENT | NEW_FRIEND
+            - creater_id: 이벤트를 만든 부모 아이디
+            - data: post_id, content, friend 등 이벤트 정보
+        """
+        if not self.enabled:
+            return
+
+        event = {'alert_type': alert_type, 'creater_id': creater_id,
+                 'createTime': datetime.now(), **data}
+        self.published += 1
+
+        # 워커가 없으면(스크립트 등) 바로 처리한다.
+        if self._loop is None or self._loop.is_closed():
+            self.process([event])
+            return
+
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def _getRecipients(self, db, event: dict) -> List[str]:
+        alert_type = event['alert_type']
+        creater_id = event['creater_id']
+
+        # 작성자를 구독한 부모
+        if alert_type == SUBSCRIBE_POST:
+            return [i[0] for i in db.query(AlertSubscribeTable.subscriber_id).filter(
+                AlertSubscribeTable.creater_id == creater_id).all()]
+
+        # 새 친구
+        if alert_type == NEW_FRIEND:
+            return [event['friend']]
+
+        owner = db.query(PostTable.parent_id).filter(
+            PostTable.post_id == event['post_id']).scalar()
+        if owner is None:
+            return []
+
+        # 게시물 작성자
+        if alert_type == NEW_COMMENT:
+            return [owner]
+
+        # 하트/스크랩은 게시물 작성자가 친구로 등록한 부모가 누른 경우에만
+        isFriend = db.query(FriendTable.friend_id).filter(
+            FriendTable.parent_id == owner,
+            FriendTable.friend == creater_id).first() is not None
+        return [owner] if isFriend else []
+
+    def _getMessage(self, event: dict, nickname: Optional[str]) -> tuple:
+        alert_type = event['alert_type']
+
+        if alert_type == SUBSCRIBE_POST:
+            return f'{nickname}님이 새로운 이야기를 작성하셨어요!', {'post_id': event['post_id']}
+        if alert_type == POST_HEART:
+            return f'{nickname}님이 새로운 좋아요를 하셨어요!', {'post_id': event['post_id']}
+        if alert_type == POST_SCRIPT:
+            return f'{nickname}님이 새로운 스크랩을 하셨어요!', {'post_id': event['post_id']}
+        if alert_type == NEW_COMMENT:
+            return (f"{nickname}님의 댓글: {event['content']}"[:255],
+                    {'post_id': event['post_id'], 'message': event['content']})
+        return f'{nickname}님과 친구가 되었어요!', {'parent_id': event['creater_id']}
+
+    # 이벤트를 알림으로 펼쳐 저장
+    def process(self, events: List[dict]) -> int:
+        """
+        이벤트를 알림으로 펼쳐 저장
+        --input
+            - events: publish로 발행된 이벤트 리스트
+        --output
+            - 저장한 알림 수
+        """
+        db = get_db_session()
+
+        authors = authorService.getAuthors([event['creater_id'] for event in events])
+
+        rows = []
+        for event in events:
+            nickname = authors.get(event['creater_id'], {}).get('nickname')
+            message, action = self._getMessage(event, nickname)
+            for recipient in self._getRecipients(db, event):
+                rows.append({'parent_id': recipient,
+                             'createTime': event['createTime'],
+                             'hasChecked': False,
+                             'createrId': event['creater_id'],
+                             'alert_type': event['alert_type'],
+                             'message': message,
+                             'action': action})
+
+        try:
+            for i in range(0, len(rows), INSERT_CHUNK):
+                db.execute(insert(AlertTable), rows[i:i + INSERT_CHUNK])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+        self.processed += len(events)
+        self.inserted += len(rows)
+
+        # 저장은 끝났으므로 푸시에 실패해도 다시 처리하지 않는다. (알림이 두 번 저장되지 않도록)
+        try:
+            self._push(rows, authors)
+        except Exception:
+            logger.exception("Failed to push %d alerts", len(rows))
+        return len(rows)
+
+    # 웹소켓(/chat/ws)에 연결된 부모에게 새 알림과 확인하지 않은 알림 수를 보낸다.
+    def _push(self, rows: List[dict], authors: Dict[str, dict]):
+        if self._loop is None:
+            return
+
+        received: Dict[str, List[dict]] = {}
+        for row in rows:
+            received.setdefault(row['parent_id'], []).append(row)
+
+        # 저장이 끝난 뒤의 알림 수 (alertunread_insert 트리거가 갱신한 값)
+        unread = alertService.get_unread_counts(list(received))
+
+        for parent_id, alerts in received.items():
+            message = {
+                'type': 'alert',
+                'unread': unread.get(parent_id, 0),
+                'alerts': [{'alert_type': alert['alert_type'],
+                            'message': alert['message'],
+                            'creater': {
+                                'parent_id': alert['createrId'],
+                                'nickname': authors.get(alert['createrId'], {}).get('nickname'),
+                                'photo_id': alert['createrId'] + '.jpeg'
+                            },
+                            'action': alert['action'],
+                            'createTime': alert['createTime'].isoformat()}
+                           for alert in alerts]
+            }
+            asyncio.run_coroutine_threadsafe(
+                self._send(parent_id, message), self._loop)
+
+    # 접속한 부모에게만 보낸다. (다른 워커에 접속한 경우 백플레인으로 전달)
+    async def _send(self, parent_id: str, message: dict):
+        detach_request_session()
+        try:
+            if not await chatService.is_online(parent_id):
+                return
+            await chatService.send_to_parent(parent_id, message)
+        except Exception:
+            logger.exception("Failed to push alerts to %s", parent_id)
+
+    def stats(self) -> dict:
+        return {'enabled': self.enabled,
+                'queued': self._queue.qsize() if self._queue is not None else 0,
+                'published': self.published, 'processed': self.processed,
+                'inserted': self.inserted, 'failures': self.failures,
+                'dropped': self.dropped}
+
+    # 배치를 처리하고, 실패하면 이벤트 하나씩 다시 처리한다. -> 처리하지 못한 이벤트
+    async def _process_batch(self, events: List[dict]) -> List[dict]:
+        try:
+            await asyncio.to_thread(self.process, events)
+            return []
+        except Exception:
+            self.failures += 1
+            logger.exception("Failed to process %d alert events", len(events))
+        if len(events) == 1:
+            return events
+
+        failed = []
+        for event in events:
+            try:
+                await asyncio.to_thread(self.process, [event])
+            except Exception:
+                logger.exception("Failed to process alert event: %r", event)
+                failed.append(event)
+        return failed
+
+    # 실패한 이벤트는 EVENT_RETRIES번까지 다시 큐에 넣는다.
+    def _requeue(self, events: List[dict]):
+        for event in events:
+            attempts = event.get('attempts', 0) + 1
+            if attempts < EVENT_RETRIES:
+                self._queue.put_nowait({**event, 'attempts': attempts})
+            else:
+                self.dropped += 1
+                logger.error("Dropping alert event after %d attempts: %r", attempts, event)
+
+    # 큐에 쌓인 이벤트를 EVENT_BATCH개씩 처리 (_STOP_WORKER를 받으면 남은 이벤트를 처리하고 끝낸다)
+    async def runWorker(self):
+        if not self.enabled:
+            return
+
+        detach_request_session()
+        self._queue = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._worker = asyncio.current_task()
+
+        stop = False
+        while not stop:
+            events = []
+            event = await self._queue.get()
+            while True:
+                if event is _STOP_WORKER:
+                    stop = True
+                else:
+                    events.append(event)
+                if len(events) >= EVENT_BATCH or self._queue.empty():
+                    break
+                event = self._queue.get_nowait()
+
+            if not events:
+                continue
+            failed = await self._process_batch(events)
+            if failed:
+                self._requeue(failed)
+                if not stop:
+                    await asyncio.sleep(EVENT_RETRY_DELAY)
+                elif not self._queue.empty():
+                    # 종료 중이면 기다리지 않고 남은 시도를 마친다.
+                    stop = False
+                    self._queue.put_nowait(_STOP_WORKER)
+
+        # 이후의 publish()는 바로 처리한다.
+        self._loop = None
+
+    # 종료 전에 큐에 남은 이벤트 처리 (처리 중인 배치가 끝날 때까지 기다린다)
+    async def flush(self):
+        if self._worker is None or self._worker.done():
+            return
+
+        self._queue.put_nowait(_STOP_WORKER)
+        await self._worker
+        self._worker = None
+
+
+# 프로세스 내에서 공유하는 알림 큐
+alertQueueService = AlertQueueService()
@@ -0,0 +1,149 @@
+from typing import Optional, Dict
+import time
+import numpy as np
+
+from core.env import env
+from utils.cache import LRUCache
+from services.embedding import normalize_query
+from services.vectorstore import vectorStoreService
+
+
+# 저장할 최대 답변 수, 유효 시간(초)
+ANSWER_CACHE_SIZE = env.get_int("ANSWER_CACHE_SIZE", 2000)
+ANSWER_CACHE_TTL = env.get_float("ANSWER_CACHE_TTL", 3600)
+
+# 임베딩 코사인 유사도가 이 값 이상이면 같은 질문으로 본다. (1 이상이면 유사 질문 캐시 사용 안 함)
+ANSWER_CACHE_THRESHOLD = env.get_float("ANSWER_CACHE_THRESHOLD", 0.95)
+
+
+class AnswerCacheService:
+    """
+    AI 의사 답변 캐시 (이전 채팅 내역이 없는 질문만)
+    - 정규화한 질문이 같으면 바로 답변을 돌려준다. (LRU, ANSWER_CACHE_TTL)
+    - 다르면 질문 임베딩(services/embedding.py)과 저장된 질문 임베딩의 코사인 유사도가
+      ANSWER_CACHE_THRESHOLD 이상인 가장 비슷한 질문의 답변을 돌려준다.
+    - 유사 질문 검색용 임베딩은 ANSWER_CACHE_SIZE개의 원형 버퍼에 저장하고,
+      답변은 LRU에만 있으므로 LRU에서 만료/삭제되면 유사 질문으로도 찾지 않는다.
+    - FAISS 인덱스가 교체되면 RAG 결과가 달라지므로 모두 지운다.
+    """
+
+    def __init__(self, maxsize: int = ANSWER_CACHE_SIZE, ttl: float = ANSWER_CACHE_TTL,
+                 threshold: float = ANSWER_CACHE_THRESHOLD):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._answers = LRUCache(maxsize=max(maxsize, 1), ttl=ttl)
+        self._vectors: Optional[np.ndarray] = None
+        self._keys: list = [None] * maxsize
+        self._slots: Dict[str, int] = {}
+        self._next = 0
+        self._index: Optional[str] = None
+        self.exactHits = 0
+        self.semanticHits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    # FAISS 인덱스가 바뀌었으면 비운다.
+    def _check_index(self):
+        if self._index != vectorStoreService.indexName:
+            self.clear()
+            self._index = vectorStoreService.indexName
+
+    def clear(self):
+        self._answers.clear()
+        self._vectors = None
+        self._keys = [None] * self.maxsize
+        self._slots.clear()
+        self._next = 0
+
+    # 같은 질문 찾기
+    def get(self, text: str) -> Optional[dict]:
+        """
+        정규화한 질문이 같은 답변 찾기
+        --input
+            - text: 질문
+        --output
+            - {prompt, response} 또는 None
+        """
+        if not self.enabled:
+            return None
+        self._check_index()
+
+        value = self._answers.get(normalize_query(text))
+        if value is not None:
+            self.exactHits += 1
+        return value
+
+    # 비슷한 질문 찾기 (get()이 None일 때 사용, 못 찾으면 miss로 센다)
+    def get_similar(self, embedding: np.ndarray) -> Optional[dict]:
+        """
+        임베딩이 가장 비슷한 질문의 답변 찾기
+        --input
+            - embedding: 정규화된 질문 임베딩
+        --output
+            - {prompt, response} 또는 None
+        """
+        if not self.enabled:
+            return None
+        self._check_index()
+
+        if self._vectors is not None and self._slots and self.threshold < 1:
+            scores = self._vectors @ np.asarray(embedding, dtype=np.float32)
+            for slot in np.argsort(-scores)[:4]:
+                if scores[slot] < self.threshold:
+                    break
+                value = self._answers.get(self._keys[slot])
+                if value is not None:
+                    self.semanticHits += 1
+                    return value
+
+        self.misses += 1
+        return None
+
+    # 답변 저장
+    def set(self, text: str, embedding: Optional[np.ndarray], value: dict):
+        """
+        답변 저장
+        --input
+            - text: 질문
+            - embedding: 정규화된 질문 임베딩 (None이면 같은 질문으로만 찾는다)
+            - value: {prompt, response}
+        """
+        if not self.enabled:
+            return
+        self._check_index()
+
+        key = normalize_query(text)
+        self._answers.set(key, value)
+        self.stores += 1
+
+        if embedding is None:
+            return
+        embedding = np.asarray(embedding, dtype=np.float32)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.maxsize, len(embedding)), dtype=np.float32)
+
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._next
+            self._next = (self._next + 1) % self.maxsize
+            if self._keys[slot] is not None:
+                del self._slots[self._keys[slot]]
+            self._keys[slot] = key
+            self._slots[key] = slot
+        self._vectors[slot] = embedding
+
+    def stats(self) -> dict:
+        lookups = self.exactHits + self.semanticHits + self.misses
+        return {'exactHits': self.exactHits, 'semanticHits': self.semanticHits,
+                'misses': self.misses,
+                'hitRate': round((self.exactHits + self.semanticHits) / lookups, 4) if lookups else 0,
+                'stores': self.stores, 'size': len(self._answers),
+                'threshold': self.threshold}
+
+
+# AI 의사 답변 캐시 (프로세스별)
+answerCacheService = AnswerCacheService()
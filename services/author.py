@@ -0,0 +1,53 @@
+from typing import Optional, Dict, Iterable
+
+from model.parent import ParentTable
+from db import get_db_session
+from utils.cache import LRUCache
+
+
+# 피드/검색/알림에서 작성자 정보를 채우기 위한 캐시 (parent_id -> {name, nickname, photoId})
+# 닉네임 변경이 다른 워커에도 반영되도록 짧은 TTL을 사용한다.
+author_cache = LRUCache(maxsize=8192, ttl=60)
+
+
+class AuthorService:
+
+    # 여러 작성자 정보를 한 번에 가져오기
+    def getAuthors(self, parent_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        여러 작성자 정보를 한 번에 가져오기
+        --input
+            - parent_ids: 부모 아이디 리스트
+        --output
+            - {parent_id: {name, nickname, photoId}} (존재하지 않는 부모는 포함되지 않음)
+        """
+        parent_ids = [i for i in dict.fromkeys(parent_ids) if i is not None]
+        authors = author_cache.get_many(parent_ids)
+
+        missing = [i for i in parent_ids if i not in authors]
+        if not missing:
+            return authors
+
+        db = get_db_session()
+
+        # 캐시에 없는 작성자는 IN 쿼리 한 번으로 가져온다.
+        rows = db.query(ParentTable.parent_id,
+                        ParentTable.name,
+                        ParentTable.nickname,
+                        ParentTable.photoId).filter(
+            ParentTable.parent_id.in_(missing)).all()
+
+        found = {row[0]: {'name': row[1], 'nickname': row[2], 'photoId': row[3]}
+                 for row in rows}
+        author_cache.set_many(found)
+        authors.update(found)
+
+        return authors
+
+    # 하나의 작성자 정보 가져오기
+    def getAuthor(self, parent_id: str) -> Optional[dict]:
+        return self.getAuthors([parent_id]).get(parent_id)
+
+    # 부모 정보가 수정/삭제된 경우 캐시 제거
+    def invalidate(self, parent_id: str):
+        author_cache.delete(parent_id)
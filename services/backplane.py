@@ -0,0 +1,287 @@
+from typing import Optional, List, Dict, Callable, Awaitable
+from urllib.parse import urlparse
+from abc import ABC, abstractmethod
+import asyncio
+import logging
+
+from core.env import env
+
+
+# 메시지를 받았을 때 호출할 함수 (채널, 데이터)
+Handler = Callable[[str, str], Awaitable[None]]
+
+logger = logging.getLogger(__name__)
+
+
+class Backplane(ABC):
+    """
+    채팅 메시지 중계(pub/sub)와 접속 정보(presence) 공유
+    - 여러 워커/서버에 흩어진 웹소켓 연결로 메시지를 전달하기 위해 사용한다.
+    - publish한 메시지는 자신을 포함해 subscribe한 모든 워커에 전달된다.
+    - presence는 parent_id -> node_id 로, 같은 아이디가 여러 곳에 연결되지 않도록 막는다.
+    """
+
+    name = 'base'
+
+    # 채널별 구독 시작
+    @abstractmethod
+    async def start(self, handlers: Dict[str, Handler]):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, data: str):
+        pass
+
+    # 접속 등록 (이미 다른 곳에 접속되어 있으면 False)
+    @abstractmethod
+    async def claim(self, parent_id: str, node_id: str, ttl: int) -> bool:
+        pass
+
+    # 접속 만료 시간 갱신
+    async def refresh(self, parent_ids: List[str], node_id: str, ttl: int):
+        pass
+
+    # 접속 해제 (자신이 등록한 경우에만)
+    @abstractmethod
+    async def release(self, parent_id: str, node_id: str):
+        pass
+
+    @abstractmethod
+    async def get_node(self, parent_id: str) -> Optional[str]:
+        pass
+
+
+class MemoryBackplane(Backplane):
+    """
+    프로세스 내부 구현 (워커 1개일 때 기본값)
+    """
+
+    name = 'memory'
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._presence: Dict[str, str] = {}
+
+    async def start(self, handlers: Dict[str, Handler]):
+        for channel, handler in handlers.items():
+            self._handlers.setdefault(channel, []).append(handler)
+
+    async def close(self):
+        self._handlers = {}
+
+    async def publish(self, channel: str, data: str):
+        for handler in self._handlers.get(channel, []):
+            await handler(channel, data)
+
+    async def claim(self, parent_id: str, node_id: str, ttl: int) -> bool:
+        return self._presence.setdefault(parent_id, node_id) == node_id
+
+    async def release(self, parent_id: str, node_id: str):
+        if self._presence.get(parent_id) == node_id:
+            del self._presence[parent_id]
+
+    async def get_node(self, parent_id: str) -> Optional[str]:
+        return self._presence.get(parent_id)
+
+
+class RespError(Exception):
+    pass
+
+
+class RespConnection:
+    """
+    Redis 프로토콜(RESP2) 연결
+    - redis 패키지 없이 PUBLISH/SUBSCRIBE/SET/GET/DEL/EVAL만 사용한다.
+    - Redis, Valkey, KeyDB 등 RESP 호환 서버와 unix 소켓(unix:///path?db=0)을 지원한다.
+    """
+
+    def __init__(self, url: str):
+        self.url = urlparse(url)
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self):
+        if self.url.scheme == 'unix':
+            self.reader, self.writer = await asyncio.open_unix_connection(self.url.path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.url.hostname or 'localhost', self.url.port or 6379)
+
+        if self.url.password:
+            if self.url.username:
+                await self.execute('AUTH', self.url.username, self.url.password)
+            else:
+                await self.execute('AUTH', self.url.password)
+
+        db = self.url.path.strip('/') if self.url.scheme != 'unix' else ''
+        for query in self.url.query.split('&'):
+            if query.startswith('db='):
+                db = query[3:]
+        if db and db != '0':
+            await self.execute('SELECT', db)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def send(self, *args):
+        data = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            data.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        self.writer.write(b''.join(data))
+
+    async def read(self):
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError('connection closed')
+
+        kind, value = line[:1], line[1:-2]
+        if kind == b'+':
+            return value.decode()
+        if kind == b'-':
+            raise RespError(value.decode())
+        if kind == b':':
+            return int(value)
+        if kind == b'$':
+            if int(value) < 0:
+                return None
+            data = await self.reader.readexactly(int(value) + 2)
+            return data[:-2].decode()
+        if kind == b'*':
+            if int(value) < 0:
+                return None
+            return [await self.read() for _ in range(int(value))]
+        raise RespError(f'Unknown reply: {line!r}')
+
+    async def execute(self, *args):
+        self.send(*args)
+        await self.writer.drain()
+        return await self.read()
+
+    # 여러 명령을 한 번에 보내고 응답을 모아 받는다. (pipeline)
+    async def execute_many(self, commands: List[tuple]) -> list:
+        for args in commands:
+            self.send(*args)
+        await self.writer.drain()
+
+        # 오류 응답이 있어도 나머지 응답은 모두 읽어야 연결을 계속 사용할 수 있다.
+        replies, error = [], None
+        for _ in commands:
+            try:
+                replies.append(await self.read())
+            except RespError as e:
+                replies.append(None)
+                error = error or e
+        if error is not None:
+            raise error
+        return replies
+
+
+# 자신이 등록한 접속 정보만 삭제
+RELEASE_SCRIPT = "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end return 0"
+
+# 자신이 등록한 접속 정보만 만료 시간 갱신 (다른 워커가 등록한 접속을 덮어쓰지 않는다)
+REFRESH_SCRIPT = ("if redis.call('GET', KEYS[1]) == ARGV[1] then "
+                  "return redis.call('SET', KEYS[1], ARGV[1], 'XX', 'EX', ARGV[2]) end return nil")
+
+
+class RedisBackplane(Backplane):
+    """
+    Redis 프로토콜 구현 (워커/서버가 여러 개일 때)
+    - CHAT_BACKPLANE_URL=redis://[:password@]host:port/db 또는 unix:///path/redis.sock
+    - 명령용 연결 1개와 구독용 연결 1개를 사용하고, 구독이 끊기면 다시 연결한다.
+    """
+
+    name = 'redis'
+    PRESENCE_KEY = 'chat:presence:'
+
+    def __init__(self, url: str):
+        self.url = url
+        self._conn: Optional[RespConnection] = None
+        self._lock = asyncio.Lock()
+        self._listener: Optional[asyncio.Task] = None
+
+    async def _execute(self, *args):
+        return (await self._execute_many([args]))[0]
+
+    async def _execute_many(self, commands: List[tuple]) -> list:
+        async with self._lock:
+            try:
+                if self._conn is None:
+                    self._conn = RespConnection(self.url)
+                    await self._conn.connect()
+                return await self._conn.execute_many(commands)
+            except (ConnectionError, OSError):
+                # 다음 명령에서 다시 연결한다.
+                if self._conn is not None:
+                    self._conn.close()
+                self._conn = None
+                raise
+
+    async def start(self, handlers: Dict[str, Handler]):
+        self._listener = asyncio.create_task(self._listen(handlers))
+
+    async def _listen(self, handlers: Dict[str, Handler]):
+        while True:
+            conn = RespConnection(self.url)
+            try:
+                await conn.connect()
+                await conn.execute('SUBSCRIBE', *handlers)
+                while True:
+                    reply = await conn.read()
+                    if reply and reply[0] == 'message' and reply[1] in handlers:
+                        try:
+                            await handlers[reply[1]](reply[1], reply[2])
+                        except Exception:
+                            logger.exception("Error handling backplane message on %s", reply[1])
+            except asyncio.CancelledError:
+                conn.close()
+                raise
+            except Exception:
+                logger.exception("Backplane subscription lost, reconnecting")
+                conn.close()
+                await asyncio.sleep(1)
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def publish(self, channel: str, data: str):
+        await self._execute('PUBLISH', channel, data)
+
+    async def claim(self, parent_id: str, node_id: str, ttl: int) -> bool:
+        key = self.PRESENCE_KEY + parent_id
+        if await self._execute('SET', key, node_id, 'NX', 'EX', ttl) == 'OK':
+            return True
+        # 같은 워커에서 다시 연결한 경우
+        return await self._execute('GET', key) == node_id
+
+    async def refresh(self, parent_ids: List[str], node_id: str, ttl: int):
+        if parent_ids:
+            await self._execute_many([('EVAL', REFRESH_SCRIPT, 1, self.PRESENCE_KEY + parent_id,
+                                       node_id, ttl)
+                                      for parent_id in parent_ids])
+
+    async def release(self, parent_id: str, node_id: str):
+        await self._execute('EVAL', RELEASE_SCRIPT, 1, self.PRESENCE_KEY + parent_id, node_id)
+
+    async def get_node(self, parent_id: str) -> Optional[str]:
+        return await self._execute('GET', self.PRESENCE_KEY + parent_id)
+
+
+# CHAT_BACKPLANE_URL이 없으면 프로세스 내부 구현을 사용한다.
+def create_backplane() -> Backplane:
+    url = env.get("CHAT_BACKPLANE_URL")
+    if not url or url == 'memory':
+        return MemoryBackplane()
+    return RedisBackplane(url)
@@ -0,0 +1,184 @@
+from typing import Optional, List
+from datetime import datetime, timedelta
+from sqlalchemy import desc
+from constants.path import *
+import os
+import json
+import asyncio
+import logging
+import threading
+
+from model.post import PostTable
+from services.postsummary import PostSummaryService
+from services.author import AuthorService
+from db import get_db_session
+from utils.os import write_file_atomic
+
+
+# 배너에 노출할 게시물 수, 후보 게시물 수, 집계 기간(일)
+BANNER_SIZE = 5
+BANNER_CANDIDATES = 100
+BANNER_DAYS = 3
+
+logger = logging.getLogger(__name__)
+
+
+postSummaryService = PostSummaryService()
+authorService = AuthorService()
+
+
+class BannerService:
+    """
+    메인 페이지 배너 사전 계산
+    - 집계 기간(오늘 00시 기준 3일 전 ~ 오늘 00시)마다 한 번 계산하여
+      POSTMAIN_BANNER_DIR/<기간 시작일>.json 에 저장하고 메모리에서 제공한다.
+    - 서버 시작 시, 그리고 매일 00시에 runScheduler가 다시 계산한다.
+    """
+
+    def __init__(self):
+        self._banner: Optional[dict] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.fileLoads = 0
+
+    def _window(self, now: Optional[datetime] = None):
+        # 오늘 00시부터 3일 전 00시까지의 시간 간격을 계산합니다.
+        end = (now or datetime.now()).replace(
+            hour=0, minute=0, second=0, microsecond=0)
+        return end - timedelta(days=BANNER_DAYS), end
+
+    def _file_path(self, start: datetime) -> str:
+        return os.path.join(POSTMAIN_BANNER_DIR, start.strftime('%Y-%m-%d') + '.json')
+
+    def build(self, now: Optional[datetime] = None) -> dict:
+        """
+        배너 계산 후 파일에 저장
+        --output
+            - {window, builtAt, banners: List<{post_id, photoId, title, author_name, desc}>}
+        """
+        start, end = self._window(now)
+
+        db = get_db_session()
+
+        # 기간 내 하트가 많은 순으로 후보 게시물을 가져옵니다.
+        posts = db.query(PostTable).filter(
+            PostTable.createTime <= end,
+            PostTable.createTime >= start,
+            PostTable.deleteTime == None
+        ).order_by(desc(PostTable.pHeart)).limit(BANNER_CANDIDATES).all()
+
+        summaries = postSummaryService.getSummaries([i.post_id for i in posts])
+        authors = authorService.getAuthors([i.parent_id for i in posts])
+
+        banners = []
+        for i in posts:
+            summary = summaries[i.post_id]
+
+            # 이미지가 있는 게시물만 배너로 사용한다.
+            if not summary['photoId'] or i.parent_id not in authors:
+                continue
+
+            banners.append({
+                'post_id': i.post_id,
+                'photoId': summary['photoId'],
+                'title': i.title,
+                'author_name': authors[i.parent_id]['name'],
+                'desc': summary['desc']
+            })
+
+            if len(banners) == BANNER_SIZE:
+                break
+
+        banner = {'window': start.isoformat(),
+                  'builtAt': datetime.now().isoformat(),
+                  'banners': banners}
+
+        write_file_atomic(self._file_path(start),
+                          json.dumps(banner, ensure_ascii=False))
+        self.builds += 1
+        return banner
+
+    def _load(self, start: datetime) -> Optional[dict]:
+        file_path = self._file_path(start)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, 'r', encoding='UTF-8') as f:
+                banner = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.fileLoads += 1
+        return banner
+
+    # 배너 다시 계산 (스케줄러, 무효화 후 호출)
+    def refresh(self, now: Optional[datetime] = None) -> List[dict]:
+        with self._lock:
+            self._banner = self.build(now)
+            return self._banner['banners']
+
+    # 현재 집계 기간의 배너 가져오기
+    def getBanners(self) -> List[dict]:
+        """
+        현재 집계 기간의 배너 가져오기
+        --output
+            - List<{post_id, photoId, title, author_name, desc}>
+        """
+        start, _ = self._window()
+        banner = self._banner
+        if banner is not None and banner['window'] == start.isoformat():
+            self.hits += 1
+            return banner['banners']
+
+        with self._lock:
+            self.misses += 1
+            # 다른 요청이 먼저 계산한 경우
+            if self._banner is not None and self._banner['window'] == start.isoformat():
+                return self._banner['banners']
+
+            # 다른 워커가 저장한 파일이 있으면 사용하고, 없으면 계산한다.
+            self._banner = self._load(start) or self.build()
+            return self._banner['banners']
+
+    # 배너 무효화 (다음 요청 시 다시 계산)
+    def invalidate(self):
+        with self._lock:
+            if self._banner is not None:
+                start = datetime.fromisoformat(self._banner['window'])
+                if os.path.exists(self._file_path(start)):
+                    os.remove(self._file_path(start))
+            self._banner = None
+
+    # 배너에 포함된 게시물이 수정/삭제된 경우 무효화
+    def invalidatePost(self, post_id: int):
+        banner = self._banner
+        if banner is not None and any(i['post_id'] == post_id for i in banner['banners']):
+            self.invalidate()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        banner = self._banner
+        return {'hits': self.hits, 'misses': self.misses,
+                'hitRate': self.hits / total if total else 0.0,
+                'builds': self.builds, 'fileLoads': self.fileLoads,
+                'window': banner['window'] if banner else None,
+                'builtAt': banner['builtAt'] if banner else None,
+                'size': len(banner['banners']) if banner else 0}
+
+    # 서버 시작 시 배너를 계산하고, 매일 00시에 다시 계산
+    async def runScheduler(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                logger.exception("Failed to refresh banners")
+
+            now = datetime.now()
+            tomorrow = (now + timedelta(days=1)).replace(
+                hour=0, minute=0, second=0, microsecond=0)
+            await asyncio.sleep((tomorrow - now).total_seconds() + 1)
+
+
+# 프로세스 내에서 공유하는 배너 서비스
+bannerService = BannerService()
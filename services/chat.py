@@ -1,102 +1,618 @@
 from fastapi import HTTPException, WebSocket
 from typing import Optional, List, Set, Dict
 import json
+import asyncio
+import logging
+from uuid import uuid4
 from datetime import datetime
+from sqlalchemy import select, update, or_
+from sqlalchemy.exc import OperationalError, InterfaceError, TimeoutError as PoolTimeoutError
 
-from db import get_db_session
+from db import get_async_db_session, detach_request_session
 from model.chatroom import ChatRoom, ChatRoomTable
-from model.chat import ChatTable
+from model.chat import Chat, ChatTable
 from model.pcconnect import PCConnectTable
 from model.parent import ParentTable
+from services.author import author_cache
+from services.backplane import create_backplane
+from services.chatprotocol import ChatProtocol
+from utils.cache import LRUCache
+from core.env import env
 
 from schemas.chatroom import *
 from error.exception.customerror import *
 
+
+logger = logging.getLogger(__name__)
+
+# 연결별로 보내지 못하고 쌓아둘 수 있는 최대 메시지 수 (넘으면 느린 연결로 보고 끊는다)
+SEND_QUEUE_SIZE = 100
+
+# 한 번에 저장할 최대 채팅 수
+CHAT_WRITE_BATCH = 200
+
+# 저장에 실패한 채팅을 다시 시도하는 횟수, 다시 시도하기 전 기다리는 시간(초)
+CHAT_WRITE_RETRIES = 3
+CHAT_WRITE_RETRY_DELAY = 1.0
+
+# DB 연결 문제처럼 다시 시도하면 저장될 수 있는 오류
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError, ConnectionError)
+
+# 저장 태스크 종료 신호 (flush()가 큐에 넣는다)
+_STOP_WRITER = object()
+
+# v2 연결에서 한 프레임에 묶어 보낼 최대 메시지 수, 묶기 전에 기다리는 시간(초)
+SEND_BATCH = 64
+SEND_TICK = env.get_float("CHAT_SEND_TICK", 0.0)
+
+# v2 클라이언트가 보낸 메시지 아이디 ((parent_id, id) -> True), 재전송된 메시지를 걸러낸다.
+seen_cache = LRUCache(maxsize=65536, ttl=300)
+
+# 채팅방 멤버 (room_id -> {parent_id})
+# 다른 워커에서 초대/나가기 한 경우도 반영되도록 TTL을 사용한다.
+room_cache = LRUCache(maxsize=4096, ttl=300)
+
+# 채팅방별로 메모리에 들고 있을 최근 채팅 수
+CHAT_RECENT_SIZE = env.get_int("CHAT_RECENT_SIZE", 50)
+
+# 채팅방별 최근 채팅 (room_id -> {chats: 오래된 순 Chat 튜플, complete: 채팅방의 모든 채팅인지})
+recent_cache = LRUCache(maxsize=1024, ttl=300)
+
+# 백플레인 채널 (메시지 전달, 채팅방 멤버 변경, 저장된 채팅)
+CHAT_CHANNEL = 'chat:message'
+ROOM_CHANNEL = 'chat:room'
+SAVED_CHANNEL = 'chat:saved'
+
+# 접속 정보 유효 시간(초). 워커가 비정상 종료되어도 이 시간이 지나면 다시 접속할 수 있다.
+PRESENCE_TTL = env.get_int("CHAT_PRESENCE_TTL", 60)
+
+
 class ChatService:
+    """
+    채팅 웹소켓 연결 관리
+    - 메시지는 백플레인(services/backplane.py)으로 publish하고, 각 워커는 자신에게
+      연결된 부모에게만 전달한다. CHAT_BACKPLANE_URL이 없으면 프로세스 내부에서 전달한다.
+    - 접속 정보(presence)를 백플레인에 등록하여 워커가 여러 개여도 같은 아이디의 중복 접속을 막는다.
+    """
+
     def __init__(self):
+        self.node_id = uuid4().hex  # 워커 구분용 아이디
+        self.backplane = create_backplane()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heartbeat: Optional[asyncio.Task] = None
         self.active_connections: Dict[str, WebSocket] = {}  # {parent_id: websocket}
         self.client_info: Dict[WebSocket, str] = {}  # Maps WebSocket to unique client IDs
+        self.send_queues: Dict[WebSocket, asyncio.Queue] = {}  # 연결별 보낼 메시지
+        self.senders: Dict[WebSocket, asyncio.Task] = {}  # 연결별 전송 태스크
+        self.protocols: Dict[WebSocket, ChatProtocol] = {}  # 연결별 프로토콜
+        self._seq = 0  # 서버 메시지 아이디
+        self._chat_queue: Optional[asyncio.Queue] = None  # 저장할 채팅
+        self._writer: Optional[asyncio.Task] = None
+        self.dropped = 0
+        self.saved = 0
+        self.failed = 0
+        self.published = 0
+        self.received = 0
+        self.framesSent = 0
+        self.messagesSent = 0
+        self.duplicates = 0
 
-    async def connect(self, websocket: WebSocket, client_id: str):
-        db = get_db_session()
+    # 백플레인 구독 시작 (서버 시작 시, 또는 첫 연결 시)
+    async def start(self):
+        if self._loop is not None:
+            return
 
+        self._loop = asyncio.get_running_loop()
+        await self.backplane.start({CHAT_CHANNEL: self._deliver,
+                                    ROOM_CHANNEL: self._apply_room_event,
+                                    SAVED_CHANNEL: self._apply_saved_chats})
+        self._heartbeat = asyncio.create_task(self._refresh_presence())
+
+    # 서버 종료 시 접속 정보 해제
+    async def close(self):
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+
+        for client_id in list(self.active_connections):
+            try:
+                await self.backplane.release(client_id, self.node_id)
+            except Exception:
+                logger.exception("Failed to release presence of %s", client_id)
+        await self.backplane.close()
+        self._loop = None
+
+    # 접속 정보가 만료되지 않도록 주기적으로 갱신
+    async def _refresh_presence(self):
+        while True:
+            await asyncio.sleep(PRESENCE_TTL / 3)
+            try:
+                await self.backplane.refresh(
+                    list(self.active_connections), self.node_id, PRESENCE_TTL)
+            except Exception:
+                logger.exception("Failed to refresh presence")
+
+    async def connect(self, websocket: WebSocket, client_id: str,
+                      protocol: Optional[ChatProtocol] = None):
         # 실제 존재하는 client_id인지 확인
-        if db.query(ParentTable).filter(ParentTable.parent_id == client_id).first() is None:
+        async with get_async_db_session() as db:
+            parent = await db.scalar(select(ParentTable.parent_id).where(
+                ParentTable.parent_id == client_id))
+
+        if parent is None:
             raise CustomException("Not available parent")
 
         # client_id 중복 확인
         if client_id in self.active_connections:
             raise CustomException("Client ID already exists")
-        
-        await websocket.accept()
+
+        # 다른 워커에 접속되어 있는지 확인
+        await self.start()
+        if not await self.backplane.claim(client_id, self.node_id, PRESENCE_TTL):
+            raise CustomException("Client ID already exists")
+
+        try:
+            await websocket.accept()
+        except Exception as e:
+            await self.backplane.release(client_id, self.node_id)
+            raise e
 
         # parent_id와 websocket 연결
         self.active_connections[client_id] = websocket
         self.client_info[websocket] = client_id
 
+        # 연결마다 프로토콜, 전송 큐와 전송 태스크를 둔다.
+        self.protocols[websocket] = protocol or ChatProtocol()
+        self.send_queues[websocket] = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.senders[websocket] = asyncio.create_task(self._sender(websocket))
+
         print(f"User {client_id} connected. Total connections: {len(self.active_connections)}")
 
     async def disconnect(self, websocket: WebSocket):
         client_id = self.client_info.pop(websocket, None)
+        self.send_queues.pop(websocket, None)
+        self.protocols.pop(websocket, None)
+        sender = self.senders.pop(websocket, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
 
-        if client_id:
+        if client_id and self.active_connections.get(client_id) is websocket:
             self.active_connections.pop(client_id, None)
+            try:
+                await self.backplane.release(client_id, self.node_id)
+            except Exception:
+                logger.exception("Failed to release presence of %s", client_id)
             print(f"User {client_id} disconnected. Total connections: {len(self.active_connections)}")
 
-    async def broadcast(self, client_id: str, data: str):
-        db = get_db_session()
+    # 연결별 전송 큐의 메시지를 순서대로 보낸다.
+    # v2 연결은 큐에 쌓인 메시지를 SEND_BATCH개까지 한 프레임으로 묶어 보낸다.
+    async def _sender(self, websocket: WebSocket):
+        queue = self.send_queues[websocket]
+        protocol = self.protocols[websocket]
+        while True:
+            messages = [await queue.get()]
+            if protocol.enveloped:
+                if SEND_TICK > 0:
+                    await asyncio.sleep(SEND_TICK)
+                while len(messages) < SEND_BATCH and not queue.empty():
+                    messages.append(queue.get_nowait())
+
+            try:
+                if not protocol.enveloped:
+                    await websocket.send_text(messages[0])
+                else:
+                    frame = protocol.encode(messages)
+                    if isinstance(frame, bytes):
+                        await websocket.send_bytes(frame)
+                    else:
+                        await websocket.send_text(frame)
+                self.framesSent += 1
+                self.messagesSent += len(messages)
+            except Exception as e:
+                print(f"Error sending message: {e}")
+                await self.disconnect(websocket)
+                return
+
+    # 연결의 프로토콜에 맞춰 전송 큐에 넣기
+    # --input
+    #     - message: v2 봉투로 보낼 메시지 (type 포함)
+    #     - text: v1 연결에 보낼 문자열 (없으면 message를 JSON으로 보낸다)
+    def send_message(self, websocket: WebSocket, message: dict, text: Optional[str] = None) -> bool:
+        protocol = self.protocols.get(websocket)
+        if protocol is None:
+            return False
+
+        if protocol.enveloped:
+            return self._enqueue(websocket, {'v': protocol.version, **message})
+        if text is None:
+            text = json.dumps(message, ensure_ascii=False)
+        return self._enqueue(websocket, text)
+
+    # 전송 큐에 메시지 넣기 (기다리지 않음)
+    def _enqueue(self, websocket: WebSocket, data) -> bool:
+        queue = self.send_queues.get(websocket)
+        if queue is None:
+            return False
+
+        try:
+            queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # 메시지를 받지 못하는 느린 연결은 끊고, 다시 연결해서 기록을 가져오게 한다.
+            self.dropped += 1
+            self.send_queues.pop(websocket, None)
+            logger.warning("User %s is too slow. Closing connection.", self.client_info.get(websocket))
+            asyncio.create_task(self._close(websocket))
+            return False
+        return True
+
+    async def _close(self, websocket: WebSocket):
+        await self.disconnect(websocket)
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+
+    # 채팅방 멤버 가져오기
+    async def get_room_members(self, room_id: int) -> Set[str]:
+        members = room_cache.get(room_id)
+        if members is not None:
+            return members
+
+        async with get_async_db_session() as db:
+            members = set((await db.scalars(select(PCConnectTable.parent_id).where(
+                PCConnectTable.room_id == room_id))).all())
+
+        room_cache.set(room_id, members)
+        return members
+
+    # 채팅방 초대/나가기 시 멤버 갱신 (ChatRoomService에서 호출)
+    def add_room_member(self, room_id: int, parent_id: str):
+        self._update_room(int(room_id), parent_id, True)
+        self._publish_room_event(int(room_id), parent_id, True)
+
+    def remove_room_member(self, room_id: int, parent_id: str):
+        self._update_room(int(room_id), parent_id, False)
+        self._publish_room_event(int(room_id), parent_id, False)
+
+    def _update_room(self, room_id: int, parent_id: str, joined: bool):
+        members = room_cache.get(room_id)
+        if members is not None:
+            room_cache.set(room_id, members | {parent_id} if joined else members - {parent_id})
+
+    # 다른 워커의 멤버 캐시도 갱신되도록 백플레인으로 알린다. (요청 처리 스레드에서 호출)
+    def _publish_room_event(self, room_id: int, parent_id: str, joined: bool):
+        if self._loop is None or self._loop.is_closed():
+            return
 
-        # json형식인 data에서 room_id 추출
-        room_id = json.loads(data).get("room_id")
+        data = json.dumps({'room_id': room_id, 'parent_id': parent_id, 'joined': joined})
+        asyncio.run_coroutine_threadsafe(
+            self.backplane.publish(ROOM_CHANNEL, data), self._loop)
 
-        # 해당 room_id에 속한 모든 parent_id를 가져옴
-        parent_ids = db.query(PCConnectTable.parent_id).filter(PCConnectTable.room_id == room_id).all()
+    async def _apply_room_event(self, channel: str, data: str):
+        event = json.loads(data)
+        self._update_room(event['room_id'], event['parent_id'], event['joined'])
 
-        # 현재 사용자의 nickname을 가져옴
-        nickname = db.query(ParentTable.nickname).filter(ParentTable.parent_id == client_id).first()
+    # 닉네임 가져오기 (작성자 캐시 사용)
+    async def get_nickname(self, parent_id: str) -> Optional[str]:
+        author = author_cache.get(parent_id)
+        if author is not None:
+            return author['nickname']
 
-        if nickname:
-            nickname = nickname[0]
-        else:
+        async with get_async_db_session() as db:
+            row = (await db.execute(select(
+                ParentTable.name, ParentTable.nickname, ParentTable.photoId).where(
+                ParentTable.parent_id == parent_id))).first()
+
+        if row is None:
+            return None
+
+        author_cache.set(parent_id, {'name': row[0], 'nickname': row[1], 'photoId': row[2]})
+        return row[1]
+
+    # v2 프레임 처리 (메시지 하나 또는 여러 개)
+    async def handle_frame(self, websocket: WebSocket, client_id: str, frame):
+        protocol = self.protocols.get(websocket)
+        if protocol is None:
+            return
+
+        try:
+            messages = protocol.decode(frame)
+        except CustomException as e:
+            self.send_message(websocket, {'type': 'error', 'message': e.message})
+            return
+
+        acks = []
+        for message in messages:
+            msg_type, msg_id = message.get('type'), message.get('id')
+            try:
+                if msg_type == 'chat':
+                    if msg_id is None:
+                        raise CustomException("id is required")
+
+                    # 재연결 후 다시 보낸 메시지는 전송하지 않고 ack만 한다.
+                    if seen_cache.get((client_id, msg_id)):
+                        self.duplicates += 1
+                    else:
+                        await self.broadcast(client_id, {
+                            'room_id': message.get('room_id'),
+                            'type': message.get('chatType', 'text'),
+                            'content': message.get('content')}, msg_id)
+                        seen_cache.set((client_id, msg_id), True)
+                    acks.append(msg_id)
+                elif msg_type == 'status':
+                    self.send_message(websocket, {'type': 'status', 'id': msg_id,
+                                           'status': self.get_room_status(client_id)})
+                elif msg_type == 'ping':
+                    self.send_message(websocket, {'type': 'pong', 'id': msg_id})
+                else:
+                    raise CustomException(f"Unknown message type: {msg_type}")
+            except CustomException as e:
+                self.send_message(websocket, {'type': 'error', 'id': msg_id, 'message': e.message})
+            except (TypeError, ValueError):
+                self.send_message(websocket, {'type': 'error', 'id': msg_id, 'message': 'Invalid message'})
+
+        # 프레임 하나에 ack 하나
+        if acks:
+            self.send_message(websocket, {'type': 'ack', 'ids': acks})
+
+    async def broadcast(self, client_id: str, message: dict, client_msg_id: Optional[str] = None):
+        # 저장할 수 없는 채팅은 전송하기 전에 거절한다. (저장 태스크에서 배치 전체가 실패하지 않도록)
+        try:
+            room_id = int(message.get("room_id"))
+        except (TypeError, ValueError):
+            raise CustomException("Invalid room_id")
+        if not isinstance(message.get("content"), str) or not message.get("content"):
+            raise CustomException("Invalid content")
+        if not isinstance(message.get("type"), str):
+            raise CustomException("Invalid chat type")
+
+        # 해당 room_id에 속한 모든 parent_id와 현재 사용자의 nickname (캐시에서)
+        parent_ids = await self.get_room_members(room_id)
+        nickname = await self.get_nickname(client_id)
+
+        if nickname is None:
             raise CustomException("Nickname not found")
 
         # 메시지 데이터 추출
-        message_data = json.loads(data)
-        chatType = message_data.get("type")
-        content = message_data.get("content")
+        chatType = message.get("type")
+        content = message.get("content")
         createTime = datetime.now()
 
-        # chat 데이터를 DB에 저장
-        try:
-            chat = ChatTable(
-                parent_id=client_id,
-                room_id=room_id,
-                createTime=createTime,
-                chatType=chatType,
-                content=content
-            )
-
-            db.add(chat)
-            db.commit()
-            db.refresh(chat)
+        # chat 데이터는 모아서 따로 저장한다.
+        self._save({
+            'parent_id': client_id,
+            'room_id': room_id,
+            'createTime': createTime,
+            'chatType': chatType,
+            'content': content
+        })
 
-        except Exception as e:
-            print(e)
-            db.rollback()
-            raise HTTPException(status_code=400, detail="Failed to save chat data")
+        # 해당 room_id에 속한 모든 parent_id에게 메시지 전송 (각 워커가 자신의 연결로 전달)
+        self._seq += 1
+        envelope = {
+            'type': 'chat',
+            'id': f"{self.node_id[:8]}-{self._seq}",
+            'cid': client_msg_id,
+            'room_id': room_id,
+            'parent_id': client_id,
+            'nickname': nickname,
+            'chatType': chatType,
+            'content': content,
+            'createTime': createTime.isoformat()
+        }
+        text = f"type: {chatType}, {nickname}: {content} ({createTime})"
+        await self._publish(list(parent_ids), envelope, text)
 
-        # 해당 room_id에 속한 모든 parent_id에게 메시지 전송
-        for parent_id_tuple in parent_ids:
-            parent_id = parent_id_tuple[0]  # 튜플에서 실제 parent_id 값 추출
+    async def _publish(self, parent_ids: List[str], message: dict, text: Optional[str] = None):
+        await self.start()
+        await self.backplane.publish(CHAT_CHANNEL, json.dumps(
+            {'parent_ids': parent_ids, 'message': message, 'text': text}, ensure_ascii=False))
+        self.published += 1
+
+    # 백플레인으로 받은 메시지를 이 워커에 연결된 부모에게 전달
+    async def _deliver(self, channel: str, payload: str):
+        payload = json.loads(payload)
+        self.received += 1
+        for parent_id in payload['parent_ids']:
             websocket = self.active_connections.get(parent_id)
             if websocket:
+                self.send_message(websocket, payload['message'], payload['text'])
+
+    # 부모가 어느 워커에든 접속해 있는지 확인
+    async def is_online(self, parent_id: str) -> bool:
+        if parent_id in self.active_connections:
+            return True
+        return await self.backplane.get_node(parent_id) is not None
+
+    # 접속한 부모에게 메시지 전송 (알림 푸시 등, v1 연결에는 JSON 문자열로 보낸다)
+    async def send_to_parent(self, parent_id: str, message: dict) -> bool:
+        websocket = self.active_connections.get(parent_id)
+        if websocket is not None:
+            return self.send_message(websocket, message)
+
+        if not await self.is_online(parent_id):
+            return False
+        await self._publish([parent_id], message)
+        return True
+
+    # 채팅 저장 큐에 넣기 (큐에는 (채팅, 시도 횟수)를 넣는다)
+    def _save(self, chat: dict, attempts: int = 0):
+        if self._chat_queue is None:
+            self._chat_queue = asyncio.Queue()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_chats())
+
+        self._chat_queue.put_nowait((chat, attempts))
+
+    # 채팅 여러 개를 한 트랜잭션으로 저장하고 채팅방의 채팅 수/마지막 채팅 갱신
+    async def _insert_batch(self, chats: List[dict]):
+        async with get_async_db_session() as db:
+            try:
+                # 한 번에 추가한다. (RETURNING을 지원하는 DB는 INSERT 한 번, MySQL은 행마다 INSERT)
+                rows = [ChatTable(**chat) for chat in chats]
+                db.add_all(rows)
+                await db.flush()
+
+                # 채팅방별 채팅 수와 마지막 채팅 갱신
+                rooms: Dict[int, List[ChatTable]] = {}
+                for row in rows:
+                    rooms.setdefault(row.room_id, []).append(row)
+                for room_id, roomChats in rooms.items():
+                    last = max(roomChats, key=lambda row: row.chat_id)
+                    await db.execute(update(ChatRoomTable).where(
+                        ChatRoomTable.room_id == room_id).values(
+                        chatCount=ChatRoomTable.chatCount + len(roomChats)))
+                    await db.execute(update(ChatRoomTable).where(
+                        ChatRoomTable.room_id == room_id,
+                        or_(ChatRoomTable.lastChatId.is_(None),
+                            ChatRoomTable.lastChatId < last.chat_id)).values(
+                        lastChatId=last.chat_id,
+                        lastChatTime=last.createTime,
+                        lastChat=last.content[:255]))
+
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                raise e
+
+        for chat, row in zip(chats, rows):
+            chat['chat_id'] = row.chat_id
+
+    async def _insert_chats(self, items: List[tuple]) -> List[tuple]:
+        """
+        채팅 저장 (배치가 실패하면 한 행씩 다시 저장)
+        --input
+            - items: (채팅, 시도 횟수) 리스트
+        --output
+            - 저장하지 못한 (채팅, 시도 횟수) 리스트
+        """
+        saved, failed = [], []
+        try:
+            await self._insert_batch([chat for chat, _ in items])
+            saved = [chat for chat, _ in items]
+        except Exception as e:
+            if len(items) > 1:
+                logger.warning("Failed to save %d chats in one batch. Saving one by one: %s",
+                               len(items), e)
+            for chat, attempts in items:
                 try:
-                    await websocket.send_text(f"type: {chatType}, {nickname}: {content} ({createTime})")
-                except Exception as e:
-                    print(f"Error sending message: {e}")
+                    if len(items) > 1:
+                        await self._insert_batch([chat])
+                    else:
+                        raise e
+                    saved.append(chat)
+                except TRANSIENT_ERRORS:
+                    logger.exception("Failed to save chat (attempt %d): %r", attempts + 1, chat)
+                    failed.append((chat, attempts + 1))
+                except Exception:
+                    # 제약 조건 위반 등 다시 시도해도 저장되지 않는 채팅
+                    self.failed += 1
+                    logger.exception("Dropping chat that cannot be saved: %r", chat)
+
+        self.saved += len(saved)
+
+        # 모든 워커의 최근 채팅에 반영
+        if saved:
+            try:
+                await self.backplane.publish(SAVED_CHANNEL, json.dumps(
+                    [Chat(**chat).model_dump(mode='json') for chat in saved], ensure_ascii=False))
+            except Exception:
+                logger.exception("Failed to publish saved chats")
+        return failed
+
+    # 저장하지 못한 채팅은 CHAT_WRITE_RETRIES번까지 다시 큐에 넣고, 그래도 실패하면 기록만 남긴다.
+    def _requeue(self, failed: List[tuple]):
+        for chat, attempts in failed:
+            if attempts < CHAT_WRITE_RETRIES:
+                self._chat_queue.put_nowait((chat, attempts))
+            else:
+                self.failed += 1
+                logger.error("Dropping chat after %d attempts: %r", attempts, chat)
+
+    async def _apply_saved_chats(self, channel: str, data: str):
+        rooms: Dict[int, List[Chat]] = {}
+        for chat in json.loads(data):
+            chat = Chat(**chat)
+            rooms.setdefault(chat.room_id, []).append(chat)
+        for room_id, chats in rooms.items():
+            self.add_recent(room_id, chats)
+
+    # 채팅방의 최근 채팅 (없으면 None)
+    def get_recent(self, room_id: int) -> Optional[dict]:
+        return recent_cache.get(int(room_id))
+
+    # DB에서 읽은 최근 채팅으로 채우기
+    def set_recent(self, room_id: int, chats: List[Chat], complete: bool):
+        chats = sorted(chats, key=lambda chat: chat.chat_id)[-CHAT_RECENT_SIZE:]
+        recent_cache.set(int(room_id), {'chats': tuple(chats), 'complete': complete})
+
+    # 새로 저장된 채팅 추가 (최근 채팅이 있는 채팅방만)
+    def add_recent(self, room_id: int, chats: List[Chat]):
+        recent = recent_cache.get(int(room_id))
+        if recent is None:
+            return
+
+        merged = {chat.chat_id: chat for chat in recent['chats']}
+        merged.update({chat.chat_id: chat for chat in chats})
+        chats = sorted(merged.values(), key=lambda chat: chat.chat_id)
+        complete = recent['complete'] and len(chats) <= CHAT_RECENT_SIZE
+        recent_cache.set(int(room_id), {'chats': tuple(chats[-CHAT_RECENT_SIZE:]),
+                                        'complete': complete})
+
+    # 쌓인 채팅을 CHAT_WRITE_BATCH개씩 한 번에 저장 (_STOP_WRITER를 받으면 남은 채팅을 저장하고 끝낸다)
+    async def _write_chats(self):
+        detach_request_session()
+        stop = False
+        while not stop:
+            items = []
+            item = await self._chat_queue.get()
+            while True:
+                if item is _STOP_WRITER:
+                    stop = True
+                else:
+                    items.append(item)
+                if len(items) >= CHAT_WRITE_BATCH or self._chat_queue.empty():
+                    break
+                item = self._chat_queue.get_nowait()
+
+            if not items:
+                continue
+            failed = await self._insert_chats(items)
+            if failed:
+                self._requeue(failed)
+                # DB에 문제가 있으면 잠시 기다린 후 다시 시도한다. (종료 중이면 바로)
+                if not stop:
+                    await asyncio.sleep(CHAT_WRITE_RETRY_DELAY)
+                elif not self._chat_queue.empty():
+                    stop = False
+                    self._chat_queue.put_nowait(_STOP_WRITER)
+
+    # 종료 전에 남은 채팅 저장 (저장 중인 배치가 끝날 때까지 기다린다)
+    async def flush(self):
+        if self._writer is None or self._writer.done():
+            if self._chat_queue is None or self._chat_queue.empty():
+                return
+            self._writer = asyncio.create_task(self._write_chats())
+
+        self._chat_queue.put_nowait(_STOP_WRITER)
+        await self._writer
+        self._writer = None
+
+    def get_stats(self) -> dict:
+        return {'node_id': self.node_id, 'backplane': self.backplane.name,
+                'connections': len(self.active_connections),
+                'published': self.published, 'received': self.received,
+                'framesSent': self.framesSent, 'messagesSent': self.messagesSent,
+                'duplicates': self.duplicates,
+                'dropped': self.dropped, 'saved': self.saved, 'failed': self.failed,
+                'pendingChats': self._chat_queue.qsize() if self._chat_queue is not None else 0}
 
     def get_room_status(self, parent_id: str):
         # parent_id를 key로 하는 websocket이 존재하는지 확인
         connections = [self.active_connections.get(parent_id)]
         client_ids = [self.client_info.get(conn, "Unknown") for conn in connections]
         return f"{self.active_connections},{self.client_info}Total clients: {len(connections)}\nClients: {', '.join(client_ids)}"
+
+
+# 웹소켓 연결을 프로세스 내에서 공유한다. (채팅, 알림 푸시)
+chatService = ChatService()
@@ -0,0 +1,66 @@
+from typing import Union, List
+import json
+
+# msgpack은 선택 사항이다. (설치되어 있지 않으면 encoding=msgpack 연결을 받지 않는다.)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from error.exception.customerror import *
+
+
+# 채팅 웹소켓 프로토콜
+# - v1: 기존 형식. 텍스트 프레임 하나에 JSON 메시지 하나, 서버는 "type: ..., 닉네임: 내용 (시간)" 문자열을 보낸다.
+# - v2: 모든 메시지를 {"v": 2, "type": ..., "id": ...} 봉투로 보낸다.
+#       한 프레임에 봉투 하나 또는 봉투 리스트(여러 메시지)를 담을 수 있고,
+#       클라이언트가 보낸 chat 메시지는 id로 ack하며 같은 id를 다시 보내면 중복으로 보고 ack만 한다.
+#       /chat/ws/{parent_id}?v=2&encoding=json|msgpack
+PROTOCOL_VERSION = 2
+ENCODINGS = ('json', 'msgpack')
+
+
+class ChatProtocol:
+    """
+    연결별 프로토콜 정보
+    --input
+        - version: 1 | 2
+        - encoding: 'json' | 'msgpack' (v2만)
+    """
+
+    def __init__(self, version: int = 1, encoding: str = 'json'):
+        if version not in (1, PROTOCOL_VERSION):
+            raise CustomException(f"Unsupported protocol version: {version}")
+        if encoding not in ENCODINGS:
+            raise CustomException(f"Unsupported encoding: {encoding}")
+        if encoding == 'msgpack' and msgpack is None:
+            raise CustomException("msgpack is not installed")
+
+        self.version = version
+        self.encoding = encoding
+
+    @property
+    def enveloped(self) -> bool:
+        return self.version >= PROTOCOL_VERSION
+
+    # 봉투 하나 또는 여러 개를 한 프레임으로 만든다.
+    def encode(self, messages: List[dict]) -> Union[str, bytes]:
+        frame = messages[0] if len(messages) == 1 else messages
+        if self.encoding == 'msgpack':
+            return msgpack.packb(frame, use_bin_type=True)
+        return json.dumps(frame, ensure_ascii=False)
+
+    # 프레임을 봉투 리스트로 만든다.
+    def decode(self, frame: Union[str, bytes]) -> List[dict]:
+        try:
+            if isinstance(frame, bytes) and self.encoding == 'msgpack':
+                data = msgpack.unpackb(frame, raw=False)
+            else:
+                data = json.loads(frame)
+        except Exception:
+            raise CustomException("Invalid frame")
+
+        messages = data if isinstance(data, list) else [data]
+        if not all(isinstance(message, dict) for message in messages):
+            raise CustomException("Invalid frame")
+        return messages
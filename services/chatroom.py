@@ -1,6 +1,7 @@
 from fastapi import HTTPException
 from typing import Optional, List, Set
 from sqlalchemy.orm import joinedload
+from sqlalchemy import select, update, func
 from sqlalchemy.orm.session import Session
 from db import get_db_session
 
@@ -8,6 +9,7 @@ from model.chat import Chat, ChatTable
 from model.chatroom import ChatRoom, ChatRoomTable
 from model.pcconnect import PCConnectTable
 from model.parent import ParentTable
+from services.chat import chatService, room_cache, CHAT_RECENT_SIZE
 from schemas.chatroom import *
 from error.exception.customerror import *
 
@@ -54,18 +56,10 @@ class ChatRoomService:
         """
         db = get_db_session()
 
-        # 부모 아이디로 부모가 속한 채팅방 조회
-        chatroom = db.query(PCConnectTable).filter(PCConnectTable.parent_id == parent_id).all()
-        # room_id만 가져오기
-        room_ids = [c.room_id for c in chatroom]
-
-        # 각 room_id에 해당하는 채팅방 정보 조회
-        chatroom = db.query(ChatRoomTable).filter(ChatRoomTable.room_id.in_(room_ids)).all()
-
-        # 각 room_id에 해당하는 채팅방의 chattable의 count로 개수 세기
-        for c in chatroom:
-            chat_count = db.query(ChatTable).filter(ChatTable.room_id == c.room_id).count()
-            c.chatCount = chat_count
+        # 부모가 속한 채팅방 조회 (채팅 수, 마지막 채팅은 chatroom 테이블에 저장되어 있음)
+        chatroom = db.query(ChatRoomTable).join(
+            PCConnectTable, PCConnectTable.room_id == ChatRoomTable.room_id).filter(
+            PCConnectTable.parent_id == parent_id).all()
 
         return chatroom
 
@@ -118,6 +112,9 @@ class ChatRoomService:
             db.commit()
             db.refresh(pcconnect)
 
+            # 채팅 전송 시 사용하는 멤버 목록 갱신
+            chatService.add_room_member(room_id, invite_id)
+
             return pcconnect
         
         except Exception as e:
@@ -161,6 +158,9 @@ class ChatRoomService:
             
             db.commit()
 
+            # 채팅 전송 시 사용하는 멤버 목록 갱신
+            chatService.remove_room_member(room_id, parent_id)
+
             return True
         
         except Exception as e:
@@ -203,6 +203,16 @@ class ChatRoomService:
             raise HTTPException(status_code=400, detail="Failed to update chatroom")
         
 
+    # 채팅방 멤버인지 확인
+    def _isMember(self, db: Session, room_id: int, parent_id: str) -> bool:
+        members = room_cache.get(int(room_id))
+        if members is not None:
+            return parent_id in members
+
+        return db.query(PCConnectTable.pcc_id).filter(
+            PCConnectTable.room_id == room_id,
+            PCConnectTable.parent_id == parent_id).first() is not None
+
     # 채팅 내용 가져오기
     def getChat(self, room_id: int, chat_id: str ,parent_id: str) -> List[Chat]:
         """
@@ -214,35 +224,98 @@ class ChatRoomService:
         --output
             - chat: 채팅 내용
         """
-        db = get_db_session()
-
-        # 채팅방에 속한 부모 목록 조회
-        pcconnect = db.query(PCConnectTable).filter(PCConnectTable.room_id == room_id).all()
-        parent_ids = [p.parent_id for p in pcconnect]
-
-        # 부모가 채팅방에 속해있는지 확인
-        if parent_id not in parent_ids:
-            raise CustomException("Not authorized to get chat list from {chatroom_id}r")
-        
         # chat_id가 unknown인 경우 최근 20개의 채팅 내용 조회
         if chat_id == "unknown":
-            chat = db.query(ChatTable).filter(ChatTable.room_id == room_id
-                                            ).order_by(ChatTable.chat_id.desc()).limit(20).all()
-            
-            return chat
-        
+            return self.getChatHistory(room_id, parent_id)['chats']
+
         # 만약 chat_id가 숫자형식이 아닌 경우
         elif not chat_id.isdigit():
             raise CustomException("Invalid chat_id")
-        
-        else:
-            # chat_id 이전 20개의 채팅 내용 조회
-            chat = db.query(ChatTable).filter(ChatTable.room_id == room_id, ChatTable.chat_id < chat_id
-                                            ).order_by(ChatTable.chat_id.desc()).limit(20).all()
 
-        return chat
+        # chat_id 이전 20개의 채팅 내용 조회
+        return self.getChatHistory(room_id, parent_id, cursor=int(chat_id))['chats']
+
+    # 채팅 기록 가져오기 (chat_id 커서)
+    def getChatHistory(self, room_id: int, parent_id: str, size: int = 20,
+                       cursor: Optional[int] = None) -> dict:
+        """
+        채팅 기록 가져오기
+        --input
+            - room_id: 채팅방 아이디
+            - parent_id: 부모 아이디
+            - size: 가져올 채팅 수
+            - cursor: 이 chat_id 이전의 채팅을 가져온다. 없으면 최근 채팅
+        --output
+            - chats: 채팅 리스트 (최근 순)
+            - nextCursor: 다음 페이지 커서 (없으면 None)
+        """
+        db = get_db_session()
+
+        # 부모가 채팅방에 속해있는지 확인
+        if not self._isMember(db, room_id, parent_id):
+            raise CustomException(f"Not authorized to get chat list from {room_id}")
+
+        # 최근 채팅으로 채울 수 있으면 DB를 조회하지 않는다.
+        recent = chatService.get_recent(room_id)
+        if recent is not None:
+            chats = [chat for chat in recent['chats']
+                     if cursor is None or chat.chat_id < cursor]
+            if len(chats) > size or recent['complete']:
+                page = chats[::-1][:size]
+                hasNext = len(chats) > size
+                return {'chats': page,
+                        'nextCursor': page[-1].chat_id if hasNext else None}
+
+        # room_id, chat_id 인덱스로 size + 1개 조회
+        query = db.query(ChatTable).filter(ChatTable.room_id == room_id)
+        if cursor is not None:
+            query = query.filter(ChatTable.chat_id < cursor)
+        rows = query.order_by(ChatTable.chat_id.desc()).limit(
+            max(size, CHAT_RECENT_SIZE) + 1 if cursor is None else size + 1).all()
+        chats = [Chat(**row.__dict__) for row in rows]
+
+        # 첫 페이지는 최근 채팅으로 저장해 두고 다음 요청부터 사용한다.
+        if cursor is None:
+            chatService.set_recent(room_id, chats[:CHAT_RECENT_SIZE],
+                                   complete=len(chats) <= CHAT_RECENT_SIZE)
+
+        page = chats[:size]
+        return {'chats': page,
+                'nextCursor': page[-1].chat_id if len(chats) > size else None}
+
+    # 모든 채팅방의 채팅 수와 마지막 채팅 다시 계산
+    def rebuildAll(self) -> int:
+        """
+        모든 채팅방의 채팅 수, 마지막 채팅 재계산
+        --output
+            - 갱신한 채팅방 수
+        """
+        db = get_db_session()
+
+        lastChatId = select(func.max(ChatTable.chat_id)).where(
+            ChatTable.room_id == ChatRoomTable.room_id).scalar_subquery()
+
+        try:
+            result = db.execute(update(ChatRoomTable).values(
+                chatCount=select(func.count()).where(
+                    ChatTable.room_id == ChatRoomTable.room_id).scalar_subquery(),
+                lastChatId=lastChatId))
+
+            # 마지막 채팅 내용은 lastChatId로 채운다.
+            last = ChatTable.__table__.alias('last')
+            db.execute(update(ChatRoomTable).values(
+                lastChatTime=select(last.c.createTime).where(
+                    last.c.chat_id == ChatRoomTable.lastChatId).scalar_subquery(),
+                lastChat=select(func.substr(last.c.content, 1, 255)).where(
+                    last.c.chat_id == ChatRoomTable.lastChatId).scalar_subquery()))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+        return result.rowcount
+
 
-    
     # 채팅방 조회
     def getChatRoom(self, parent_id: str) -> List[ChatRoom]:
         """
@@ -254,13 +327,9 @@ class ChatRoomService:
         """
         db = get_db_session()
 
-        # 부모 아이디로 부모가 속한 채팅방 조회
-        chatroom = db.query(PCConnectTable).filter(PCConnectTable.parent_id == parent_id).all()
-
-        #room_id만 가져오기
-        room_ids = [c.room_id for c in chatroom]
-
-        #채팅방 목록 조회
-        chatroom = db.query(ChatRoomTable).filter(ChatRoomTable.room_id.in_(room_ids)).all()
+        # 부모가 속한 채팅방 목록 조회
+        chatroom = db.query(ChatRoomTable).join(
+            PCConnectTable, PCConnectTable.room_id == ChatRoomTable.room_id).filter(
+            PCConnectTable.parent_id == parent_id).all()
 
         return chatroom
\ No newline at end of file
@@ -0,0 +1,240 @@
+from typing import Dict, List
+from sqlalchemy import update, select, func, case, text, bindparam
+from sqlalchemy.orm.attributes import set_committed_value
+import asyncio
+import logging
+import threading
+
+from model.post import PostTable
+from model.pheart import PHeartTable
+from model.pscript import PScriptTable
+from model.pview import PViewTable
+from model.pcomment import PCommentTable
+from db import get_db_session
+from core.env import env
+
+
+# 게시물 카운터 컬럼과 카운트할 테이블
+COUNTERS = {
+    'pHeart': PHeartTable,
+    'pScript': PScriptTable,
+    'pView': PViewTable,
+    'pComment': PCommentTable,
+}
+
+# 한 번의 UPDATE로 반영할 최대 게시물 수
+FLUSH_CHUNK = 500
+
+# 쓰기 지연과 함께 사용하면 카운터를 두 번 세는 sql.txt의 트리거
+COUNTER_TRIGGERS = ['pheart_insert', 'pheart_delete', 'pscript_insert', 'pscript_delete',
+                    'pview_insert', 'pview_delete', 'pcomment_insert', 'pcomment_delete']
+
+logger = logging.getLogger(__name__)
+
+
+class PostCounterService:
+    """
+    게시물 카운터(하트/스크랩/조회/댓글 수) 쓰기 지연
+    - POST_COUNTER_WRITE_BEHIND=true 이면 증감을 메모리에 모아두고
+      POST_COUNTER_FLUSH_INTERVAL(초)마다 UPDATE ... CASE 한 번으로 반영한다.
+      이때 sql.txt의 카운터 트리거는 삭제해야 한다. (python rebuild.py counter --drop-triggers)
+      서버 시작 시 트리거가 남아 있으면 쓰기 지연을 끄고 트리거가 카운터를 관리하게 둔다.
+    - false(기본값)이면 기존처럼 MySQL 트리거가 카운터를 관리하고 add()는 아무것도 하지 않는다.
+    - 읽을 때 getCounts()로 아직 반영되지 않은 증감을 더해 반환한다.
+    """
+
+    def __init__(self):
+        self.enabled = env.get_bool("POST_COUNTER_WRITE_BEHIND", False)
+        self.interval = env.get_float("POST_COUNTER_FLUSH_INTERVAL", 1.0)
+        self._pending: Dict[int, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.flushes = 0
+        self.flushedPosts = 0
+        self.failures = 0
+
+    # 카운터 증감 기록 (하트/스크랩/조회/댓글 생성, 삭제 후 호출)
+    def add(self, post_id: int, field: str, delta: int = 1):
+        """
+        카운터 증감 기록
+        --input
+            - post_id: 게시물 아이디
+            - field: 'pHeart' | 'pScript' | 'pView' | 'pComment'
+            - delta: 증감 값
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            deltas = self._pending.setdefault(int(post_id), {})
+            deltas[field] = deltas.get(field, 0) + delta
+
+    def _merge(self, pending: Dict[int, Dict[str, int]]):
+        # 반영에 실패한 증감을 다시 쌓는다.
+        with self._lock:
+            for post_id, deltas in pending.items():
+                current = self._pending.setdefault(post_id, {})
+                for field, delta in deltas.items():
+                    current[field] = current.get(field, 0) + delta
+
+    # 모아둔 증감을 DB에 반영
+    def flush(self) -> int:
+        """
+        모아둔 증감을 DB에 반영
+        --output
+            - 반영한 게시물 수
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            db = get_db_session()
+            post_ids = list(pending)
+
+            try:
+                for i in range(0, len(post_ids), FLUSH_CHUNK):
+                    chunk = post_ids[i:i + FLUSH_CHUNK]
+
+                    # UPDATE post SET pheart = IFNULL(pheart, 0) + CASE post_id WHEN ... END
+                    values = {}
+                    for field in COUNTERS:
+                        whens = {post_id: pending[post_id][field] for post_id in chunk
+                                 if pending[post_id].get(field)}
+                        if whens:
+                            column = getattr(PostTable, field)
+                            values[field] = func.coalesce(column, 0) + case(
+                                whens, value=PostTable.post_id, else_=0)
+                    if values:
+                        db.execute(update(PostTable).where(
+                            PostTable.post_id.in_(chunk)).values(values))
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                self._merge(pending)
+                self.failures += 1
+                raise e
+
+            self.flushes += 1
+            self.flushedPosts += len(post_ids)
+            return len(post_ids)
+
+    # 아직 반영되지 않은 증감
+    def getPending(self, post_id: int) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._pending.get(post_id, {}))
+
+    # 게시물 카운터 (DB 값 + 반영되지 않은 증감)
+    def getCounts(self, post) -> Dict[str, int]:
+        """
+        게시물 카운터 가져오기
+        --input
+            - post: PostTable 객체
+        --output
+            - {pHeart, pScript, pView, pComment}
+        """
+        pending = self.getPending(post.post_id)
+        return {field: (getattr(post, field) or 0) + pending.get(field, 0)
+                for field in COUNTERS}
+
+    # 세션에서 분리된 게시물 객체에 반영되지 않은 증감을 더한다. (변경으로 기록되지 않음)
+    def apply(self, post):
+        for field, value in self.getCounts(post).items():
+            set_committed_value(post, field, value)
+        return post
+
+    def stats(self) -> dict:
+        with self._lock:
+            pendingPosts = len(self._pending)
+        return {'enabled': self.enabled, 'interval': self.interval,
+                'pendingPosts': pendingPosts, 'flushes': self.flushes,
+                'flushedPosts': self.flushedPosts, 'failures': self.failures}
+
+    # 데이터베이스에 남아 있는 카운터 트리거 이름
+    def findTriggers(self) -> List[str]:
+        db = get_db_session()
+        rows = db.execute(text(
+            "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS "
+            "WHERE TRIGGER_SCHEMA = DATABASE() AND TRIGGER_NAME IN :names"
+        ).bindparams(bindparam('names', expanding=True)), {'names': COUNTER_TRIGGERS}).all()
+        return [row[0] for row in rows]
+
+    # 카운터 트리거 삭제 (쓰기 지연으로 옮길 때 한 번 실행)
+    def dropTriggers(self) -> List[str]:
+        """
+        카운터 트리거 삭제
+        --output
+            - 삭제한 트리거 이름
+        """
+        db = get_db_session()
+
+        triggers = self.findTriggers()
+        try:
+            for name in triggers:
+                db.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        return triggers
+
+    # 서버 시작 시 확인: 트리거가 남아 있으면 두 번 세지 않도록 쓰기 지연을 끈다.
+    def checkTriggers(self) -> bool:
+        if not self.enabled:
+            return False
+
+        try:
+            triggers = self.findTriggers()
+        except Exception:
+            logger.exception("Failed to check post counter triggers")
+            return self.enabled
+
+        if triggers:
+            logger.error("POST_COUNTER_WRITE_BEHIND is disabled because counter triggers still exist: %s. "
+                         "Run 'python rebuild.py counter --drop-triggers' to migrate.",
+                         ', '.join(triggers))
+            self.enabled = False
+        return self.enabled
+
+    # POST_COUNTER_FLUSH_INTERVAL마다 반영
+    async def runFlusher(self):
+        if not self.enabled:
+            return
+
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("Failed to flush post counters")
+
+    # 모든 게시물 카운터를 하트/스크랩/조회/댓글 테이블에서 다시 계산
+    def rebuildAll(self) -> int:
+        """
+        모든 게시물 카운터 재계산
+        --output
+            - 갱신한 게시물 수
+        """
+        db = get_db_session()
+
+        # 재계산 전에 모아둔 증감은 버린다. (재계산 결과에 포함됨)
+        with self._lock:
+            self._pending = {}
+
+        values = {field: select(func.count()).where(
+            table.post_id == PostTable.post_id).scalar_subquery()
+            for field, table in COUNTERS.items()}
+
+        try:
+            result = db.execute(update(PostTable).values(values))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+        return result.rowcount
+
+
+# 프로세스 내에서 공유하는 카운터 서비스
+postCounterService = PostCounterService()
@@ -0,0 +1,293 @@
+from typing import Optional, List, Dict, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import os
+import fcntl
+import re
+import json
+import hashlib
+import asyncio
+import threading
+import numpy as np
+
+from constants.path import *
+from core.env import env
+from utils.cache import LRUCache
+from utils.os import write_file_atomic
+from services.vectorstore import vectorStoreService, EMBEDDING_MODEL
+
+
+# 한 번의 encode()로 묶을 최대 질문 수, 묶기 위해 기다리는 시간(초)
+EMBEDDING_BATCH_SIZE = env.get_int("EMBEDDING_BATCH_SIZE", 32)
+EMBEDDING_BATCH_WAIT = env.get_float("EMBEDDING_BATCH_WAIT", 0.005)
+
+# 메모리/디스크에 저장할 최대 임베딩 수
+EMBEDDING_CACHE_SIZE = env.get_int("EMBEDDING_CACHE_SIZE", 10000)
+EMBEDDING_DISK_SIZE = env.get_int("EMBEDDING_DISK_SIZE", 200000)
+
+
+# 같은 질문으로 볼 수 있도록 공백/대소문자/끝의 문장부호를 정리한다.
+def normalize_query(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip().rstrip('?!.~ ').lower()
+
+
+class EmbeddingDiskStore:
+    """
+    디스크 임베딩 저장소 (재시작해도 유지)
+    - vectors.f32: float32 임베딩을 행 단위로 이어 붙인 파일 (np.memmap으로 읽는다)
+    - keys.txt: 행 순서대로 질문 키(sha1)
+    - meta.json: 임베딩 차원
+    - 추가만 하고, EMBEDDING_DISK_SIZE개가 차면 더 이상 저장하지 않는다.
+    - 여러 워커가 같은 디렉토리를 사용하므로 추가/복구는 파일 잠금(lock) 안에서 하고,
+      추가하기 전에 keys.txt를 다시 읽어 다른 워커가 추가한 행을 반영한다.
+    """
+
+    def __init__(self, directory: str, maxsize: int = EMBEDDING_DISK_SIZE):
+        self.directory = directory
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._keysSize = 0
+        self._dim: Optional[int] = None
+        self._memmap: Optional[np.memmap] = None
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    # 워커 간 잠금 (같은 디렉토리를 쓰는 다른 프로세스가 추가를 끝낼 때까지 기다린다)
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path('lock'), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self):
+        if not os.path.exists(self._path('meta.json')):
+            return
+        with self._file_lock():
+            self._sync(repair=True)
+
+    # 디스크의 키/벡터를 다시 읽는다.
+    # repair=True이면 (잠금 안에서) 쓰는 도중 종료되어 남은 벡터/키를 잘라낸다.
+    def _sync(self, repair: bool = False):
+        if self._dim is None:
+            if not os.path.exists(self._path('meta.json')):
+                return
+            with open(self._path('meta.json'), encoding='UTF-8') as f:
+                self._dim = json.load(f)['dim']
+
+        try:
+            with open(self._path('keys.txt'), encoding='UTF-8') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = ''
+        # 줄바꿈으로 끝나지 않은 마지막 키는 쓰는 중이거나 중단된 것이다.
+        keys = data.split('\n')[:-1]
+
+        vectorPath = self._path('vectors.f32')
+        vectorSize = os.path.getsize(vectorPath) if os.path.exists(vectorPath) else 0
+
+        # 벡터를 먼저 쓰고 키를 쓰므로, 벡터와 키가 모두 있는 행까지만 사용한다.
+        rows = min(len(keys), vectorSize // (4 * self._dim))
+        keysSize = sum(len(key) + 1 for key in keys[:rows])
+        if repair:
+            if vectorSize != rows * 4 * self._dim:
+                os.truncate(vectorPath, rows * 4 * self._dim)
+            if len(data) != keysSize:
+                os.truncate(self._path('keys.txt'), keysSize)
+
+        self._rows = {key: i for i, key in enumerate(keys[:rows])}
+        self._keysSize = keysSize
+
+    def _vectors(self) -> np.memmap:
+        if self._memmap is None or self._memmap.shape[0] < len(self._rows):
+            self._memmap = np.memmap(self._path('vectors.f32'), dtype=np.float32,
+                                     mode='r', shape=(len(self._rows), self._dim))
+        return self._memmap
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        with self._lock:
+            # 다른 워커가 추가한 행이 있으면 다시 읽는다.
+            if any(key not in self._rows for key in keys):
+                keysPath = self._path('keys.txt')
+                if os.path.exists(keysPath) and os.path.getsize(keysPath) != self._keysSize:
+                    self._sync()
+
+            found = {key: self._rows[key] for key in keys if key in self._rows}
+            if not found:
+                return {}
+            vectors = self._vectors()
+            return {key: np.array(vectors[row]) for key, row in found.items()}
+
+    def set_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+
+        with self._lock, self._file_lock():
+            self._sync(repair=True)
+
+            items = {key: vector for key, vector in items.items() if key not in self._rows}
+            items = dict(list(items.items())[:max(self.maxsize - len(self._rows), 0)])
+            if not items:
+                return
+
+            if self._dim is None:
+                self._dim = len(next(iter(items.values())))
+                write_file_atomic(self._path('meta.json'), json.dumps({'dim': self._dim}))
+
+            # 벡터를 먼저 쓰고 키를 쓴다. (키가 있으면 벡터도 있다)
+            # 행 번호는 파일에 이미 있는 행 다음부터 매긴다.
+            rows = len(self._rows)
+            vectors = np.asarray(list(items.values()), dtype=np.float32)
+            with open(self._path('vectors.f32'), 'ab') as f:
+                f.write(vectors.tobytes())
+            with open(self._path('keys.txt'), 'a', encoding='UTF-8') as f:
+                f.write(''.join(key + '\n' for key in items))
+
+            for i, key in enumerate(items):
+                self._rows[key] = rows + i
+            self._keysSize += sum(len(key) + 1 for key in items)
+
+
+class EmbeddingService:
+    """
+    AI 의사 질문 임베딩 (캐시 + 묶음 처리)
+    - 정규화한 질문으로 메모리 LRU -> 디스크 memmap 순서로 찾는다.
+    - 캐시에 없는 질문은 EMBEDDING_BATCH_WAIT 동안 모아 encode() 한 번으로 처리하며,
+      동시에 들어온 같은 질문은 한 번만 계산한다.
+    - encode()는 전용 스레드에서 실행하여 이벤트 루프를 막지 않는다.
+    --input
+        - encode: 문자열 리스트 -> 임베딩 리스트 (기본값: 벡터 저장소의 임베딩 모델)
+        - directory: 디스크 저장소 위치 (None이면 디스크에 저장하지 않음)
+    """
+
+    def __init__(self, encode: Optional[Callable[[List[str]], List[List[float]]]] = None,
+                 directory: Optional[str] = None):
+        self._encode = encode
+        self._memory = LRUCache(maxsize=EMBEDDING_CACHE_SIZE)
+        self._disk = EmbeddingDiskStore(directory) if directory else None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='embedding')
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._texts: Dict[str, str] = {}
+        self._flush: Optional[asyncio.TimerHandle] = None
+        self.memoryHits = 0
+        self.diskHits = 0
+        self.misses = 0
+        self.batches = 0
+        self.encoded = 0
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha1(normalize_query(text).encode('UTF-8')).hexdigest()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if self._encode is None:
+            self._encode = vectorStoreService.get_embeddings().embed_documents
+        return np.asarray(self._encode(texts), dtype=np.float32)
+
+    # 캐시에서 찾기 (메모리 -> 디스크)
+    def _lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = self._memory.get_many(keys)
+        self.memoryHits += len(found)
+
+        missing = [key for key in keys if key not in found]
+        if missing and self._disk is not None:
+            fromDisk = self._disk.get_many(missing)
+            self.diskHits += len(fromDisk)
+            self._memory.set_many(fromDisk)
+            found.update(fromDisk)
+        return found
+
+    # 질문 하나 임베딩
+    async def embed(self, text: str) -> np.ndarray:
+        return (await self.embed_many([text]))[0]
+
+    # 여러 질문 임베딩
+    async def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        질문 임베딩 (캐시에 없는 질문은 다른 요청과 묶어서 계산)
+        --input
+            - texts: 질문 리스트
+        --output
+            - 정규화된 float32 임베딩 리스트
+        """
+        keys = [self._key(text) for text in texts]
+        found = self._lookup(list(dict.fromkeys(keys)))
+
+        loop = asyncio.get_running_loop()
+        waiting = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in waiting:
+                continue
+            if key not in self._pending:
+                self.misses += 1
+                self._pending[key] = loop.create_future()
+                self._texts[key] = normalize_query(text)
+            waiting[key] = self._pending[key]
+
+        if waiting:
+            if len(self._pending) >= EMBEDDING_BATCH_SIZE:
+                self._schedule(loop, 0)
+            else:
+                self._schedule(loop, EMBEDDING_BATCH_WAIT)
+            for key, future in waiting.items():
+                found[key] = await asyncio.shield(future)
+
+        return [found[key] for key in keys]
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop, delay: float):
+        if delay == 0 and self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+        if self._flush is None:
+            self._flush = loop.call_later(delay, lambda: loop.create_task(self._run_batch()))
+
+    async def _run_batch(self):
+        self._flush = None
+        pending, self._pending = self._pending, {}
+        texts, self._texts = self._texts, {}
+        if not pending:
+            return
+
+        keys = list(pending)
+        try:
+            for i in range(0, len(keys), EMBEDDING_BATCH_SIZE):
+                chunk = keys[i:i + EMBEDDING_BATCH_SIZE]
+                vectors = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self.encode, [texts[key] for key in chunk])
+                self.batches += 1
+                self.encoded += len(chunk)
+
+                items = dict(zip(chunk, vectors))
+                self._memory.set_many(items)
+                if self._disk is not None:
+                    await asyncio.get_running_loop().run_in_executor(
+                        self._executor, self._disk.set_many, items)
+                for key in chunk:
+                    if not pending[key].done():
+                        pending[key].set_result(items[key])
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+
+    def stats(self) -> dict:
+        lookups = self.memoryHits + self.diskHits + self.misses
+        return {'memoryHits': self.memoryHits, 'diskHits': self.diskHits,
+                'misses': self.misses,
+                'hitRate': round((self.memoryHits + self.diskHits) / lookups, 4) if lookups else 0,
+                'batches': self.batches, 'encoded': self.encoded,
+                'memorySize': len(self._memory),
+                'diskSize': len(self._disk) if self._disk is not None else 0}
+
+
+# AI 의사 질문 임베딩 (디스크 저장소는 임베딩 모델별로 분리)
+embeddingService = EmbeddingService(directory=os.path.join(
+    AIDOCTOR_EMBEDDING_CACHE_DIR, re.sub(r'[^0-9A-Za-z_.-]', '_', EMBEDDING_MODEL)))
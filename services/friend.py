@@ -1,15 +1,45 @@
 from typing import Optional, Union
 from fastapi import HTTPException
+import logging
 
 from model.friend import FriendTable
 from schemas.friend import *
 
+from services.friendgraph import FriendGraphService
+from services.timeline import TimelineService
+from services.alertqueue import alertQueueService, NEW_FRIEND
 from db import get_db_session
 from error.exception.customerror import *
 
 
+friendGraphService = FriendGraphService()
+timelineService = TimelineService()
+
+logger = logging.getLogger(__name__)
+
+
 class FriendService:
 
+    # 친구 추가 후 타임라인 채우기/알림 (친구 관계는 이미 저장되었으므로 실패해도 요청은 성공으로 처리)
+    def _afterFollow(self, parent_id: str, friend: str):
+        friendGraphService.invalidate(parent_id, friend)
+        try:
+            timelineService.follow(parent_id, friend)
+        except Exception:
+            logger.exception("Failed to add posts of %s to the timeline of %s", friend, parent_id)
+        try:
+            alertQueueService.publish(NEW_FRIEND, parent_id, friend=friend)
+        except Exception:
+            logger.exception("Failed to publish new friend alert of %s", parent_id)
+
+    # 친구 삭제 후 타임라인 정리 (실패해도 요청은 성공으로 처리)
+    def _afterUnfollow(self, parent_id: str, friend: str):
+        friendGraphService.invalidate(parent_id, friend)
+        try:
+            timelineService.unfollow(parent_id, friend)
+        except Exception:
+            logger.exception("Failed to remove posts of %s from the timeline of %s", friend, parent_id)
+
     # 친구 관계 관리
     def manageFriend(self, manageFriendInput: ManageFriendInput,
                      parent_id: str) -> ManageFriendOutput:
@@ -37,20 +67,23 @@ class FriendService:
                 db.add(new_friend)
                 db.commit()
                 db.refresh(new_friend)
-                return {'hasCreated': True, 'message': 'Success to create friend', 'friend': new_friend}
-
             except Exception as e:
                 db.rollback()
                 raise e
 
+            self._afterFollow(parent_id, manageFriendInput.friend)
+            return {'hasCreated': True, 'message': 'Success to create friend', 'friend': new_friend}
+
         else:
             try:
                 db.delete(friend)
                 db.commit()
-                return {'hasCreated': False, 'message': 'Success to delete friend', 'friend': friend}
-
             except Exception as e:
                 db.rollback()
+                return
+
+            self._afterUnfollow(parent_id, manageFriendInput.friend)
+            return {'hasCreated': False, 'message': 'Success to delete friend', 'friend': friend}
 
     # 친구 관계 생성
 
@@ -67,14 +100,15 @@ class FriendService:
             db.commit()
             db.refresh(friend)
 
-            return friend
-
         except Exception as e:
             db.rollback()
             print(e)
             raise HTTPException(
                 status_code=400, detail="Failed to create friend")
 
+        self._afterFollow(parent_id, createFriendInput.friend)
+        return friend
+
     # 친구 관계 삭제
 
     def deleteFriend(self, deleteFriendInput: DeleteFriendInput,
@@ -107,6 +141,7 @@ class FriendService:
 
             db.delete(parent)
             db.commit()
+            self._afterUnfollow(parent_id, i)
 
             friends.append(parent)
 
@@ -0,0 +1,108 @@
+from typing import List, Dict
+from sqlalchemy import func, case, or_, and_
+from sqlalchemy.orm import aliased
+
+from model.friend import FriendTable
+from db import get_db_session
+from utils.cache import LRUCache
+
+
+# 부모별 친구 관계 (parent_id -> {friends, followers, mates})
+# 다른 워커에서 변경된 관계도 반영되도록 짧은 TTL을 사용한다.
+graph_cache = LRUCache(maxsize=4096, ttl=60)
+
+
+class FriendGraphService:
+    """
+    친구 관계 그래프
+    - friends: 내가 친구로 등록한 부모
+    - followers: 나를 친구로 등록한 부모
+    - mates(짝꿍): 서로 친구로 등록한 부모
+    """
+
+    def _reverse(self):
+        # 반대 방향 친구 관계 (r.parent_id = f.friend AND r.friend = f.parent_id)
+        reverse = aliased(FriendTable)
+        return reverse, and_(reverse.parent_id == FriendTable.friend,
+                             reverse.friend == FriendTable.parent_id)
+
+    # 부모의 친구/팔로워/짝꿍 목록 가져오기
+    def getGraph(self, parent_id: str) -> Dict[str, List[str]]:
+        """
+        부모의 친구 관계 가져오기
+        --input
+            - parent_id: 부모 아이디
+        --output
+            - {friends, followers, mates}: 각 부모 아이디 리스트 (친구 등록 순)
+            - keys: {friend: 내 친구 등록 friend_id} (페이지 커서용)
+        """
+        graph = graph_cache.get(parent_id)
+        if graph is not None:
+            return graph
+
+        db = get_db_session()
+        reverse, on = self._reverse()
+
+        # 나와 연결된 모든 관계를 반대 방향 관계와 함께 한 번에 가져온다.
+        friends, followers, mates, keys = [], [], [], {}
+        rows = db.query(FriendTable.friend_id, FriendTable.parent_id, FriendTable.friend,
+                        reverse.friend_id).outerjoin(reverse, on).filter(
+            or_(FriendTable.parent_id == parent_id,
+                FriendTable.friend == parent_id)).order_by(FriendTable.friend_id).all()
+        for friend_id, owner, friend, reverse_id in rows:
+            if owner == parent_id:
+                friends.append(friend)
+                keys[friend] = friend_id
+                if reverse_id is not None:
+                    mates.append(friend)
+            else:
+                followers.append(owner)
+
+        graph = {'friends': friends, 'followers': followers, 'mates': mates, 'keys': keys}
+        graph_cache.set(parent_id, graph)
+        return graph
+
+    def getFriendIds(self, parent_id: str) -> List[str]:
+        return self.getGraph(parent_id)['friends']
+
+    def getFollowerIds(self, parent_id: str) -> List[str]:
+        return self.getGraph(parent_id)['followers']
+
+    def getMateIds(self, parent_id: str) -> List[str]:
+        return self.getGraph(parent_id)['mates']
+
+    # 친구/팔로워/짝꿍 수 가져오기
+    def getCounts(self, parent_id: str) -> Dict[str, int]:
+        """
+        친구/팔로워/짝꿍 수 가져오기 (캐시에 없으면 집계 쿼리 한 번으로 계산)
+        --input
+            - parent_id: 부모 아이디
+        --output
+            - {friendCount, followerCount, mateCount}
+        """
+        graph = graph_cache.get(parent_id)
+        if graph is not None:
+            return {'friendCount': len(graph['friends']),
+                    'followerCount': len(graph['followers']),
+                    'mateCount': len(graph['mates'])}
+
+        db = get_db_session()
+        reverse, on = self._reverse()
+
+        isFriend = FriendTable.parent_id == parent_id
+        friendCount, followerCount, mateCount = db.query(
+            func.count(case((isFriend, 1))),
+            func.count(case((FriendTable.friend == parent_id, 1))),
+            func.count(case((and_(isFriend, reverse.friend_id != None), 1)))).outerjoin(
+            reverse, on).filter(
+            or_(FriendTable.parent_id == parent_id,
+                FriendTable.friend == parent_id)).one()
+
+        return {'friendCount': friendCount,
+                'followerCount': followerCount,
+                'mateCount': mateCount}
+
+    # 친구 관계가 변경된 경우 양쪽 부모의 캐시 제거
+    def invalidate(self, *parent_ids: str):
+        for parent_id in parent_ids:
+            graph_cache.delete(parent_id)
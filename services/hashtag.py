@@ -0,0 +1,147 @@
+from typing import Optional, List, Dict
+from datetime import datetime
+from sqlalchemy import func, delete, insert
+import heapq
+
+from model.post import PostTable
+from model.posthash import PostHashTable
+from model.pview import PViewTable
+from db import get_db_session
+
+
+# 최종 정렬 전에 최신순으로 모을 후보 게시물 배수
+CANDIDATE_FACTOR = 3
+
+
+class HashtagService:
+
+    def splitHashList(self, hashList: Optional[str]) -> List[str]:
+        # '이유식,가족,신생아' -> ['이유식', '가족', '신생아'] (공백, 중복 제거)
+        tags = [tag.strip()[:50] for tag in (hashList or '').split(',')]
+        return list(dict.fromkeys(tag for tag in tags if tag))
+
+    # 게시물 해시태그 인덱싱 (createPost, updatePost에서 호출)
+    def indexPost(self, post_id: int, hashList: Optional[str], createTime: datetime):
+        """
+        게시물 해시태그 인덱싱
+        --input
+            - post_id: 게시물 아이디
+            - hashList: 쉼표로 구분된 해시태그
+            - createTime: 게시물 생성 시간 (최신순 정렬 기준)
+        """
+        db = get_db_session()
+
+        tags = self.splitHashList(hashList)
+        try:
+            db.execute(delete(PostHashTable).where(
+                PostHashTable.post_id == post_id))
+            if tags:
+                db.execute(insert(PostHashTable), [
+                    {'hash': tag, 'post_id': post_id, 'createTime': createTime}
+                    for tag in tags])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+    # 게시물 해시태그 인덱스 삭제 (deletePost에서 호출)
+    def removePost(self, post_id: int):
+        db = get_db_session()
+
+        try:
+            db.execute(delete(PostHashTable).where(
+                PostHashTable.post_id == post_id))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+    # 부모가 해시태그별로 게시물을 본 횟수
+    def getTagWeights(self, parent_id: str, tags: List[str]) -> Dict[str, int]:
+        """
+        해시태그별 가중치 계산
+        --input
+            - parent_id: 부모 아이디
+            - tags: 해시태그 리스트
+        --output
+            - {hash: 1 + 부모가 해당 해시태그 게시물을 조회한 횟수}
+        """
+        db = get_db_session()
+
+        rows = db.query(PostHashTable.hash, func.count(PViewTable.view_id)).join(
+            PViewTable, PViewTable.post_id == PostHashTable.post_id).filter(
+            PViewTable.parent_id == parent_id,
+            PostHashTable.hash.in_(tags)).group_by(PostHashTable.hash).all()
+
+        weights = {tag: 1 for tag in tags}
+        for tag, count in rows:
+            weights[tag] += count
+        return weights
+
+    # 해시태그가 하나라도 일치하는 최신 게시물 추천
+    def recommend(self, parent_id: str, tags: List[str], size: int = 10) -> List[int]:
+        """
+        해시태그가 하나라도 일치하는 게시물 추천
+        --input
+            - parent_id: 부모 아이디 (해시태그 가중치 계산용)
+            - tags: 해시태그 리스트
+            - size: 가져올 게시물 수
+        --output
+            - List<post_id>: 일치한 해시태그 가중치 합, 최신순
+        """
+        tags = list(dict.fromkeys(tags))
+        if not tags:
+            return []
+
+        db = get_db_session()
+        limit = size * CANDIDATE_FACTOR
+
+        # 해시태그별 최신순 게시물 목록 (ix_posthash_hash_time 인덱스 범위 조회)
+        postings = []
+        for tag in tags:
+            rows = db.query(PostHashTable.createTime, PostHashTable.post_id).filter(
+                PostHashTable.hash == tag).order_by(
+                PostHashTable.createTime.desc(),
+                PostHashTable.post_id.desc()).limit(limit).all()
+            postings.append([(row[0], row[1], tag) for row in rows])
+
+        # 정렬된 목록들을 k-way merge 하여 최신 후보 게시물을 모은다.
+        weights = self.getTagWeights(parent_id, tags)
+        candidates: Dict[int, list] = {}
+        for createTime, post_id, tag in heapq.merge(
+                *postings, key=lambda i: (i[0], i[1]), reverse=True):
+            if post_id not in candidates:
+                if len(candidates) == limit:
+                    break
+                candidates[post_id] = [0, createTime]
+            candidates[post_id][0] += weights[tag]
+
+        ranked = sorted(candidates.items(),
+                        key=lambda i: (i[1][0], i[1][1], i[0]), reverse=True)
+        return [post_id for post_id, _ in ranked[:size]]
+
+    # 모든 게시물의 해시태그 인덱스 재생성
+    def rebuildAll(self) -> int:
+        """
+        모든 게시물의 해시태그 인덱스 재생성
+        --output
+            - 인덱싱한 게시물 수
+        """
+        db = get_db_session()
+
+        posts = db.query(PostTable.post_id, PostTable.hashList, PostTable.createTime).filter(
+            PostTable.deleteTime == None).all()
+
+        try:
+            db.execute(delete(PostHashTable))
+            rows = [{'hash': tag, 'post_id': post_id, 'createTime': createTime}
+                    for post_id, hashList, createTime in posts
+                    for tag in self.splitHashList(hashList)]
+            if rows:
+                db.execute(insert(PostHashTable), rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+        return len(posts)
@@ -10,12 +10,18 @@ from model.pbconnect import *
 from constants.path import *
 
 from schemas.parent import *
+from services.author import AuthorService
+from services.timeline import TimelineService
 
 from db import get_db_session
 from error.exception.customerror import *
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_406_NOT_ACCEPTABLE
 
 
+authorService = AuthorService()
+timelineService = TimelineService()
+
+
 class ParentService:
 
     # 부모 생성
@@ -131,6 +137,8 @@ class ParentService:
             if parent is None:
                 return None
 
+            oldAddr = parent.mainAddr
+
             # 패스워드 암호화
             if parent.signInMethod == 'email' and updateParentInput.password:
                 updateParentInput.password = bcrypt.hashpw(
@@ -150,6 +158,12 @@ class ParentService:
             db.commit()
             db.refresh(parent)
 
+            # 피드/알림에서 사용하는 작성자 캐시 제거
+            authorService.invalidate(parent_id)
+
+            # 지역이 바뀐 경우 내 게시물을 새 지역 피드로 이동
+            timelineService.moveDistrict(parent_id, oldAddr, parent.mainAddr)
+
             return parent
 
         except Exception as e:
@@ -224,6 +238,8 @@ class ParentService:
             db.delete(parent)
             db.commit()
 
+            authorService.invalidate(parent_id)
+
             return True
         except Exception as e:
             db.rollback()
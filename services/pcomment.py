@@ -2,10 +2,15 @@ from fastapi import HTTPException
 from typing import Optional, List, Set
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session
+from sqlalchemy import func
 from db import get_db_session
+from services.counter import postCounterService
+from services.alertqueue import alertQueueService, NEW_COMMENT
 
 from model.pcomment import PCommentTable, PComment
 from model.parent import ParentTable
+from model.cheart import CHeartTable
+from utils.cursor import keyset_page
 from schemas.pcomment import *
 from error.exception.customerror import *
 
@@ -43,6 +48,9 @@ class PCommentService:
         db.add(pcomment)
         db.commit()
         db.refresh(pcomment)
+        postCounterService.add(createPCommentInput.post_id, 'pComment', 1)
+        alertQueueService.publish(NEW_COMMENT, parent_id, post_id=createPCommentInput.post_id,
+                                  content=createPCommentInput.content)
 
         return pcomment
 
@@ -72,7 +80,7 @@ class PCommentService:
         ).join(ParentTable, PCommentTable.parent_id == ParentTable.parent_id).filter(
             PCommentTable.post_id == post_id,
             PCommentTable.deleteTime == None
-        ).all()
+        ).order_by(PCommentTable.createTime, PCommentTable.comment_id).all()
 
         comments = []
         reply_comments = {}
@@ -97,18 +105,117 @@ class PCommentService:
                     reply_comments[pcomments[i][5]] = []
                 reply_comments[pcomments[i][5]].append(comment_data)
 
-        # 댓글에 대댓글이 있는 경우 대댓글을 댓글에 추가.
+        # 댓글에 대댓글이 있는 경우 대댓글을 댓글에 추가. (작성 순으로 정렬되어 있음)
         for i in range(len(comments)):
             if comments[i]['comment_id'] in reply_comments:
                 comments[i]['replies'] = reply_comments[comments[i]['comment_id']]
-                comments[i]['replies'].sort(
-                    key=lambda x: x['createTime'], reverse=False)
-
-        comments.sort(key=lambda x: x['createTime'], reverse=False)
 
         return comments
 
 
+    # 댓글 페이지 조회 (댓글/대댓글 공통)
+    def _getCommentPage(self, post_id: int, reply_id: Optional[int], viewer_id: str,
+                        size: int, cursor: Optional[str]) -> dict:
+        db = get_db_session()
+
+        # ix_pcomment_tree (post_id, reply_id, createTime, comment_id) 범위 조회
+        query = db.query(
+            PCommentTable.comment_id,
+            PCommentTable.content,
+            PCommentTable.createTime,
+            PCommentTable.modifyTime,
+            PCommentTable.cheart,
+            ParentTable.parent_id,
+            ParentTable.nickname,
+            ParentTable.photoId
+        ).join(ParentTable, PCommentTable.parent_id == ParentTable.parent_id).filter(
+            PCommentTable.post_id == post_id,
+            PCommentTable.reply_id == reply_id,
+            PCommentTable.deleteTime == None)
+
+        try:
+            rows, nextCursor = keyset_page(
+                query, [PCommentTable.createTime, PCommentTable.comment_id], cursor, size,
+                key=lambda row: (row.createTime, row.comment_id), descending=False)
+        except ValueError:
+            raise CustomException("Invalid cursor")
+
+        comment_ids = [row.comment_id for row in rows]
+
+        # 대댓글 수 (댓글 페이지에서만)
+        replyCounts = {}
+        if reply_id is None and comment_ids:
+            replyCounts = dict(db.query(PCommentTable.reply_id, func.count()).filter(
+                PCommentTable.post_id == post_id,
+                PCommentTable.reply_id.in_(comment_ids),
+                PCommentTable.deleteTime == None).group_by(PCommentTable.reply_id).all())
+
+        # 유저가 하트를 누른 댓글
+        hearted = {i[0] for i in db.query(CHeartTable.comment_id).filter(
+            CHeartTable.parent_id == viewer_id,
+            CHeartTable.comment_id.in_(comment_ids)).all()} if comment_ids else set()
+
+        comments = [{
+            'comment_id': row.comment_id,
+            'content': row.content,
+            'createTime': row.createTime,
+            'modifyTime': row.modifyTime,
+            'cheart': row.cheart,
+            'parentHeart': row.comment_id in hearted,
+            'replyCount': replyCounts.get(row.comment_id, 0) if reply_id is None else None,
+            'parent': {
+                'parent_id': row.parent_id,
+                'nickname': row.nickname,
+                'photoId': row.photoId
+            },
+            'replies': None
+        } for row in rows]
+
+        return {'comments': comments, 'nextCursor': nextCursor}
+
+    # 댓글 페이지 가져오기
+    def getPCommentPage(self, post_id: int, viewer_id: str, size: int = 20,
+                        cursor: Optional[str] = None) -> dict:
+        """
+        댓글 페이지 가져오기 (작성 순, 대댓글은 getReplyPCommentPage로 따로 가져온다)
+        --input
+            - post_id: 게시물 아이디
+            - viewer_id: 조회하는 부모 아이디 (댓글 하트 여부 확인용)
+            - size: 가져올 댓글 수
+            - cursor: 이전 결과의 nextCursor (없으면 처음부터)
+        --output
+            - comments: List<CommentOutput> (replyCount, parentHeart 포함)
+            - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
+        """
+        return self._getCommentPage(post_id, None, viewer_id, size, cursor)
+
+    # 대댓글 페이지 가져오기
+    def getReplyPCommentPage(self, comment_id: int, viewer_id: str, size: int = 20,
+                             cursor: Optional[str] = None) -> dict:
+        """
+        대댓글 페이지 가져오기 (작성 순)
+        --input
+            - comment_id: 댓글 아이디
+            - viewer_id: 조회하는 부모 아이디 (댓글 하트 여부 확인용)
+            - size: 가져올 대댓글 수
+            - cursor: 이전 결과의 nextCursor (없으면 처음부터)
+        --output
+            - comments: List<CommentOutput> (parentHeart 포함)
+            - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
+        """
+        db = get_db_session()
+
+        post_id = db.query(PCommentTable.post_id).filter(
+            PCommentTable.comment_id == comment_id,
+            PCommentTable.deleteTime == None).scalar()
+
+        # 입력된 comment_id가 없는 경우 CustomException을 발생시킵니다.
+        if post_id is None:
+            raise CustomException("Comment not found")
+
+        return self._getCommentPage(post_id, comment_id, viewer_id, size, cursor)
+
+
     # 댓글에 대댓글이 있는 경우 대댓글 가져오기
     def getReplyPComment(self, comment_id: int) -> List[PComment]:
         """
@@ -3,6 +3,9 @@ from typing import Optional, List, Set
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session
 from db import get_db_session
+from services.counter import postCounterService
+from services.viewerstate import viewerStateService
+from services.alertqueue import alertQueueService, POST_HEART
 
 from model.pheart import PHeartTable
 from schemas.pheart import *
@@ -36,6 +39,9 @@ class PHeartService:
             try:
                 db.add(new_pheart)
                 db.commit()
+                postCounterService.add(managePHeartInput.post_id, 'pHeart', 1)
+                viewerStateService.mark(parent_id, 'heart', managePHeartInput.post_id, True)
+                alertQueueService.publish(POST_HEART, parent_id, post_id=managePHeartInput.post_id)
                 db.refresh(new_pheart)
                 return {'hasCreated': True, 'message': 'Success to create pheart', 'pheart': new_pheart}
             
@@ -47,6 +53,8 @@ class PHeartService:
             try:
                 db.delete(pheart)
                 db.commit()
+                postCounterService.add(managePHeartInput.post_id, 'pHeart', -1)
+                viewerStateService.mark(parent_id, 'heart', managePHeartInput.post_id, False)
                 return {'hasCreated': False, 'message': 'Success to delete pheart', 'pheart': pheart}
             
             except Exception as e:
@@ -73,6 +81,9 @@ class PHeartService:
 
         db.add(pheart)
         db.commit()
+        postCounterService.add(createPHeartInput.post_id, 'pHeart', 1)
+        viewerStateService.mark(parent_id, 'heart', createPHeartInput.post_id, True)
+        alertQueueService.publish(POST_HEART, parent_id, post_id=createPHeartInput.post_id)
         db.refresh(pheart)
 
         return pheart
@@ -80,39 +91,20 @@ class PHeartService:
 
         
     # 하트 삭제
-    def deletePHeart(self, deletePHeartInput: DeletePHeartInput, parent_id: str) -> Optional[List[PHeart]]:
+    def deletePHeart(self, deletePHeartInput: DeletePHeartInput, parent_id: str) -> dict:
         """
         하트 삭제
         --input
             - deletePHeartInput.post_id: 게시물 아이디
             - deletePHeartInput.parent_id: 하트 누른 부모 아이디
         --output
-            - PHeart: 하트 딕셔너리
+            - deleted: 삭제한 PHeart 리스트
+            - missing: 기록이 없어 삭제하지 못한 게시물 아이디 리스트
         """
-        db = get_db_session()
-
-        if ',' not in deletePHeartInput.post_id:
-            post_id = [int(deletePHeartInput.post_id)]
-        else:
-            post_id = [int(num.strip()) for num in deletePHeartInput.post_id.split(",")]
-
-        phearts = []
-        for i in post_id:
-            pheart = db.query(PHeartTable).filter(
-                PHeartTable.post_id == i,
-                PHeartTable.parent_id == parent_id
-            ).first()
-
-            # pheart가 없을 경우 CustomException을 발생시킵니다.
-            if pheart is None:
-                raise CustomException("PHeart not found")
-
-            db.delete(pheart)
-            db.commit()
+        post_ids = viewerStateService.parsePostIds(deletePHeartInput.post_id)
 
-            phearts.append(pheart)
-
-        return phearts
+        # 하나의 트랜잭션에서 DELETE ... WHERE IN 으로 삭제하고, 없는 게시물은 missing으로 알려준다.
+        return viewerStateService.deleteStates(parent_id, 'heart', post_ids)
     
 
     # 하트 조회
@@ -125,11 +117,4 @@ class PHeartService:
         --output
             - bool: 하트가 있으면 True, 없으면 False
         """
-        db = get_db_session()
-
-        pheart = db.query(PHeartTable).filter(
-            PHeartTable.post_id == post_id,
-            PHeartTable.parent_id == parent_id
-        ).first()
-
-        return True if pheart else False
\ No newline at end of file
+        return viewerStateService.getStates(parent_id, [post_id], ['heart'])[post_id]['heart']
\ No newline at end of file
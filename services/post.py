@@ -1,6 +1,7 @@
 from fastapi import HTTPException, UploadFile
 from typing import Optional, List
-from sqlalchemy import text
+from sqlalchemy import text, select
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import joinedload
 from constants.path import *
 import os
@@ -13,26 +14,38 @@ import random
 from schemas.post import *
 from model.post import Post
 from schemas.post import *
-from db import get_db_session
+from services.postsummary import PostSummaryService
+from services.author import AuthorService
+from services.searchindex import SearchIndexService
+from services.banner import bannerService
+from services.hashtag import HashtagService
+from services.friendgraph import FriendGraphService
+from services.timeline import TimelineService
+from services.counter import postCounterService
+from services.alertqueue import alertQueueService, SUBSCRIBE_POST
+from db import get_db_session, get_async_db_session
 from error.exception.customerror import *
 from model.friend import FriendTable
 
 
+postSummaryService = PostSummaryService()
+authorService = AuthorService()
+searchIndexService = SearchIndexService()
+hashtagService = HashtagService()
+friendGraphService = FriendGraphService()
+timelineService = TimelineService()
+
+
 class PostService:
 
     # 부모의 상태 가져오기
     def _getParentStatus(self, parent_id: str):
         db = get_db_session()
 
-        # 내가 친구로 등록한 부모 수
-        friendCount = db.query(FriendTable).filter(
-            FriendTable.parent_id == parent_id).count()
-
-        # 짝꿍 수
-        mateCount = int(db.execute(text(
-            f"select count(0) from friend p inner join friend f \
-            ON p.parent_id = f.friend AND p.friend = f.parent_id \
-            where p.parent_id = \"{parent_id}\"")).fetchall()[0][0])
+        # 내가 친구로 등록한 부모 수, 짝꿍 수
+        counts = friendGraphService.getCounts(parent_id)
+        friendCount = counts['friendCount']
+        mateCount = counts['mateCount']
 
         # 이야기 수
         myStoryCount = db.query(PostTable).filter(
@@ -86,6 +99,20 @@ class PostService:
         with open(file_path, 'w', encoding='UTF-8') as f:
             f.write(content)
 
+        # 피드에서 사용할 게시물 요약 저장
+        postSummaryService.saveSummary(post.post_id, content)
+
+        # 검색, 해시태그 인덱스 저장
+        searchIndexService.indexPost(
+            post.post_id, post.title, post.hashList, content)
+        hashtagService.indexPost(post.post_id, post.hashList, post.createTime)
+
+        # 친구, 지역 피드 타임라인에 배포
+        timelineService.fanOut(post.post_id, parent_id, post.createTime)
+
+        # 구독자에게 새 게시물 알림
+        alertQueueService.publish(SUBSCRIBE_POST, parent_id, post_id=post.post_id)
+
         return post
 
 
@@ -136,30 +163,15 @@ class PostService:
         --output
             - List[Post]: 게시물 리스트
         """
-        db = get_db_session()
-
-        post = db.query(PostTable).filter(
-            PostTable.deleteTime == None).all()
+        async with get_async_db_session() as db:
+            post = list(await db.scalars(select(PostTable).where(
+                PostTable.deleteTime == None)))
 
         random.shuffle(post)
 
         return post
 
 
-    #
-    def _get_photoId_and_desc(self, content: str):
-        # content에 ![[Image1.jpeg]] 형식의 이미지가 있으면 첫번째 이미지 경로를 가져온다.
-        photoIdRex = re.search(r'!\[\[(.*?)\]\]', content)
-        photoId = photoIdRex.group(1) if photoIdRex else None
-
-        # 위처럼 개행, 이미지 경로는 제거하고 100자로 자른다.
-        content = re.sub(r'!\[\[(.*?)\]\]', '', content)
-        descr = content if len(
-            content) < 100 else content[:100] + '...'
-
-        return photoId, descr
-
-
     # 특정 부모의 모든 게시물 가져오기
     async def getAllPostByParent(self, parent_id: str, limit: Optional[int]):
         """
@@ -170,30 +182,32 @@ class PostService:
         --output
             - List[Post]: 게시물 리스트
         """
-        db = get_db_session()
-        _data = db.query(PostTable).where(
-            PostTable.parent_id == parent_id).all()
+        async with get_async_db_session() as db:
+            _data = list(await db.scalars(select(PostTable).where(
+                PostTable.parent_id == parent_id)))
         posts = random.sample(_data, len(
             _data) if len(_data) < limit else limit) if limit else _data
+        # 게시물 요약(첫번째 이미지, 100자 설명)과 작성자 정보를 한 번에 가져온다.
+        # 캐시에 없는 경우 동기 세션을 사용하므로 스레드풀에서 실행한다.
+        summaries = await run_in_threadpool(
+            postSummaryService.getSummaries, [i.post_id for i in posts])
+        authors = await run_in_threadpool(
+            authorService.getAuthors, [i.parent_id for i in posts])
+
         banners = []
         for i in posts:
-            # POST_CONTENT_DIR에 있는 파일 중 post_id경로의 content를 읽어온다.
-            file_path = os.path.join(
-                POST_CONTENT_DIR, str(i.post_id) + '.txt')
-            with open(file_path, 'r', encoding='UTF-8') as f:
-                content = f.read()
-
-            photoId, descr = self._get_photoId_and_desc(content)
+            photoId, descr = summaries[i.post_id]['photoId'], summaries[i.post_id]['desc']
+            counts = postCounterService.getCounts(i)
 
             banners.append({
                 'postid': i.post_id,
                 'photoId': photoId,
                 'title': i.title,
-                'pView': i.pView,
-                'pScript': i.pScript,
-                'pHeart': i.pHeart,
-                'comment': i.pComment,
-                'author_name': db.query(ParentTable).filter(ParentTable.parent_id == i.parent_id).first().name,
+                'pView': counts['pView'],
+                'pScript': counts['pScript'],
+                'pHeart': counts['pHeart'],
+                'comment': counts['pComment'],
+                'author_name': authors[i.parent_id]['name'],
                 'desc': descr
             })
         return banners
@@ -208,19 +222,18 @@ class PostService:
         --output
             - Post: 게시물 딕셔너리
         """
-        db = get_db_session()
-
-        post = db.query(PostTable).filter(
-            PostTable.post_id == post_id,
-            PostTable.deleteTime == None).first()
-
-        # post가 없을 경우 CustomException을 발생시킵니다.
-        if post is None:
-            raise CustomException("Post not found")
-
-        creater = db.query(ParentTable).filter(
-            ParentTable.parent_id == post.parent_id).first()
-        status = self._getParentStatus(post.parent_id)
+        async with get_async_db_session() as db:
+            post = await db.scalar(select(PostTable).where(
+                PostTable.post_id == post_id,
+                PostTable.deleteTime == None))
+
+            # post가 없을 경우 CustomException을 발생시킵니다.
+            if post is None:
+                raise CustomException("Post not found")
+
+            creater = await db.scalar(select(ParentTable).where(
+                ParentTable.parent_id == post.parent_id))
+        status = await run_in_threadpool(self._getParentStatus, post.parent_id)
         post.__setattr__('creater', {
             "parentId": creater.parent_id,
             "email": creater.email,
@@ -237,11 +250,12 @@ class PostService:
         match = re.search(r'!\[\[(.*?)\]\]', postContent)
         post.__setattr__('photoId', match.group(1) if match else None)
 
-        return post
+        # 아직 DB에 반영되지 않은 하트/스크랩/조회/댓글 수를 더한다.
+        return postCounterService.apply(post)
 
 
     # 게시물 수정
-    async def updatePost(self, updatePostInput: UpdatePostInput, parent_id: str) -> Optional[Post]:
+    def updatePost(self, updatePostInput: UpdatePostInput, parent_id: str) -> Optional[Post]:
         """
         게시물 수정
         --input
@@ -281,11 +295,22 @@ class PostService:
         db.commit()
         db.refresh(post)
 
+        # 수정된 content로 게시물 요약 갱신
+        postSummaryService.saveSummary(post.post_id, updatePostInput.content)
+
+        # 수정된 제목/해시태그/content로 검색, 해시태그 인덱스 갱신
+        searchIndexService.indexPost(
+            post.post_id, post.title, post.hashList, updatePostInput.content)
+        hashtagService.indexPost(post.post_id, post.hashList, post.createTime)
+
+        # 배너에 노출 중인 게시물이면 배너를 다시 계산
+        bannerService.invalidatePost(post.post_id)
+
         return post
     
 
     # 게시물 post 사진 업데이트
-    async def updatePhoto(self, fileList: List[UploadFile], post_id: int, parent_id: str) -> UpdatePhotoOutput:
+    def updatePhoto(self, fileList: List[UploadFile], post_id: int, parent_id: str) -> UpdatePhotoOutput:
         """
         게시물 post 사진 업데이트
         --input
@@ -326,7 +351,7 @@ class PostService:
 
 
     # 게시물 삭제
-    async def deletePost(self, deletePostInput: DeletePostInput, parent_id: str) -> Optional[Post]:
+    def deletePost(self, deletePostInput: DeletePostInput, parent_id: str) -> Optional[Post]:
         """
         게시물 삭제
         --input
@@ -353,4 +378,10 @@ class PostService:
         db.commit()
         db.refresh(post)
 
+        # 삭제된 게시물은 검색되지 않도록 인덱스에서 제거
+        searchIndexService.removePost(post.post_id)
+        hashtagService.removePost(post.post_id)
+        timelineService.removePost(post.post_id)
+        bannerService.invalidatePost(post.post_id)
+
         return post
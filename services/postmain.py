@@ -1,139 +1,39 @@
-import os
+from typing import List
 from constants.path import *
 from fastapi import HTTPException
 from constants.path import *
-import re
-import random
 
 from datetime import datetime, timedelta
 from sqlalchemy import desc
 
 from model.post import PostTable
-from model.friend import FriendTable
-from model.pheart import PHeartTable
 
 from schemas.postmain import *
+from services.postsummary import PostSummaryService
+from services.author import AuthorService
+from services.banner import bannerService
+from services.hashtag import HashtagService
+from services.friendgraph import FriendGraphService
+from services.timeline import TimelineService, FRIEND, DISTRICT
+from services.counter import postCounterService
+from services.viewerstate import viewerStateService
 from db import get_db_session
+from utils.cursor import keyset_page
 
 from error.exception.customerror import *
 
 
-class PostMainService:
-
-    def _get_photoId_and_desc(self, content: str):
-        # content에 ![[Image1.jpeg]] 형식의 이미지가 있으면 첫번째 이미지 경로를 가져온다.
-        photoIdRex = re.search(r'!\[\[(.*?)\]\]', content)
-        photoId = photoIdRex.group(1) if photoIdRex else None
-
-        # 위처럼 개행, 이미지 경로는 제거하고 100자로 자른다.
-        content = re.sub(r'!\[\[(.*?)\]\]', '', content)
-        descr = content if len(
-            content) < 100 else content[:100] + '...'
+postSummaryService = PostSummaryService()
+authorService = AuthorService()
+hashtagService = HashtagService()
+friendGraphService = FriendGraphService()
+timelineService = TimelineService()
 
-        return photoId, descr
 
-    # 메인 페이지 배너 생성
-
-    def createPostMainBanner(self) -> CreatePostMainBannerListOutput:
-        """
-        메인 페이지 배너 생성
-        --output
-            - List<{postid, photoId, title, author_name, desc 초반 100자}> : 메인 페이지 배너
-        """
-        # 오늘 00시부터 3일 전 23시 59분까지의 시간 간격을 계산합니다.
-        end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        start = end - timedelta(days=3)
-        file_name = str(start).replace(":", "_") + '.txt'
-
-        db = get_db_session()
-
-        # (start)어제의 날짜.txt 라는 파일이 존재하지 않으면
-        if not os.path.exists(str(file_name) + '.txt'):
-
-            # 전날 00시부터 23시 59분까지의 하트를 기준으로 포스트를 가져옵니다.
-            banner = db.query(PostTable).filter(
-                PostTable.createTime <= end,
-                PostTable.createTime >= start
-            ).order_by(desc(PostTable.pHeart)).limit(100).all()
-
-            # 각각의 post_id를 리스트에 저장한다
-            post_id_list = []
-            for i in banner:
-                post_id_list.append({i.post_id})
-
-            # (start)어제의 날짜.txt 파일을 생성합니다.
-            file_path = os.path.join(
-                POSTMAIN_BANNER_DIR, str(file_name) + '.txt')
-            with open(file_path, 'w', encoding='UTF-8') as f:
-                for item in post_id_list:
-                    f.write("%s\n" % item)
-
-        # (start)어제의 날짜.txt 파일이 존재하면
-        else:
-            file_path = os.path.join(
-                POSTMAIN_BANNER_DIR, str(file_name) + '.txt')
-            with open(file_path, 'r') as f:
-                post_id_list = [int(line.strip('{}\n'))
-                                for line in f.readlines()]
-
-            # post_id_list에 있는 post_id를 이용하여 post를 가져옵니다.
-            banner = db.query(PostTable).filter(
-                PostTable.post_id.in_(post_id_list)
-            ).all()
-
-        # banner의 값을 반환:List<{postid, photoId, title, author name, desc 초반 100자}>
-        # 이때, desc는 100자로 제한한다.
-        banners = []
-        idx = 0
-        for i in banner:
-            # POST_CONTENT_DIR에 있는 파일 중 post_id경로의 content를 읽어온다.
-            file_path = os.path.join(
-                POST_CONTENT_DIR, str(i.post_id) + '.txt')
-            with open(file_path, 'r', encoding='UTF-8') as f:
-                content = f.read()
-
-            # content에 ![[Image1.jpeg]] 형식의 이미지가 있으면 첫번째 이미지 경로를 가져온다.
-            photoId = re.search(r'!\[\[(.*?)\]\]', content)
-            if photoId:
-                photoId = photoId.group(1)
-
-                # 위처럼 개행, 이미지 경로는 제거하고 100자로 자른다.
-                content = re.sub(r'!\[\[(.*?)\]\]', '', content)
-                content = re.sub(r'\n', '', content)
-                descr = content if len(
-                    content) < 100 else content[:100] + '...'
-
-                banners.append({
-                    'post_id': i.post_id,
-                    'photoId': photoId,
-                    'title': i.title,
-                    'author_name': db.query(ParentTable).filter(
-                        ParentTable.parent_id == i.parent_id).first().name,
-                    'desc': descr
-                })
-                idx += 1
-
-            if idx == 5:
-                break
-
-        return banners
-
-    def createPostMainFriend(self, createPostMainInput: CreatePostMainInput) -> CreatePostMainFriendListOutput:
-        """
-        짝꿍이 쓴 게시물
-        --input
-            - createPostMainInput.parent_id: 부모 아이디
-            - createPostMainInput.size: 게시물 개수 default -1
-            - createPostMainInput.page: 페이지 수 default -1
-        --output
-            - List<{postid, photoId, title, author_photo, author_name}> : 짝꿍이 쓴 게시물
-        """
-        # 실제 코드
-        db = get_db_session()
-
-        end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        end = end - timedelta(days=1)
+class PostMainService:
 
+    # size, page 검사 후 (size, 건너뛸 게시물 수) 반환
+    def _getSizePage(self, createPostMainInput: CreatePostMainInput):
         if createPostMainInput.size != -1 and createPostMainInput.size < 0:
             raise CustomException("size must be -1 or greater than 0")
         if createPostMainInput.page != -1 and createPostMainInput.page < 0:
@@ -151,71 +51,61 @@ class PostMainService:
             # 10개씩 보여주는 페이지일 경우 페이지의 시작점을 계산
             page = createPostMainInput.page * size
 
-        temp = db.query(FriendTable).filter(
-            FriendTable.friend == createPostMainInput.parent_id
-        ).all()
-
-        temp_ids = [friend.parent_id for friend in temp]
+        return size, page
 
-        friend = db.query(FriendTable).filter(
-            FriendTable.parent_id == createPostMainInput.parent_id,
-            FriendTable.friend.in_(temp_ids)
-        ).all()
+    # 타임라인의 post_id 순서대로 피드 항목 생성
+    def _getFeedBanners(self, post_ids: List[int]) -> List[dict]:
+        db = get_db_session()
 
-        friend_ids = [f.friend for f in friend]
+        posts = {i.post_id: i for i in db.query(PostTable).filter(
+            PostTable.post_id.in_(post_ids)).all()} if post_ids else {}
+        post = [posts[i] for i in post_ids if i in posts]
 
-        # 오늘 친구가 쓴 게시물 중 page에서 size개 가져오기
-        post = db.query(PostTable).filter(
-            PostTable.parent_id.in_(friend_ids),
-            PostTable.createTime >= end
-        ).order_by(desc(PostTable.createTime)).offset(page).limit(size).all()
+        # 값을 반환: List<{postid, photoId, title, pHeart, comment, author_name, desc}>
+        # 게시물 요약(첫번째 이미지, 100자 설명)과 작성자 정보를 한 번에 가져온다.
+        summaries = postSummaryService.getSummaries([i.post_id for i in post])
+        authors = authorService.getAuthors([i.parent_id for i in post])
 
-        # 값을 반환: List<{postid, photoId, title, parentHeart, author_photo, author_name}>
         banners = []
         for i in post:
-            # file_list = os.listdir(os.path.join(
-            #     POST_PHOTO_DIR, str(i.post_id)))
-            # if len(file_list) == 0:
-            #     photoId = None
-            # else:
-            #     # file_list의 첫번째 이미지를 photoId 경로로 사용
-            #     photoId = os.path.join(
-            #         POST_PHOTO_DIR, str(i.post_id), file_list[0])
-            # POST_CONTENT_DIR에 있는 파일 중 post_id경로의 content를 읽어온다.
-            file_path = os.path.join(
-                POST_CONTENT_DIR, str(i.post_id) + '.txt')
-            with open(file_path, 'r', encoding='UTF-8') as f:
-                content = f.read()
-
-            # content에 ![[Image1.jpeg]] 형식의 이미지가 있으면 첫번째 이미지 경로를 가져온다.
-            photoId = re.search(r'!\[\[(.*?)\]\]', content)
-            if photoId:
-                photoId = photoId.group(1)
-            else:
-                photoId = None
-
-            # 유저가 게시물에 하트를 눌렀는지 확인
-            if db.query(PHeartTable).filter(
-                PHeartTable.parent_id == createPostMainInput.parent_id,
-                PHeartTable.post_id == i.post_id
-            ).first() is not None:
-                pHeart = True
-            else:
-                pHeart = False
+            summary = summaries[i.post_id]
+            counts = postCounterService.getCounts(i)
 
             banners.append({
                 'post_id': i.post_id,
-                'photoId': photoId,
+                'photoId': summary['photoId'],
                 'title': i.title,
-                # 'pHeart': i.pHeart,
-                'parentHeart': pHeart,
-                'author_photo': f"{i.parent_id}.jpeg",
-                'author_name': db.query(ParentTable).filter(
-                    ParentTable.parent_id == i.parent_id).first().name
+                'pHeart': counts['pHeart'],
+                'comment': counts['pComment'],
+                'author_name': authors[i.parent_id]['name'],
+                'desc': summary['desc']
             })
 
         return banners
 
+    # 메인 페이지 배너 생성
+
+    def createPostMainBanner(self) -> CreatePostMainBannerListOutput:
+        """
+        메인 페이지 배너 생성
+        --output
+            - List<{postid, photoId, title, author_name, desc 초반 100자}> : 메인 페이지 배너
+        """
+        # 배너는 시작 시/매일 00시에 미리 계산된 값을 메모리에서 가져온다.
+        return bannerService.getBanners()
+
+    def createPostMainFriend(self, createPostMainInput: CreatePostMainInput) -> CreatePostMainFriendListOutput:
+        """
+        짝꿍이 쓴 게시물
+        --input
+            - createPostMainInput.parent_id: 부모 아이디
+            - createPostMainInput.size: 게시물 개수 default -1
+            - createPostMainInput.page: 페이지 수 default -1
+        --output
+            - List<{postid, photoId, title, author_photo, author_name}> : 짝꿍이 쓴 게시물
+        """
+        return self.createPostMainFriendPage(createPostMainInput)['banners']
+
     def createPostMainFriendSearch(self, createPostMainInput: CreatePostMainInput) -> CreatePostMainFriendSearchListOutput:
         """
         짝꿍이 쓴 게시물
@@ -226,90 +116,67 @@ class PostMainService:
         --output
             - List<{postid, photoId, title, author_photo, author_name}> : 짝꿍이 쓴 게시물
         """
+        return self.createPostMainFriendPage(createPostMainInput)['banners']
+
+    def createPostMainFriendPage(self, createPostMainInput: CreatePostMainInput) -> dict:
+        """
+        짝꿍이 쓴 게시물 (커서 페이지네이션)
+        --input
+            - createPostMainInput.parent_id: 부모 아이디
+            - createPostMainInput.size: 게시물 개수 default -1
+            - createPostMainInput.page: 페이지 수 default -1 (cursor가 없을 때만 사용)
+            - createPostMainInput.cursor: 이전 결과의 nextCursor
+        --output
+            - banners: List<{postid, photoId, title, parentHeart, author_photo, author_name}>
+            - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
+        """
         db = get_db_session()
 
         end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         end = end - timedelta(days=1)
 
-        if createPostMainInput.size != -1 and createPostMainInput.size < 0:
-            raise CustomException("size must be -1 or greater than 0")
-        if createPostMainInput.page != -1 and createPostMainInput.page < 0:
-            raise CustomException("page must be -1 or greater than 0")
+        size, page = self._getSizePage(createPostMainInput)
 
-        # size와 page가 -1이면 기본 페이지를 가져온다.
-        if createPostMainInput.size == -1 or createPostMainInput.size == 0:
-            size = 10
-        else:
-            size = createPostMainInput.size
+        # 짝꿍 가져오기
+        friend_ids = friendGraphService.getMateIds(createPostMainInput.parent_id)
 
-        if createPostMainInput.page == -1 or createPostMainInput.page == 0:
-            page = 0
-        else:
-            # 10개씩 보여주는 페이지일 경우 페이지의 시작점을 계산
-            page = createPostMainInput.page * size
-
-        temp = db.query(FriendTable).filter(
-            FriendTable.friend == createPostMainInput.parent_id
-        ).all()
-
-        temp_ids = [friend.parent_id for friend in temp]
-
-        friend = db.query(FriendTable).filter(
-            FriendTable.parent_id == createPostMainInput.parent_id,
-            FriendTable.friend.in_(temp_ids)
-        ).all()
-
-        friend_ids = [f.friend for f in friend]
-
-        # 오늘 친구가 쓴 게시물 중 page에서 size개 가져오기
-        post = db.query(PostTable).filter(
+        # 오늘 짝꿍이 쓴 게시물 중 (createTime, post_id) 내림차순으로 size개 가져오기
+        query = db.query(PostTable).filter(
             PostTable.parent_id.in_(friend_ids),
             PostTable.createTime >= end
-        ).order_by(desc(PostTable.createTime)).offset(page).limit(size).all()
+        )
+        try:
+            post, nextCursor = keyset_page(
+                query, [PostTable.createTime, PostTable.post_id],
+                createPostMainInput.cursor, size,
+                key=lambda i: (i.createTime, i.post_id), offset=page)
+        except ValueError:
+            raise CustomException("Invalid cursor")
 
         # 값을 반환: List<{postid, photoId, title, parentHeart, author_photo, author_name}>
+        # 게시물 요약(첫번째 이미지)과 작성자 정보를 한 번에 가져온다.
+        summaries = postSummaryService.getSummaries([i.post_id for i in post])
+        authors = authorService.getAuthors([i.parent_id for i in post])
+
+        # 유저가 게시물에 하트를 눌렀는지 한 번에 확인
+        states = viewerStateService.getStates(
+            createPostMainInput.parent_id, [i.post_id for i in post], ['heart'])
+
         banners = []
         for i in post:
-            # file_list = os.listdir(os.path.join(
-            #     POST_PHOTO_DIR, str(i.post_id)))
-            # if len(file_list) == 0:
-            #     photoId = None
-            # else:
-            #     # file_list의 첫번째 이미지를 photoId 경로로 사용
-            #     photoId = os.path.join(
-            #         POST_PHOTO_DIR, str(i.post_id), file_list[0])
-            # POST_CONTENT_DIR에 있는 파일 중 post_id경로의 content를 읽어온다.
-            file_path = os.path.join(
-                POST_CONTENT_DIR, str(i.post_id) + '.txt')
-            with open(file_path, 'r', encoding='UTF-8') as f:
-                content = f.read()
-
-            # content에 ![[Image1.jpeg]] 형식의 이미지가 있으면 첫번째 이미지 경로를 가져온다.
-            photo_path = os.path.join(POST_PHOTO_DIR, str(i.post_id))
-            if os.path.exists(photo_path) and len(os.listdir(photo_path)) > 0:
-                photoId = os.listdir(photo_path)[0]
-
-            # 유저가 게시물에 하트를 눌렀는지 확인
-            if db.query(PHeartTable).filter(
-                PHeartTable.parent_id == createPostMainInput.parent_id,
-                PHeartTable.post_id == i.post_id
-            ).first() is not None:
-                pHeart = True
-            else:
-                pHeart = False
+            photoId = summaries[i.post_id]['photoId']
 
             banners.append({
                 'post_id': i.post_id,
                 'photoId': photoId,
                 'title': i.title,
                 # 'pHeart': i.pHeart,
-                'parentHeart': pHeart,
+                'parentHeart': states[i.post_id]['heart'],
                 'author_photo': f"{i.parent_id}.jpeg",
-                'author_name': db.query(ParentTable).filter(
-                    ParentTable.parent_id == i.parent_id).first().name
+                'author_name': authors[i.parent_id]['name']
             })
 
-        return banners
+        return {'banners': banners, 'nextCursor': nextCursor}
 
     def createPostMainFriendRead(self, createPostMainInput: CreatePostMainInput) -> CreatePostMainFriendListOutput:
         """
@@ -321,77 +188,33 @@ class PostMainService:
         --output
             - List<{postid, photoId, title, pHeart, comment, author_name, desc}> : 친구가 쓴 게시물
         """
-        db = get_db_session()
+        return self.createPostMainFriendReadPage(createPostMainInput)['banners']
 
+    def createPostMainFriendReadPage(self, createPostMainInput: CreatePostMainInput) -> dict:
+        """
+        친구가 쓴 게시물 (커서 페이지네이션)
+        --input
+            - createPostMainInput.parent_id: 부모 아이디
+            - createPostMainInput.size: 게시물 개수 default -1
+            - createPostMainInput.page: 페이지 수 default -1 (cursor가 없을 때만 사용)
+            - createPostMainInput.cursor: 이전 결과의 nextCursor
+        --output
+            - banners: List<{postid, photoId, title, pHeart, comment, author_name, desc}>
+            - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
+        """
         # 어제 시간
         end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         # 어제 시간
         end = end - timedelta(days=1)
 
-        if createPostMainInput.size != -1 and createPostMainInput.size < 0:
-            raise CustomException("size must be -1 or greater than 0")
-        if createPostMainInput.page != -1 and createPostMainInput.page < 0:
-            raise CustomException("page must be -1 or greater than 0")
-
-        # size와 page가 -1이면 기본 페이지를 가져온다.
-        if createPostMainInput.size == -1 or createPostMainInput.size == 0:
-            size = 10
-        else:
-            size = createPostMainInput.size
-
-        if createPostMainInput.page == -1 or createPostMainInput.page == 0:
-            page = 0
-        else:
-            # 10개씩 보여주는 페이지일 경우 페이지의 시작점을 계산
-            page = createPostMainInput.page * size
-
-        # 친구 가져오기
-        friend = db.query(FriendTable).filter(
-            FriendTable.parent_id == createPostMainInput.parent_id
-        ).all()
-
-        friend_ids = [f.friend for f in friend]
+        size, page = self._getSizePage(createPostMainInput)
 
-        # 친구가 쓴 게시물 중 page에서 size개 가져오기
-        post = db.query(PostTable).filter(
-            PostTable.parent_id.in_(friend_ids),
-            PostTable.createTime >= end
-        ).order_by(desc(PostTable.createTime)).offset(page).limit(size).all()
-
-        # 값을 반환: List<{postid, photoId, title, pHeart, comment, author_name, desc}>
-        banners = []
-        for i in post:
-            # POST_CONTENT_DIR에 있는 파일 중 post_id경로의 content를 읽어온다.
-            file_path = os.path.join(
-                POST_CONTENT_DIR, str(i.post_id) + '.txt')
-            with open(file_path, 'r', encoding='UTF-8') as f:
-                content = f.read()
-
-            # 위처럼 개행, 이미지 경로는 제거하고 100자로 자른다.
-            content = re.sub(r'!\[\[(.*?)\]\]', '', content)
-            content = re.sub(r'\n', '', content)
-            if len(content) >= 100:
-                descr = content[:100] + '...'
-            else:
-                descr = content
-
-            # content에 ![[Image1.jpeg]] 형식의 이미지가 있으면 첫번째 이미지 경로를 가져온다.
-            photo_path = os.path.join(POST_PHOTO_DIR, str(i.post_id))
-            if os.path.exists(photo_path) and len(os.listdir(photo_path)) > 0:
-                photoId = os.listdir(photo_path)[0]
-
-            banners.append({
-                'post_id': i.post_id,
-                'photoId': photoId,
-                'title': i.title,
-                'pHeart': i.pHeart,
-                'comment': i.pComment,
-                'author_name': db.query(ParentTable).filter(
-                    ParentTable.parent_id == i.parent_id).first().name,
-                'desc': descr
-            })
+        # 내 친구 타임라인에서 어제 이후 게시물 중 size개 가져오기
+        post_ids, nextCursor = timelineService.read(
+            createPostMainInput.parent_id, FRIEND, size,
+            cursor=createPostMainInput.cursor, offset=page, since=end)
 
-        return banners
+        return {'banners': self._getFeedBanners(post_ids), 'nextCursor': nextCursor}
 
     def getNeighbor(self, parent_id: str) -> GetNeighborOutputListOutput:
         """
@@ -404,11 +227,7 @@ class PostMainService:
         db = get_db_session()
 
         # 친구로 등록한 목록
-        friend = db.query(FriendTable).filter(
-            FriendTable.parent_id == parent_id
-        ).all()
-
-        friend_ids = [f.friend for f in friend]
+        friend_ids = friendGraphService.getFriendIds(parent_id)
 
         # 친구로 등록되지 않은 이웃목록을 10개 가져오기
         neighbors = db.query(ParentTable).filter(
@@ -443,71 +262,38 @@ class PostMainService:
         --output
             - List<{postid, photoId, title, pHeart, comment, author_name, desc}> : 이웃이 쓴 게시물
         """
-        db = get_db_session()
-        if createPostMainInput.size != -1 and createPostMainInput.size < 0:
-            raise CustomException("size must be -1 or greater than 0")
-        if createPostMainInput.page != -1 and createPostMainInput.page < 0:
-            raise CustomException("page must be -1 or greater than 0")
-
-        # size와 page가 -1이면 기본 페이지를 가져온다.
-        if createPostMainInput.size == -1 or createPostMainInput.size == 0:
-            size = 10
-        else:
-            size = createPostMainInput.size
+        return self.createPostMainNeighborPage(createPostMainInput)['banners']
 
-        if createPostMainInput.page == -1 or createPostMainInput.page == 0:
-            page = 0
-        else:
-            # 10개씩 보여주는 페이지일 경우 페이지의 시작점을 계산
-            page = createPostMainInput.page * size
+    def createPostMainNeighborPage(self, createPostMainInput: CreatePostMainInput) -> dict:
+        """
+        이웃들이 쓴 게시물 (커서 페이지네이션)
+        --input
+            - createPostMainInput.parent_id: 부모 아이디
+            - createPostMainInput.size: 게시물 개수 default -1
+            - createPostMainInput.page: 페이지 수 default -1 (cursor가 없을 때만 사용)
+            - createPostMainInput.cursor: 이전 결과의 nextCursor
+        --output
+            - banners: List<{postid, photoId, title, pHeart, comment, author_name, desc}>
+            - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
+        """
+        db = get_db_session()
 
-        # 이웃을 가져오기
-        neighbors = db.query(ParentTable).filter(
-            ParentTable.parent_id != createPostMainInput.parent_id,
-            ParentTable.mainAddr == db.query(ParentTable.mainAddr).filter(
-                ParentTable.parent_id == createPostMainInput.parent_id
-            ).scalar()
-        ).all()
+        size, page = self._getSizePage(createPostMainInput)
 
-        # 이웃이 쓴 게시물 중 page에서 size개 가져오기
-        post = db.query(PostTable).filter(
-            PostTable.parent_id.in_([i.parent_id for i in neighbors])
-        ).order_by(desc(PostTable.createTime)).offset(page).limit(size).all()
+        # 내 지역
+        mainAddr = db.query(ParentTable.mainAddr).filter(
+            ParentTable.parent_id == createPostMainInput.parent_id
+        ).scalar()
 
-        # 값을 반환: List<{postid, photoId, title, pHeart, comment, author_name, desc}>
-        banners = []
-        for i in post:
-            # POST_CONTENT_DIR에 있는 파일 중 post_id경로의 content를 읽어온다.
-            file_path = os.path.join(
-                POST_CONTENT_DIR, str(i.post_id) + '.txt')
-            with open(file_path, 'r', encoding='UTF-8') as f:
-                content = f.read()
-
-            # 위처럼 개행, 이미지 경로는 제거하고 100자로 자른다.
-            content = re.sub(r'!\[\[(.*?)\]\]', '', content)
-            content = re.sub(r'\n', '', content)
-            if len(content) >= 100:
-                descr = content[:100] + '...'
-            else:
-                descr = content
-
-            # content에 ![[Image1.jpeg]] 형식의 이미지가 있으면 첫번째 이미지 경로를 가져온다.
-            photo_path = os.path.join(POST_PHOTO_DIR, str(i.post_id))
-            if os.path.exists(photo_path) and len(os.listdir(photo_path)) > 0:
-                photoId = os.listdir(photo_path)[0]
+        if not mainAddr:
+            return {'banners': [], 'nextCursor': None}
 
-            banners.append({
-                'post_id': i.post_id,
-                'photoId': photoId,
-                'title': i.title,
-                'pHeart': i.pHeart,
-                'comment': i.pComment,
-                'author_name': db.query(ParentTable).filter(
-                    ParentTable.parent_id == i.parent_id).first().name,
-                'desc': descr
-            })
+        # 지역 타임라인에서 내가 쓴 게시물을 제외하고 size개 가져오기
+        post_ids, nextCursor = timelineService.read(
+            mainAddr, DISTRICT, size, cursor=createPostMainInput.cursor,
+            offset=page, excludeAuthor=createPostMainInput.parent_id)
 
-        return banners
+        return {'banners': self._getFeedBanners(post_ids), 'nextCursor': nextCursor}
 
     def createPostMainHighView(self) -> CreatePostMainHighViewListOutput:
         """
@@ -522,23 +308,20 @@ class PostMainService:
             desc(PostTable.pView)).limit(10).all()
 
         # 값을 반환: List<{postid, photoId, title, author_name, desc}>
+        # 게시물 요약(첫번째 이미지, 100자 설명)과 작성자 정보를 한 번에 가져온다.
+        summaries = postSummaryService.getSummaries([i.post_id for i in post])
+        authors = authorService.getAuthors([i.parent_id for i in post])
+
         banners = []
         for i in post:
-            # POST_CONTENT_DIR에 있는 파일 중 post_id경로의 content를 읽어온다.
-            file_path = os.path.join(
-                POST_CONTENT_DIR, str(i.post_id) + '.txt')
-            with open(file_path, 'r', encoding='UTF-8') as f:
-                content = f.read()
-
-            photoId, descr = self._get_photoId_and_desc(content)
+            summary = summaries[i.post_id]
 
             banners.append({
                 'post_id': i.post_id,
-                'photoId': photoId,
+                'photoId': summary['photoId'],
                 'title': i.title,
-                'author_name': db.query(ParentTable).filter(
-                    ParentTable.parent_id == i.parent_id).first().name,
-                'desc': descr
+                'author_name': authors[i.parent_id]['name'],
+                'desc': summary['desc']
             })
 
         return banners
@@ -562,39 +345,31 @@ class PostMainService:
         if not parent or not parent.hashList:
             return []
 
-        parent_hashlist = parent.hashList.split(',')
-
-        # 최신순 게시물을 가져오기
-        posts = db.query(PostTable).order_by(PostTable.createTime.desc()).all()
-        matching_posts = []
+        # 해시태그 인덱스에서 해시태그가 하나라도 일치하는 게시물을
+        # 부모가 많이 본 해시태그 순, 최신순으로 10개 가져오기
+        post_ids = hashtagService.recommend(
+            parent_id, hashtagService.splitHashList(parent.hashList), size=10)
 
-        # 해시태그가 포함된 게시물을 가져오기
-        for post in posts:
-            if post.hashList != None and post.hashList != '':
-                post_hashlist = post.hashList.split(',')
-                if any(hash in parent_hashlist for hash in post_hashlist):
-                    matching_posts.append(post)
-                if len(matching_posts) == 10:
-                    break
+        posts = {i.post_id: i for i in db.query(PostTable).filter(
+            PostTable.post_id.in_(post_ids)).all()} if post_ids else {}
+        matching_posts = [posts[i] for i in post_ids if i in posts]
 
         # 값을 반환: List<{postid, photoId, title, author_name, desc, hashList}>
+        # 게시물 요약(첫번째 이미지, 100자 설명)과 작성자 정보를 한 번에 가져온다.
+        summaries = postSummaryService.getSummaries(
+            [i.post_id for i in matching_posts])
+        authors = authorService.getAuthors([i.parent_id for i in matching_posts])
+
         banners = []
         for i in matching_posts:
-            # POST_CONTENT_DIR에 있는 파일 중 post_id경로의 content를 읽어온다.
-            file_path = os.path.join(
-                POST_CONTENT_DIR, str(i.post_id) + '.txt')
-            with open(file_path, 'r', encoding='UTF-8') as f:
-                content = f.read()
-
-            photoId, descr = self._get_photoId_and_desc(content)
+            summary = summaries[i.post_id]
 
             banners.append({
                 'post_id': i.post_id,
-                'photoId': photoId,
+                'photoId': summary['photoId'],
                 'title': i.title,
-                'author_name': db.query(ParentTable).filter(
-                    ParentTable.parent_id == i.parent_id).first().name,
-                'desc': descr,
+                'author_name': authors[i.parent_id]['name'],
+                'desc': summary['desc'],
                 'hash': i.hashList
             })
         return banners
@@ -0,0 +1,130 @@
+from typing import Optional, List, Dict, Iterable
+from datetime import datetime
+from constants.path import *
+import os
+import re
+
+from model.post import PostTable
+from model.postsummary import PostSummaryTable
+from db import get_db_session
+from utils.cache import LRUCache
+
+
+# content에 포함된 ![[Image1.jpeg]] 형식의 이미지
+PHOTO_PATTERN = re.compile(r'!\[\[(.*?)\]\]')
+
+# 피드에서 반복적으로 읽는 게시물 요약 (post_id -> 요약 딕셔너리)
+summary_cache = LRUCache(maxsize=4096, ttl=600)
+
+
+class PostSummaryService:
+
+    def summarize(self, content: str) -> dict:
+        """
+        게시물 content로부터 요약 생성
+        --input
+            - content: 게시물 내용
+        --output
+            - {photoId: 첫번째 이미지, desc: 이미지와 개행을 제거한 100자 설명, photoCount: 이미지 수}
+        """
+        photoIds = PHOTO_PATTERN.findall(content)
+
+        # 개행, 이미지 경로는 제거하고 100자로 자른다.
+        descr = PHOTO_PATTERN.sub('', content).replace('\n', '')
+        descr = descr if len(descr) < 100 else descr[:100] + '...'
+
+        return {'photoId': photoIds[0] if photoIds else None,
+                'desc': descr,
+                'photoCount': len(photoIds)}
+
+    def _read_content(self, post_id: int) -> str:
+        file_path = os.path.join(POST_CONTENT_DIR, str(post_id) + '.txt')
+        if not os.path.exists(file_path):
+            return ''
+        with open(file_path, 'r', encoding='UTF-8') as f:
+            return f.read()
+
+    def _to_dict(self, row: PostSummaryTable) -> dict:
+        return {'photoId': row.photoId,
+                'desc': row.description,
+                'photoCount': row.photoCount}
+
+    # 게시물 요약 저장 (createPost, updatePost에서 호출)
+    def saveSummary(self, post_id: int, content: str) -> dict:
+        """
+        게시물 요약 저장
+        --input
+            - post_id: 게시물 아이디
+            - content: 게시물 내용
+        --output
+            - 요약 딕셔너리
+        """
+        db = get_db_session()
+
+        summary = self.summarize(content)
+        try:
+            db.merge(PostSummaryTable(
+                post_id=post_id,
+                photoId=summary['photoId'],
+                description=summary['desc'],
+                photoCount=summary['photoCount'],
+                modifyTime=datetime.now()
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+        summary_cache.set(post_id, summary)
+        return summary
+
+    # 여러 게시물의 요약을 한 번에 가져오기
+    def getSummaries(self, post_ids: Iterable[int]) -> Dict[int, dict]:
+        """
+        여러 게시물의 요약을 한 번에 가져오기
+        --input
+            - post_ids: 게시물 아이디 리스트
+        --output
+            - {post_id: {photoId, desc, photoCount}}
+        """
+        post_ids = list(dict.fromkeys(post_ids))
+        summaries = summary_cache.get_many(post_ids)
+
+        missing = [i for i in post_ids if i not in summaries]
+        if not missing:
+            return summaries
+
+        db = get_db_session()
+
+        rows = db.query(PostSummaryTable).filter(
+            PostSummaryTable.post_id.in_(missing)).all()
+        found = {row.post_id: self._to_dict(row) for row in rows}
+        summary_cache.set_many(found)
+        summaries.update(found)
+
+        # 요약이 아직 없는 게시물(재생성 전 게시물)은 content 파일로부터 생성하여 저장한다.
+        for post_id in missing:
+            if post_id not in summaries:
+                summaries[post_id] = self.saveSummary(
+                    post_id, self._read_content(post_id))
+
+        return summaries
+
+    # 하나의 게시물 요약 가져오기
+    def getSummary(self, post_id: int) -> dict:
+        return self.getSummaries([post_id])[post_id]
+
+    # 모든 게시물의 요약 재생성
+    def rebuildAll(self) -> int:
+        """
+        모든 게시물의 요약 재생성
+        --output
+            - 재생성한 게시물 수
+        """
+        db = get_db_session()
+
+        post_ids = [i[0] for i in db.query(PostTable.post_id).all()]
+        for post_id in post_ids:
+            self.saveSummary(post_id, self._read_content(post_id))
+
+        return len(post_ids)
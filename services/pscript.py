@@ -3,6 +3,9 @@ from typing import Optional, List, Set
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session
 from db import get_db_session
+from services.counter import postCounterService
+from services.viewerstate import viewerStateService
+from services.alertqueue import alertQueueService, POST_SCRIPT
 
 from model.pscript import PScriptTable
 from schemas.pscript import *
@@ -38,6 +41,9 @@ class PScriptService:
             try:
                 db.add(new_pscript)
                 db.commit()
+                postCounterService.add(managePScriptInput.post_id, 'pScript', 1)
+                viewerStateService.mark(parent_id, 'script', managePScriptInput.post_id, True)
+                alertQueueService.publish(POST_SCRIPT, parent_id, post_id=managePScriptInput.post_id)
                 db.refresh(new_pscript)
                 return {'hasCreated': True, 'message': 'Success to create pscript', 'pscript': new_pscript}
             
@@ -49,6 +55,8 @@ class PScriptService:
             try:
                 db.delete(pscript)
                 db.commit()
+                postCounterService.add(managePScriptInput.post_id, 'pScript', -1)
+                viewerStateService.mark(parent_id, 'script', managePScriptInput.post_id, False)
                 return {'hasCreated': False, 'message': 'Success to delete pscript', 'pscript': pscript}
             
             except Exception as e:
@@ -75,42 +83,29 @@ class PScriptService:
 
         db.add(pscript)
         db.commit()
+        postCounterService.add(createPScriptInput.post_id, 'pScript', 1)
+        viewerStateService.mark(parent_id, 'script', createPScriptInput.post_id, True)
+        alertQueueService.publish(POST_SCRIPT, parent_id, post_id=createPScriptInput.post_id)
         db.refresh(pscript)
 
         return pscript
 
 
     # 스크립트 삭제
-    def deletePScript(self, deletePScriptInput: DeletePScriptInput, parent_id: str) -> Optional[PScript]:
+    def deletePScript(self, deletePScriptInput: DeletePScriptInput, parent_id: str) -> dict:
         """
         스크립트 삭제
         --input
             - deletePScriptInput.post_id: 게시물 아이디
             - deletePScriptInput.parent_id: 스크립트한 부모 아이디
         --output
-            - PScript: 스크립트 딕셔너리
+            - deleted: 삭제한 PScript 리스트
+            - missing: 기록이 없어 삭제하지 못한 게시물 아이디 리스트
         """
-        db = get_db_session()
-
-        post_id = [int(num.strip()) for num in deletePScriptInput.post_id.split(",")]
-
-        pscripts = []
-        for i in post_id:
-            pscript = db.query(PScriptTable).filter(
-                PScriptTable.post_id == i,
-                PScriptTable.parent_id == parent_id
-            ).first()
-
-            # pscript가 없을 경우 CustomException을 발생시킵니다.
-            if pscript is None:
-                raise CustomException("PScript not found")
-
-            db.delete(pscript)
-            db.commit()
+        post_ids = viewerStateService.parsePostIds(deletePScriptInput.post_id)
 
-            pscripts.append(pscript)
-
-        return pscripts
+        # 하나의 트랜잭션에서 DELETE ... WHERE IN 으로 삭제하고, 없는 게시물은 missing으로 알려준다.
+        return viewerStateService.deleteStates(parent_id, 'script', post_ids)
     
 
     # 스크립트 조회
@@ -124,11 +119,4 @@ class PScriptService:
             - message: 메시지
             - state: 스크립트 상태
         """
-        db = get_db_session()
-
-        pscript = db.query(PScriptTable).filter(
-            PScriptTable.post_id == post_id,
-            PScriptTable.parent_id == parent_id
-        ).first()
-        
-        return True if pscript else False
\ No newline at end of file
+        return viewerStateService.getStates(parent_id, [post_id], ['script'])[post_id]['script']
\ No newline at end of file
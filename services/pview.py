@@ -7,6 +7,8 @@ from model.pview import PViewTable
 from schemas.pview import *
 
 from db import get_db_session
+from services.counter import postCounterService
+from services.viewerstate import viewerStateService
 from error.exception.customerror import *
 
 class PViewService:
@@ -37,6 +39,8 @@ class PViewService:
             try:
                 db.add(new_view)
                 db.commit()
+                postCounterService.add(managePViewInput.post_id, 'pView', 1)
+                viewerStateService.mark(parent_id, 'view', managePViewInput.post_id, True)
                 db.refresh(new_view)
                 return {'hasCreated': True, 'message': 'Success to create pview', 'pview': new_view}
             
@@ -48,6 +52,8 @@ class PViewService:
             try:
                 db.delete(view)
                 db.commit()
+                postCounterService.add(managePViewInput.post_id, 'pView', -1)
+                viewerStateService.mark(parent_id, 'view', managePViewInput.post_id, False)
                 return {'hasCreated': False, 'message': 'Success to delete pview', 'pview': view}
             
             except Exception as e:
@@ -75,39 +81,25 @@ class PViewService:
 
         db.add(view)
         db.commit()
+        postCounterService.add(createPViewInput.post_id, 'pView', 1)
+        viewerStateService.mark(parent_id, 'view', createPViewInput.post_id, True)
         db.refresh(view)
 
         return view
 
         
     # 조회 삭제
-    def deletePView(self, deletePViewInput: DeletePViewInput, parent_id: str) -> Optional[PView]:
+    def deletePView(self, deletePViewInput: DeletePViewInput, parent_id: str) -> dict:
         """
         조회 삭제
         --input
             - deletePViewInput.post_id: 게시물 아이디
             - deletePViewInput.parent_id: 조회한 부모 아이디
         --output
-            - View: 조회 딕셔너리
+            - deleted: 삭제한 PView 리스트
+            - missing: 기록이 없어 삭제하지 못한 게시물 아이디 리스트
         """
-        db = get_db_session()
-
-        post_id = [int(num.strip()) for num in deletePViewInput.post_id.split(",")]
-
-        views = []
-        for i in post_id:
-            view = db.query(PViewTable).filter(
-                    PViewTable.post_id == i,
-                    PViewTable.parent_id == parent_id
-                ).first()
-    
-            # pview가 없을 경우 CustomException을 발생시킵니다.
-            if view is None:
-                raise CustomException("PView not found")
-
-            db.delete(view)
-            db.commit()
-
-            views.append(view)
+        post_ids = viewerStateService.parsePostIds(deletePViewInput.post_id)
 
-        return views
\ No newline at end of file
+        # 하나의 트랜잭션에서 DELETE ... WHERE IN 으로 삭제하고, 없는 게시물은 missing으로 알려준다.
+        return viewerStateService.deleteStates(parent_id, 'view', post_ids)
\ No newline at end of file
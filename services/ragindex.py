@@ -0,0 +1,276 @@
+from typing import Optional, List, Dict
+from datetime import datetime
+import os
+import json
+import math
+import hashlib
+import logging
+import numpy as np
+
+from constants.path import *
+from core.env import env
+from services.vectorstore import vectorStoreService, FAISS_INDEX_DIR, RAG_INDEX_TYPE, RAG_INDEX_TYPES, read_index_name
+from utils.os import write_file_atomic
+from error.exception.customerror import *
+
+
+# 한 번에 임베딩할 최대 질문 수
+EMBED_BATCH = 256
+
+# 교체 후 남겨둘 이전 인덱스 수 (되돌리기용)
+KEEP_VERSIONS = 1
+
+# 검색 인덱스 생성 파라미터
+# - RAG_IVF_NLIST: IVF 클러스터 수 (0이면 4 * sqrt(행 수))
+# - RAG_PQ_M: IVF-PQ 부분 벡터 수 (임베딩 차원의 약수), 부분 벡터당 8bit
+# - RAG_HNSW_M, RAG_HNSW_EF_CONSTRUCTION: HNSW 이웃 수, 생성 시 탐색 폭
+RAG_IVF_NLIST = env.get_int("RAG_IVF_NLIST", 0)
+RAG_PQ_M = env.get_int("RAG_PQ_M", 16)
+RAG_HNSW_M = env.get_int("RAG_HNSW_M", 32)
+RAG_HNSW_EF_CONSTRUCTION = env.get_int("RAG_HNSW_EF_CONSTRUCTION", 80)
+
+logger = logging.getLogger(__name__)
+
+
+# flat 인덱스의 벡터를 순서대로 꺼낸다. (docstore 매핑의 위치와 같다)
+def read_vectors(index) -> np.ndarray:
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def build_ann_index(vectors: np.ndarray, index_type: str):
+    """
+    검색 인덱스 생성 (flat 인덱스와 같은 순서로 추가하여 docstore 매핑을 그대로 쓴다)
+    --input
+        - vectors: (행 수, 차원) float32 정규화 임베딩
+        - index_type: flat | ivf_flat | ivf_pq | hnsw
+    --output
+        - faiss 인덱스 (L2, 정규화된 벡터이므로 코사인과 순위가 같다)
+    """
+    import faiss
+
+    if index_type not in RAG_INDEX_TYPES:
+        raise CustomException(f"Unsupported index type: {index_type}")
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+
+    if index_type == 'flat':
+        index = faiss.IndexFlatL2(dim)
+    elif index_type == 'hnsw':
+        index = faiss.IndexHNSWFlat(dim, RAG_HNSW_M)
+        index.hnsw.efConstruction = RAG_HNSW_EF_CONSTRUCTION
+    else:
+        # 클러스터마다 학습 데이터가 39개 이상 있어야 한다.
+        nlist = RAG_IVF_NLIST or int(4 * math.sqrt(n))
+        nlist = max(1, min(nlist, n // 39))
+        quantizer = faiss.IndexFlatL2(dim)
+        if index_type == 'ivf_flat':
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist)
+        else:
+            if dim % RAG_PQ_M:
+                raise CustomException(f"RAG_PQ_M({RAG_PQ_M}) must divide dimension {dim}")
+            # 코드북(256개)을 학습할 수 있을 만큼 행이 적으면 비트 수를 줄인다.
+            nbits = 8 if n >= 256 * 39 else max(1, min(8, int(math.log2(max(n // 39, 2)))))
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, RAG_PQ_M, nbits)
+        # data.csv가 탭 순서로 되어 있으므로 섞어서 학습한다.
+        sample = np.random.default_rng(0).permutation(n)[:nlist * 256]
+        index.train(vectors[np.sort(sample)])
+
+    index.add(vectors)
+    return index
+
+
+class RagIndexService:
+    """
+    AI 의사 FAISS 인덱스 관리
+    - dataset/aidoctor/data.csv의 각 행을 아이디(id 컬럼, 없으면 질문의 해시)와
+      내용 해시(탭/질문/답변)로 관리하여, 추가/변경된 행만 EMBED_BATCH개씩 임베딩한다.
+    - 새 인덱스는 index-<버전>.faiss/.pkl 로 저장한 뒤 CURRENT 파일을 원자적으로 바꿔
+      읽는 쪽(서버)이 쓰는 도중의 인덱스를 보지 않도록 한다.
+    - manifest-<버전>.json 에 {아이디: 내용 해시}를 저장한다.
+    - 추가/삭제는 flat 인덱스에 하고, RAG_INDEX_TYPE이 flat이 아니면 교체할 때마다
+      index-<버전>.<종류>.faiss 검색 인덱스를 다시 만든다. (IVF/HNSW는 삭제 후 위치가 맞지 않는다)
+    """
+
+    def __init__(self, directory: str = FAISS_INDEX_DIR, csv_path: Optional[str] = None):
+        self.directory = directory
+        self.csv_path = csv_path or os.path.join(AIDOCTOR_DIR, "data.csv")
+
+    def _manifest_path(self, index_name: str) -> str:
+        return os.path.join(self.directory, f'manifest-{index_name}.json')
+
+    def _load_manifest(self, index_name: str) -> Optional[Dict[str, str]]:
+        path = self._manifest_path(index_name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='UTF-8') as f:
+            return json.load(f)
+
+    # data.csv 읽기 -> {아이디: {fingerprint, text, metadata}}
+    def read_rows(self) -> Dict[str, dict]:
+        import pandas as pd
+
+        df = pd.read_csv(self.csv_path, encoding='utf-8-sig').fillna('')
+
+        rows = {}
+        for row in df.to_dict('records'):
+            text = str(row['질문'])
+            if 'id' in row and row['id'] != '':
+                doc_id = str(row['id'])
+            else:
+                doc_id = hashlib.sha1(text.encode('UTF-8')).hexdigest()[:16]
+                # 같은 질문이 여러 번 있으면 순서대로 번호를 붙인다.
+                base, n = doc_id, 1
+                while doc_id in rows:
+                    doc_id, n = f'{base}-{n}', n + 1
+
+            metadata = {'탭': row['탭'], '질문': row['질문'], '답변': row['답변']}
+            fingerprint = hashlib.sha1(json.dumps(
+                metadata, ensure_ascii=False, sort_keys=True).encode('UTF-8')).hexdigest()
+            rows[doc_id] = {'fingerprint': fingerprint, 'text': text, 'metadata': metadata}
+
+        return rows
+
+    def _embed(self, embeddings_model, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for i in range(0, len(texts), EMBED_BATCH):
+            vectors.extend(embeddings_model.embed_documents(texts[i:i + EMBED_BATCH]))
+            logger.info("embedded %d/%d", min(i + EMBED_BATCH, len(texts)), len(texts))
+        return vectors
+
+    def _create(self, embeddings_model, rows: Dict[str, dict]):
+        from langchain_community.vectorstores import FAISS
+        from langchain_community.vectorstores.utils import DistanceStrategy
+
+        doc_ids = list(rows)
+        vectors = self._embed(embeddings_model, [rows[i]['text'] for i in doc_ids])
+        return FAISS.from_embeddings(
+            list(zip([rows[i]['text'] for i in doc_ids], vectors)),
+            embedding=embeddings_model,
+            metadatas=[rows[i]['metadata'] for i in doc_ids],
+            ids=doc_ids,
+            distance_strategy=DistanceStrategy.COSINE)
+
+    # 새 버전으로 저장하고 CURRENT 교체
+    def _publish(self, vectorstore, manifest: Dict[str, str]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        index_name = 'index-' + datetime.now().strftime('%Y%m%d%H%M%S%f')
+
+        vectorstore.save_local(self.directory, index_name=index_name)
+        self._save_ann(vectorstore, index_name)
+        write_file_atomic(self._manifest_path(index_name),
+                          json.dumps(manifest, ensure_ascii=False))
+        write_file_atomic(os.path.join(self.directory, 'CURRENT'), index_name)
+
+        self._cleanup(index_name)
+        return index_name
+
+    def _ann_path(self, index_name: str, index_type: str) -> str:
+        return os.path.join(self.directory, f'{index_name}.{index_type}.faiss')
+
+    # RAG_INDEX_TYPE이 flat이 아니면 flat 인덱스로부터 검색 인덱스를 만들어 저장
+    def _save_ann(self, vectorstore, index_name: str, index_type: str = RAG_INDEX_TYPE):
+        if index_type == 'flat':
+            return
+
+        import faiss
+        index = build_ann_index(read_vectors(vectorstore.index), index_type)
+        faiss.write_index(index, self._ann_path(index_name, index_type))
+
+    # 오래된 버전 삭제 (현재 + KEEP_VERSIONS개 유지)
+    def _cleanup(self, current: str):
+        names = os.listdir(self.directory)
+        versions = sorted({name.split('.')[0] for name in names
+                           if name.startswith('index-') and name.endswith(('.faiss', '.pkl'))})
+        old = [version for version in versions if version != current][:-KEEP_VERSIONS or None]
+        for version in old:
+            for name in names:
+                if name.startswith(f'{version}.') or name == f'manifest-{version}.json':
+                    os.remove(os.path.join(self.directory, name))
+
+    def _load(self, embeddings_model, index_name: str):
+        from langchain_community.vectorstores import FAISS
+
+        return FAISS.load_local(self.directory, embeddings=embeddings_model,
+                                index_name=index_name, allow_dangerous_deserialization=True)
+
+    # data.csv와 인덱스 맞추기
+    def sync(self, full: bool = False) -> dict:
+        """
+        data.csv의 변경 사항을 인덱스에 반영
+        --input
+            - full: True이면 모두 다시 임베딩
+        --output
+            - index: 새 인덱스 이름 (변경이 없으면 현재 인덱스)
+            - added, changed, deleted: 반영한 행 수
+            - vectorstore: 반영된 벡터 저장소
+        """
+        embeddings_model = vectorStoreService.get_embeddings()
+        rows = self.read_rows()
+
+        index_name = read_index_name(self.directory)
+        manifest = None if full or index_name is None else self._load_manifest(index_name)
+
+        # 처음 만들거나, 아이디 없이 만들어진 예전 인덱스는 전체를 다시 만든다.
+        if manifest is None:
+            vectorstore = self._create(embeddings_model, rows)
+            manifest = {doc_id: row['fingerprint'] for doc_id, row in rows.items()}
+            return {'index': self._publish(vectorstore, manifest), 'added': len(rows),
+                    'changed': 0, 'deleted': 0, 'vectorstore': vectorstore}
+
+        added = [doc_id for doc_id in rows if doc_id not in manifest]
+        changed = [doc_id for doc_id in rows
+                   if doc_id in manifest and manifest[doc_id] != rows[doc_id]['fingerprint']]
+        deleted = [doc_id for doc_id in manifest if doc_id not in rows]
+
+        vectorstore = self._load(embeddings_model, index_name)
+        if not (added or changed or deleted):
+            # RAG_INDEX_TYPE을 바꾼 경우 검색 인덱스만 새로 만들어 교체한다.
+            if RAG_INDEX_TYPE != 'flat' and not os.path.exists(self._ann_path(index_name, RAG_INDEX_TYPE)):
+                index_name = self._publish(vectorstore, manifest)
+            return {'index': index_name, 'added': 0, 'changed': 0, 'deleted': 0,
+                    'vectorstore': vectorstore}
+
+        if changed or deleted:
+            vectorstore.delete(changed + deleted)
+
+        upserts = changed + added
+        if upserts:
+            vectors = self._embed(embeddings_model, [rows[i]['text'] for i in upserts])
+            vectorstore.add_embeddings(
+                list(zip([rows[i]['text'] for i in upserts], vectors)),
+                metadatas=[rows[i]['metadata'] for i in upserts],
+                ids=upserts)
+
+        manifest = {doc_id: row['fingerprint'] for doc_id, row in rows.items()}
+        return {'index': self._publish(vectorstore, manifest), 'added': len(added),
+                'changed': len(changed), 'deleted': len(deleted), 'vectorstore': vectorstore}
+
+    # 아이디로 삭제 (data.csv에서도 지워야 다음 sync 때 다시 추가되지 않는다)
+    def delete(self, doc_ids: List[str]) -> dict:
+        """
+        인덱스에서 행 삭제
+        --input
+            - doc_ids: 삭제할 아이디 리스트
+        --output
+            - index: 새 인덱스 이름
+            - deleted: 삭제한 아이디 리스트
+            - missing: 인덱스에 없는 아이디 리스트
+        """
+        index_name = read_index_name(self.directory)
+        manifest = self._load_manifest(index_name) if index_name else None
+        if manifest is None:
+            raise CustomException("Index has no manifest. Run sync first.")
+
+        deleted = [doc_id for doc_id in dict.fromkeys(doc_ids) if doc_id in manifest]
+        missing = [doc_id for doc_id in dict.fromkeys(doc_ids) if doc_id not in manifest]
+        if not deleted:
+            return {'index': index_name, 'deleted': [], 'missing': missing}
+
+        vectorstore = self._load(vectorStoreService.get_embeddings(), index_name)
+        vectorstore.delete(deleted)
+        for doc_id in deleted:
+            del manifest[doc_id]
+
+        return {'index': self._publish(vectorstore, manifest),
+                'deleted': deleted, 'missing': missing}
@@ -13,23 +13,20 @@ from model.post import PostTable
 from model.parent import ParentTable
 
 from schemas.search import *
+from services.postsummary import PostSummaryService
+from services.author import AuthorService
+from services.searchindex import SearchIndexService
 from error.exception.customerror import *
 from db import get_db_session
+from services.counter import postCounterService
 
 
-class SearchService:
-
-    def _get_photoId_and_desc(self, content: str):
-        # content에 ![[Image1.jpeg]] 형식의 이미지가 있으면 첫번째 이미지 경로를 가져온다.
-        photoIdRex = re.search(r'!\[\[(.*?)\]\]', content)
-        photoId = photoIdRex.group(1) if photoIdRex else None
+postSummaryService = PostSummaryService()
+authorService = AuthorService()
+searchIndexService = SearchIndexService()
 
-        # 위처럼 개행, 이미지 경로는 제거하고 100자로 자른다.
-        content = re.sub(r'!\[\[(.*?)\]\]', '', content)
-        descr = content if len(
-            content) < 100 else content[:100] + '...'
 
-        return photoId, descr
+class SearchService:
 
     # 검색어 입력시 검색 결과 반환
 
@@ -40,9 +37,11 @@ class SearchService:
         --input
             - search: 검색어
             - size: 검색 결과 개수
-            - page: 페이지 수
+            - page: 페이지 수 (cursor가 없을 때만 사용)
+            - cursor: 이전 검색 결과의 nextCursor
         --output
-            - List<{title, photoid,  author_name, heart, commnet, desc}>
+            - banners: List<{title, photoid,  author_name, heart, commnet, desc}>
+            - nextCursor: 다음 페이지 커서 (마지막 페이지면 None)
         """
 
         db = get_db_session()
@@ -63,37 +62,37 @@ class SearchService:
             # 10개씩 보여주는 페이지일 경우 페이지의 시작점을 계산
             page = createSearchInput.page * size
 
-            # 제목에 검색어가 포함된 게시물을 조회
-            # 조회수가 높은 순으로 정렬
-        # post = db.query(PostTable).filter(
-        #     PostTable.title.ilike(f'%{createSearchInput.search}%')
-        # ).order_by(desc(PostTable.pView)).offset(page).limit(size).all()
+        # 제목/해시태그/본문 인덱스에서 관련도, 조회수 순으로 한 페이지만 조회
+        # (첫 페이지에서 계산한 순위 스냅샷을 다음 페이지에서 이어 사용)
+        ranked, nextCursor = searchIndexService.search(
+            createSearchInput.search, size,
+            cursor=createSearchInput.cursor, offset=page)
 
-        # 임시코드: 페이지 상관하지 않고 모든 게시물을 가져온다.
-        post = db.query(PostTable).filter(
-            PostTable.title.ilike(f'%{createSearchInput.search}%')
-        ).order_by(desc(PostTable.pView)).all()
+        post_ids = [post_id for post_id, _ in ranked]
+        # 순위 스냅샷을 만든 뒤 삭제된 게시물은 제외한다.
+        posts = {i.post_id: i for i in db.query(PostTable).filter(
+            PostTable.post_id.in_(post_ids),
+            PostTable.deleteTime == None).all()} if post_ids else {}
+        post = [posts[i] for i in post_ids if i in posts]
 
         # 값을 반환: List<{title, photoid,  author_name, pHeart, pComment, desc}>
+        # 게시물 요약(첫번째 이미지, 100자 설명)과 작성자 정보를 한 번에 가져온다.
+        summaries = postSummaryService.getSummaries([i.post_id for i in post])
+        authors = authorService.getAuthors([i.parent_id for i in post])
+
         banners = []
         for i in post:
-            # POST_CONTENT_DIR에 있는 파일 중 post_id경로의 content를 읽어온다.
-            file_path = os.path.join(
-                POST_CONTENT_DIR, str(i.post_id) + '.txt')
-            with open(file_path, 'r', encoding='UTF-8') as f:
-                content = f.read()
-
-            photoId, descr = self._get_photoId_and_desc(content)
+            summary = summaries[i.post_id]
+            counts = postCounterService.getCounts(i)
 
             banners.append({
                 'postid': i.post_id,
                 'title': i.title,
-                'photoId': photoId if bool(random.getrandbits(1)) else None,
-                'author_name': db.query(ParentTable).filter(
-                    ParentTable.parent_id == i.parent_id).first().name,
-                'pHeart': i.pHeart,
-                'comment': i.pComment,
-                'desc': descr
+                'photoId': summary['photoId'] if bool(random.getrandbits(1)) else None,
+                'author_name': authors[i.parent_id]['name'],
+                'pHeart': counts['pHeart'],
+                'comment': counts['pComment'],
+                'desc': summary['desc']
             })
 
-        return banners
+        return {'banners': banners, 'nextCursor': nextCursor}
@@ -0,0 +1,230 @@
+from typing import Optional, List, Tuple
+from collections import Counter
+from uuid import uuid4
+from sqlalchemy import func, delete, insert, select, case, and_, or_
+
+from model.post import PostTable
+from model.postngram import PostNgramTable
+from services.postsummary import PostSummaryService, PHOTO_PATTERN
+from error.exception.customerror import *
+from db import get_db_session
+from core.env import env
+from utils.ngram import ngrams, normalize_text
+from utils.cursor import encode_cursor, decode_cursor
+from utils.cache import LRUCache
+
+
+# gram이 등장한 위치별 가중치
+TITLE_WEIGHT = 3
+HASH_WEIGHT = 2
+BODY_WEIGHT = 1
+
+# 본문 gram은 반복 등장에 따른 점수 상승을 제한한다.
+BODY_MAX_COUNT = 3
+BODY_MAX_LENGTH = 5000
+
+# 검색어 gram 중 최소 몇 %가 일치해야 결과에 포함할지
+MIN_MATCH_RATIO = 0.7
+
+# 검색어별 순위는 처음 한 번만 계산해 스냅샷으로 저장하고, 다음 페이지는 스냅샷에서 잘라 준다.
+# (조회수가 바뀌어도 페이지 사이에 게시물이 빠지거나 반복되지 않는다.)
+SEARCH_MAX_RESULTS = env.get_int("SEARCH_MAX_RESULTS", 1000)
+SEARCH_SNAPSHOT_SIZE = env.get_int("SEARCH_SNAPSHOT_SIZE", 1000)
+SEARCH_SNAPSHOT_TTL = env.get_float("SEARCH_SNAPSHOT_TTL", 600)
+
+# 프로세스 내 검색 순위 스냅샷 {snapshot_id: [(post_id, score)]}, {('query', 검색어): snapshot_id}
+_snapshots = LRUCache(maxsize=SEARCH_SNAPSHOT_SIZE, ttl=SEARCH_SNAPSHOT_TTL)
+
+
+postSummaryService = PostSummaryService()
+
+
+class SearchIndexService:
+
+    def buildGrams(self, title: str, hashList: Optional[str], content: str) -> Counter:
+        """
+        게시물의 gram별 가중치 계산
+        --input
+            - title: 게시물 제목
+            - hashList: 쉼표로 구분된 해시태그
+            - content: 게시물 내용
+        --output
+            - Counter{gram: weight}
+        """
+        weights = Counter()
+        for gram, count in Counter(ngrams(title)).items():
+            weights[gram] += count * TITLE_WEIGHT
+
+        for tag in (hashList or '').split(','):
+            for gram, count in Counter(ngrams(tag)).items():
+                weights[gram] += count * HASH_WEIGHT
+
+        body = PHOTO_PATTERN.sub(' ', content or '')[:BODY_MAX_LENGTH]
+        for gram, count in Counter(ngrams(body)).items():
+            weights[gram] += min(count, BODY_MAX_COUNT) * BODY_WEIGHT
+
+        return weights
+
+    # 게시물 인덱싱 (createPost, updatePost에서 호출)
+    def indexPost(self, post_id: int, title: str, hashList: Optional[str], content: str) -> int:
+        """
+        게시물 인덱싱
+        --input
+            - post_id: 게시물 아이디
+            - title, hashList, content: 게시물 제목, 해시태그, 내용
+        --output
+            - 저장한 gram 수
+        """
+        db = get_db_session()
+
+        weights = self.buildGrams(title, hashList, content)
+        try:
+            db.execute(delete(PostNgramTable).where(
+                PostNgramTable.post_id == post_id))
+            if weights:
+                db.execute(insert(PostNgramTable), [
+                    {'gram': gram, 'post_id': post_id, 'weight': weight}
+                    for gram, weight in weights.items()])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+        return len(weights)
+
+    # 게시물 인덱스 삭제 (deletePost에서 호출)
+    def removePost(self, post_id: int):
+        db = get_db_session()
+
+        try:
+            db.execute(delete(PostNgramTable).where(
+                PostNgramTable.post_id == post_id))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+    # 검색어의 순위 계산 (관련도, 조회수, post_id 순으로 최대 SEARCH_MAX_RESULTS개)
+    def _rank(self, query: str) -> List[Tuple[int, int]]:
+        grams = list(dict.fromkeys(ngrams(query)))
+        if not grams:
+            return []
+
+        db = get_db_session()
+        pView = func.coalesce(PostTable.pView, 0)
+
+        # 한 글자 단어만 있으면 2-gram이 없으므로 제목/해시태그 LIKE로 찾는다.
+        if all(len(gram) < 2 for gram in grams):
+            def like(column):
+                return and_(*[column.like('%' + gram + '%') for gram in grams])
+
+            score = case((like(PostTable.title), TITLE_WEIGHT), else_=HASH_WEIGHT)
+            rows = db.query(PostTable.post_id, score).filter(
+                PostTable.deleteTime == None,
+                or_(like(PostTable.title), like(PostTable.hashList))).order_by(
+                score.desc(), pView.desc(), PostTable.post_id.desc()).limit(
+                SEARCH_MAX_RESULTS).all()
+            return [(row[0], int(row[1])) for row in rows]
+
+        score = func.sum(PostNgramTable.weight)
+        minMatch = max(1, int(len(grams) * MIN_MATCH_RATIO))
+
+        rows = db.query(PostNgramTable.post_id, score).join(
+            PostTable, PostTable.post_id == PostNgramTable.post_id).filter(
+            PostNgramTable.gram.in_(grams),
+            PostTable.deleteTime == None).group_by(
+            PostNgramTable.post_id, PostTable.pView).having(
+            func.count(PostNgramTable.gram) >= minMatch).order_by(
+            score.desc(), pView.desc(), PostNgramTable.post_id.desc()).limit(
+            SEARCH_MAX_RESULTS).all()
+        return [(row[0], int(row[1])) for row in rows]
+
+    def _snapshot(self, query: str) -> Tuple[str, List[Tuple[int, int]]]:
+        snapshot_id = uuid4().hex[:16]
+        ranked = self._rank(query)
+        _snapshots.set(snapshot_id, ranked)
+        _snapshots.set(('query', normalize_text(query)), snapshot_id)
+        return snapshot_id, ranked
+
+    # 검색어로 게시물 검색
+    def search(self, query: str, size: int, cursor: Optional[str] = None,
+               offset: int = 0) -> Tuple[List[Tuple[int, int]], Optional[str]]:
+        """
+        검색어로 게시물 검색 (관련도, 조회수 순)
+        - 첫 페이지에서 순위를 계산해 스냅샷으로 저장하고, 이후 페이지는 DB 조회 없이 스냅샷에서 가져온다.
+        - 스냅샷이 만료됐거나 다른 워커에서 만든 커서이면 순위를 다시 계산해
+          마지막으로 반환한 게시물 다음부터 이어간다.
+        --input
+            - query: 검색어
+            - size: 가져올 게시물 수
+            - cursor: 이전 검색 결과의 nextCursor (없으면 처음부터)
+            - offset: cursor가 없을 때 건너뛸 게시물 수 (page 방식 호환용)
+        --output
+            - ([(post_id, score)], nextCursor)
+        """
+        try:
+            last = decode_cursor(cursor, 4)
+        except ValueError:
+            raise CustomException("Invalid cursor")
+
+        if last is not None:
+            snapshot_id, position, lastScore, lastPostId = last
+            if not isinstance(snapshot_id, str) or not isinstance(position, int) or position < 0 \
+                    or not isinstance(lastScore, int) or not isinstance(lastPostId, int):
+                raise CustomException("Invalid cursor")
+
+            ranked = _snapshots.get(snapshot_id)
+            if ranked is None:
+                snapshot_id, ranked = self._snapshot(query)
+                ids = [post_id for post_id, _ in ranked]
+                if lastPostId in ids:
+                    position = ids.index(lastPostId) + 1
+                else:
+                    position = next((i for i, (_, score) in enumerate(ranked)
+                                     if score < lastScore), len(ranked))
+        else:
+            # page 방식은 같은 검색어의 스냅샷을 이어서 사용한다.
+            snapshot_id = _snapshots.get(('query', normalize_text(query))) if offset else None
+            ranked = _snapshots.get(snapshot_id) if snapshot_id is not None else None
+            if ranked is None:
+                snapshot_id, ranked = self._snapshot(query)
+            position = offset
+
+        rows = ranked[position:position + size]
+
+        nextCursor = None
+        if rows and position + size < len(ranked):
+            lastPostId, lastScore = rows[-1]
+            nextCursor = encode_cursor(snapshot_id, position + size, lastScore, lastPostId)
+
+        return rows, nextCursor
+
+    # 모든 게시물의 인덱스 재생성
+    def rebuildAll(self) -> int:
+        """
+        모든 게시물의 검색 인덱스 재생성
+        - 게시물마다 인덱스를 교체하므로 재생성 중에도 검색 결과가 비지 않는다.
+        - 마지막에 삭제된 게시물의 인덱스를 지운다.
+        --output
+            - 인덱싱한 게시물 수
+        """
+        db = get_db_session()
+
+        posts = db.query(PostTable.post_id, PostTable.title, PostTable.hashList).filter(
+            PostTable.deleteTime == None).all()
+
+        for post_id, title, hashList in posts:
+            self.indexPost(post_id, title, hashList,
+                           postSummaryService._read_content(post_id))
+
+        try:
+            db.execute(delete(PostNgramTable).where(
+                PostNgramTable.post_id.not_in(
+                    select(PostTable.post_id).where(PostTable.deleteTime == None))))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+        _snapshots.clear()
+        return len(posts)
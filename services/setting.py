@@ -1,16 +1,28 @@
 from typing import Optional
 from constants.path import *
-from sqlalchemy import text
+from sqlalchemy import func
 import os
 import re
+import bisect
 
 from schemas.setting import *
 from schemas.setting import *
+from services.postsummary import PostSummaryService
+from services.friendgraph import FriendGraphService
 from db import get_db_session
+from services.counter import postCounterService
 from error.exception.customerror import *
 
 from model.friend import FriendTable
 from model.post import PostTable
+from model.pview import PViewTable
+from model.pscript import PScriptTable
+from model.pheart import PHeartTable
+from utils.cursor import encode_cursor, decode_cursor, keyset_page
+
+
+postSummaryService = PostSummaryService()
+friendGraphService = FriendGraphService()
 
 
 class SettingService:
@@ -26,15 +38,10 @@ class SettingService:
         """
         db = get_db_session()
 
-        # 내가 친구로 등록한 부모 수
-        friendCount = db.query(FriendTable).filter(
-            FriendTable.parent_id == parent_id).count()
-
-        # 짝꿍 수
-        mateCount = int(db.execute(text(
-            f"select count(0) from friend p inner join friend f \
-            ON p.parent_id = f.friend AND p.friend = f.parent_id \
-            where p.parent_id = \"{parent_id}\"")).fetchall()[0][0])
+        # 내가 친구로 등록한 부모 수, 짝꿍 수
+        counts = friendGraphService.getCounts(parent_id)
+        friendCount = counts['friendCount']
+        mateCount = counts['mateCount']
 
         # 이야기 수
         myStoryCount = db.query(PostTable).filter(
@@ -43,20 +50,8 @@ class SettingService:
 
         return {'friendCount': friendCount, 'mateCount': mateCount, 'myStoryCount': myStoryCount}
 
-    # 내가 친구로 등록한 부모 불러오기
-
-    def getMyFriends(self, page: int, parent_id: str) -> Optional[MyFriendsOutputService]:
-        """
-        친구들 불러오기
-        - input
-            - page (int): 페이지
-            - parent_id (str): 부모 아이디
-        - output
-            - MyFriendsOutputService: 내가 친구로 등록한 부모와 페이지 정보.
-        """
-        db = get_db_session()
-
-        # 페이징
+    # 페이지 검사 후 (take, 건너뛸 수) 반환
+    def _getPage(self, page: int):
         if page != -1 and page < 0:
             raise CustomException("page must be -1 or greater than 0")
         take = 10
@@ -64,343 +59,245 @@ class SettingService:
         if page == -1:
             page = 0
 
-        total = db.query(FriendTable).filter(
-            FriendTable.parent_id == parent_id).count()
+        return take, page * take
+
+    # 친구 등록 순 부모 아이디 리스트에서 한 페이지 가져오기
+    def _getParentPage(self, ids: list, keys: dict, take: int, offset: int, cursor: Optional[str]):
+        try:
+            last = decode_cursor(cursor, 1)
+        except ValueError:
+            raise CustomException("Invalid cursor")
+
+        # ids는 friend_id 오름차순이므로 커서(마지막 friend_id) 다음부터 가져온다.
+        if last is not None:
+            start = bisect.bisect_right([keys[i] for i in ids], last[0])
+        else:
+            start = offset
+
+        pageIds = ids[start:start + take]
+        nextCursor = encode_cursor(keys[pageIds[-1]]) \
+            if len(pageIds) == take and start + take < len(ids) else None
+        return pageIds, nextCursor
+
+    # 게시물 keyset 페이지 조회 (cursor 형식 오류는 CustomException)
+    def _keysetPage(self, query, columns: list, cursor: Optional[str], take: int, offset: int, key):
+        try:
+            return keyset_page(query, columns, cursor, take, key, offset=offset)
+        except ValueError:
+            raise CustomException("Invalid cursor")
+
+    # 게시물 리스트 데이터
+    def _getPostList(self, posts: list, photo: str = 'post_id') -> list:
+        summaries = postSummaryService.getSummaries([i.post_id for i in posts])
 
-        # 내가 친구로 등록한 부모 찾기
-        myFriends = db.query(FriendTable).filter(
-            FriendTable.parent_id == parent_id).offset(page * take).limit(take).all()
+        post = []
+        for i in posts:
+            summary = summaries[i.post_id]
+            counts = postCounterService.getCounts(i)
 
-        paginationInfo = {'page': page, 'take': take, 'total': total}
+            post.append({
+                'post_id': i.post_id,
+                'title': i.title,
+                'createTime': i.createTime,
+                'pHeart': counts['pHeart'],
+                'pScript': counts['pScript'],
+                'pView': counts['pView'],
+                'pComment': counts['pComment'],
+                'hashList': i.hashList,
+                'contentPreview': summary['desc'],
+                'photo_id': summary['photoId'] if photo == 'summary' else str(i.post_id)
+            })
 
-        if myFriends is None:
-            return {
-                'paginationInfo': paginationInfo,
-                'parents': []
-            }
+        return post
 
-        # 짝꿍
-        temp = db.query(FriendTable).filter(
-            FriendTable.friend == parent_id
-        ).all()
+    # 유저가 조회/스크립트/좋아요한 post (최근 순)
+    def _getActionPosts(self, table, idColumn, page: int, parent_id: str,
+                        cursor: Optional[str], photo: str = 'post_id'):
+        db = get_db_session()
 
-        temp_ids = [friend.parent_id for friend in temp]
+        take, offset = self._getPage(page)
 
-        mate = db.query(FriendTable).filter(
-            FriendTable.parent_id == parent_id,
-            FriendTable.friend.in_(temp_ids)
-        ).all()
+        total = db.query(func.count(idColumn)).join(
+            PostTable, PostTable.post_id == table.post_id).filter(
+            table.parent_id == parent_id).scalar()
 
-        mate = [i.friend for i in mate]
+        # (행 id) 내림차순 keyset 페이지네이션
+        query = db.query(PostTable, idColumn).join(
+            table, PostTable.post_id == table.post_id).filter(
+            table.parent_id == parent_id)
+        rows, nextCursor = self._keysetPage(
+            query, [idColumn], cursor, take, offset, key=lambda row: (row[1],))
 
-        # 친구들 데이터
-        parents = []
-        for i in myFriends:
-            temp = db.query(ParentTable).filter(
-                ParentTable.parent_id == i.friend).first()
-            parents.append({
-                'parent_id': i.friend,
-                'nickname': temp.nickname,
-                'photoId': f"{i.friend}.jpeg",
-                'description': temp.description,
-                'isMate': True if i.friend in mate else False
-            })
+        paginationInfo = {'page': offset // take, 'take': take,
+                          'total': total, 'nextCursor': nextCursor}
 
         return {
             'paginationInfo': paginationInfo,
-            'parents': parents
+            'post': self._getPostList([row[0] for row in rows], photo)
         }
 
-    # 유저가 조회한 post
+    # 내가 친구로 등록한 부모 불러오기
 
-    def getMyViews(self, page: int, parent_id: str) -> Optional[MyViewsPostOutputService]:
+    def getMyFriends(self, page: int, parent_id: str, cursor: Optional[str] = None) -> Optional[MyFriendsOutputService]:
         """
-        유저가 조회한 post
+        친구들 불러오기
         - input
             - page (int): 페이지
             - parent_id (str): 부모 아이디
+            - cursor (str): 이전 페이지의 nextCursor (있으면 page 대신 사용)
         - output
-            - MyViewsPostOutput: 유저가 조회한 post
+            - MyFriendsOutputService: 내가 친구로 등록한 부모와 페이지 정보.
         """
         db = get_db_session()
 
         # 페이징
-        if page != -1 and page < 0:
-            raise CustomException("page must be -1 or greater than 0")
-        take = 10
+        take, offset = self._getPage(page)
 
-        total = str(db.execute(text(
-            f"select count(0) from post p inner join pview v \
-            on p.post_id = v.post_id where v.parent_id = \"{parent_id}\"")).fetchall()[0][0])
+        # 내가 친구로 등록한 부모, 짝꿍
+        graph = friendGraphService.getGraph(parent_id)
+        total = len(graph['friends'])
+        myFriends, nextCursor = self._getParentPage(
+            graph['friends'], graph['keys'], take, offset, cursor)
+        mate = set(graph['mates'])
 
-        # 유저가 조회한 post 찾기
-        myViews = db.execute(text(
-            f"select p.* from post p inner join pview v on p.post_id = v.post_id \
-            where v.parent_id = :parent_id LIMIT :limit OFFSET :offset"),
-            {"parent_id": parent_id, "limit": (page + 1) * take, "offset": page * 10}).fetchall()
+        paginationInfo = {'page': offset // take, 'take': take,
+                          'total': total, 'nextCursor': nextCursor}
 
-        paginationInfo = {'page': page, 'take': take, 'total': total}
-
-        if not myViews:
+        if not myFriends:
             return {
                 'paginationInfo': paginationInfo,
-                'post': []
+                'parents': []
             }
 
-        # 유저가 조회한 post 데이터
-        post = []
-        for i in myViews:
-            content = open(os.path.join(POST_CONTENT_DIR, str(
-                i[0]) + '.txt'), 'r', encoding='UTF-8').read()
-            content = re.sub(r'!\[\[(.*?)\]\]', '', content)
-            content = re.sub(r'\n', '', content)[:101]
+        # 친구들 데이터
+        temp = {i.parent_id: i for i in db.query(ParentTable).filter(
+            ParentTable.parent_id.in_(myFriends)).all()}
 
-            post.append({
-                'post_id': i[0],
-                'title': i[3],
-                'createTime': i[4],
-                'pHeart': i[7],
-                'pScript': i[8],
-                'pView': i[9],
-                'pComment': i[10],
-                'hashList': i[11],
-                'contentPreview': content,
-                'photo_id': str(i[0])
+        parents = []
+        for i in myFriends:
+            parents.append({
+                'parent_id': i,
+                'nickname': temp[i].nickname,
+                'photoId': f"{i}.jpeg",
+                'description': temp[i].description,
+                'isMate': True if i in mate else False
             })
 
         return {
             'paginationInfo': paginationInfo,
-            'post': post
+            'parents': parents
         }
 
+    # 유저가 조회한 post
+
+    def getMyViews(self, page: int, parent_id: str, cursor: Optional[str] = None) -> Optional[MyViewsPostOutputService]:
+        """
+        유저가 조회한 post
+        - input
+            - page (int): 페이지
+            - parent_id (str): 부모 아이디
+            - cursor (str): 이전 페이지의 nextCursor (있으면 page 대신 사용)
+        - output
+            - MyViewsPostOutput: 유저가 조회한 post
+        """
+        return self._getActionPosts(PViewTable, PViewTable.view_id, page, parent_id, cursor)
+
     # 유저가 script한 post
 
-    def getScripts(self, page: int, parent_id: str) -> Optional[MyViewsPostOutputService]:
+    def getScripts(self, page: int, parent_id: str, cursor: Optional[str] = None) -> Optional[MyViewsPostOutputService]:
         """
         유저가 script한 post
         - input
             - page (int): 페이지
             - parent_id (str): 부모 아이디
+            - cursor (str): 이전 페이지의 nextCursor (있으면 page 대신 사용)
         - output
             - MyViewsPostOutput: 유저가 script한 post
         """
-        db = get_db_session()
-
-        # 페이징
-        if page != -1 and page < 0:
-            raise CustomException("page must be -1 or greater than 0")
-        take = 10
-
-        total = str(db.execute(text(
-            f"select count(0) from post p inner join pscript s \
-            on p.post_id = s.post_id where s.parent_id = \"{parent_id}\"")).fetchall()[0][0])
-
-        # 유저가 스크립트한 post 찾기
-        scripts = db.execute(text(
-            f"select * from post p inner join pscript s on p.post_id = s.post_id \
-            where s.parent_id = :parent_id LIMIT :limit OFFSET :offset"),
-            {"parent_id": parent_id, "limit": (page + 1) * take, "offset": page * 10}).fetchall()
-
-        paginationInfo = {'page': page, 'take': take, 'total': total}
-
-        if not scripts:
-            return {
-                'paginationInfo': paginationInfo,
-                'post': []
-            }
-
-        # 유저가 script한 post 데이터
-        post = []
-        for i in scripts:
-            content = open(os.path.join(POST_CONTENT_DIR, str(
-                i[0]) + '.txt'), 'r', encoding='UTF-8').read()
-            content = re.sub(r'!\[\[(.*?)\]\]', '', content)
-            content = re.sub(r'\n', '', content)[:101]
-
-            photo_path = os.path.join(POST_PHOTO_DIR, str(i[0]))
-            if os.path.exists(photo_path) and len(os.listdir(photo_path)) > 0:
-                photoId = os.listdir(photo_path)[0]
-            else:
-                photoId = None
-
-            post.append({
-                'post_id': i[0],
-                'title': i[3],
-                'createTime': i[4],
-                'pHeart': i[7],
-                'pScript': i[8],
-                'pView': i[9],
-                'pComment': i[10],
-                'hashList': i[11],
-                'contentPreview': content,
-                'photo_id': photoId
-            })
-
-        return {
-            'paginationInfo': paginationInfo,
-            'post': post
-        }
+        return self._getActionPosts(PScriptTable, PScriptTable.script_id, page, parent_id, cursor,
+                                    photo='summary')
 
     # 유저가 좋아요한 post
 
-    def getLikes(self, page: int, parent_id: str) -> Optional[MyViewsPostOutputService]:
+    def getLikes(self, page: int, parent_id: str, cursor: Optional[str] = None) -> Optional[MyViewsPostOutputService]:
         """
         유저가 좋아요한 post
         - input
             - page (int): 페이지
             - parent_id (str): 부모 아이디
+            - cursor (str): 이전 페이지의 nextCursor (있으면 page 대신 사용)
         - output
             - MyViewsPostOutput: 유저가 좋아요한 post
         """
-        db = get_db_session()
-
-        # 페이징
-        if page != -1 and page < 0:
-            raise CustomException("page must be -1 or greater than 0")
-        take = 10
-
-        total = str(db.execute(text(
-            f"select count(0) from post p inner join pheart h \
-            on p.post_id = h.post_id where h.parent_id = \"{parent_id}\"")).fetchall()[0][0])
-
-        # 유저가 좋아요 누른 post 찾기
-        likes = db.execute(text(
-            f"select * from post p inner join pheart h on p.post_id = h.post_id \
-            where h.parent_id = :parent_id LIMIT :limit OFFSET :offset"),
-            {"parent_id": parent_id, "limit": (page + 1) * take, "offset": page * 10}).fetchall()
-
-        paginationInfo = {'page': page, 'take': take, 'total': total}
-
-        if not likes:
-            return {
-                'paginationInfo': paginationInfo,
-                'post': []
-            }
-
-        # 유저가 script한 post 데이터
-        post = []
-        for i in likes:
-            content = open(os.path.join(POST_CONTENT_DIR, str(
-                i[0]) + '.txt'), 'r', encoding='UTF-8').read()
-            content = re.sub(r'!\[\[(.*?)\]\]', '', content)
-            content = re.sub(r'\n', '', content)[:101]
-
-            post.append({
-                'post_id': i[0],
-                'title': i[3],
-                'createTime': i[4],
-                'pHeart': i[7],
-                'pScript': i[8],
-                'pView': i[9],
-                'pComment': i[10],
-                'hashList': i[11],
-                'contentPreview': content,
-                'photo_id': str(i[0])
-            })
-
-        return {
-            'paginationInfo': paginationInfo,
-            'post': post
-        }
+        return self._getActionPosts(PHeartTable, PHeartTable.pheart_id, page, parent_id, cursor)
 
     # 유저 post
 
-    def getMyStories(self, page: int, parent_id: str) -> Optional[MyStoriesOutputService]:
+    def getMyStories(self, page: int, parent_id: str, cursor: Optional[str] = None) -> Optional[MyStoriesOutputService]:
         """
         유저 post
         - input
             - page (int): 페이지
             - parent_id (str): 부모 아이디
+            - cursor (str): 이전 페이지의 nextCursor (있으면 page 대신 사용)
         - output
             - MyStoriesOutput: 유저 post
         """
         db = get_db_session()
 
-        # 유저 post
-        myStories = db.query(PostTable).filter(
-            PostTable.parent_id == parent_id).all()
         # 페이징
-        if page != -1 and page < 0:
-            raise CustomException("page must be -1 or greater than 0")
-        take = 10
+        take, offset = self._getPage(page)
 
         total = db.query(PostTable).filter(
             PostTable.parent_id == parent_id,
             PostTable.deleteTime == None).count()
-        # 유저의 post 찾기
-        myStories = db.execute(text(
-            f"SELECT * FROM post WHERE parent_id = :parent_id AND deleteTime IS NULL LIMIT :limit OFFSET :offset"),
-            {"parent_id": parent_id, "limit": (page + 1) * take, "offset": page * 10}).fetchall()
-        paginationInfo = {'page': page, 'take': take, 'total': total}
 
-        if myStories is None:
-            return {
-                'paginationInfo': paginationInfo,
-                'post': []
-            }
+        # 유저의 post 찾기 (createTime, post_id) 내림차순
+        query = db.query(PostTable).filter(
+            PostTable.parent_id == parent_id,
+            PostTable.deleteTime == None)
+        myStories, nextCursor = self._keysetPage(
+            query, [PostTable.createTime, PostTable.post_id], cursor, take, offset,
+            key=lambda i: (i.createTime, i.post_id))
 
-        # 유저 post 데이터
-        post = []
-        for j in range(len(myStories)):
-            for i in range(len(myStories[j])):
-                print(type(myStories[j][i]), end=', ')
-            print()
-        for i in myStories:
-            content = open(os.path.join(POST_CONTENT_DIR, str(
-                i[0]) + '.txt'), 'r', encoding='UTF-8').read()
-            content = re.sub(r'!\[\[(.*?)\]\]', '', content)
-            content = re.sub(r'\n', '', content)[:101]
+        paginationInfo = {'page': offset // take, 'take': take,
+                          'total': total, 'nextCursor': nextCursor}
 
-            post.append({
-                'post_id': i[0],
-                'title': i[3],
-                'createTime': i[4],
-                'pHeart': i[7],
-                'pScript': i[8],
-                'pView': i[9],
-                'pComment': i[10],
-                'hashList': i[11],
-                'contentPreview': content,
-                'photo_id': str(i[0])
-            })
         return {
             'paginationInfo': paginationInfo,
-            'post': post
+            'post': self._getPostList(myStories)
         }
 
     # 짝꿍 불러오기
 
-    def getMyMates(self, page: int, parent_id: str) -> Optional[MyMatesOutputService]:
+    def getMyMates(self, page: int, parent_id: str, cursor: Optional[str] = None) -> Optional[MyMatesOutputService]:
         """
         짝꿍 불러오기
         - input
             - page (int): 페이지
             - parent_id (str): 부모 아이디
+            - cursor (str): 이전 페이지의 nextCursor (있으면 page 대신 사용)
         - output
             - MyMatesOutput: 짝꿍
         """
         db = get_db_session()
 
         # 페이징
-        if page != -1 and page < 0:
-            raise CustomException("page must be -1 or greater than 0")
-        take = 10
+        take, offset = self._getPage(page)
 
         # 짝꿍 수
-        total = int(db.execute(text(
-            f"select count(0) from friend p inner join friend f \
-            ON p.parent_id = f.friend AND p.friend = f.parent_id \
-            where p.parent_id = \"{parent_id}\"")).fetchall()[0][0])
+        graph = friendGraphService.getGraph(parent_id)
+        total = len(graph['mates'])
 
         # 짝꿍 정보 가져오기
-        myMates = db.execute(text(
-            f"select p.* from friend fp inner join friend f \
-                ON fp.parent_id = f.friend AND fp.friend = f.parent_id \
-                inner join parent p on p.parent_id = f.parent_id \
-                where fp.parent_id = :parent_id LIMIT :limit OFFSET :offset"),
-            {"parent_id": parent_id, "limit": (page + 1) * take, "offset": page * 10}).fetchall()
+        pageMates, nextCursor = self._getParentPage(
+            graph['mates'], graph['keys'], take, offset, cursor)
+        temp = {i.parent_id: i for i in db.query(ParentTable).filter(
+            ParentTable.parent_id.in_(pageMates)).all()} if pageMates else {}
+        myMates = [temp[i] for i in pageMates if i in temp]
 
-        paginationInfo = {'page': page, 'take': take, 'total': total}
+        paginationInfo = {'page': offset // take, 'take': take,
+                          'total': total, 'nextCursor': nextCursor}
 
         if not myMates:
             return {
@@ -412,10 +309,10 @@ class SettingService:
         parents = []
         for i in myMates:
             parents.append({
-                'parent_id': i[0],
-                'nickname': i[4],
-                'photoId': i[8],
-                'description': i[9]
+                'parent_id': i.parent_id,
+                'nickname': i.nickname,
+                'photoId': i.photoId,
+                'description': i.description
             })
 
         return {
@@ -0,0 +1,240 @@
+from typing import Optional, List, Tuple
+from datetime import datetime
+from sqlalchemy import func, delete, insert, tuple_
+
+from model.post import PostTable
+from model.parent import ParentTable
+from model.friend import FriendTable
+from model.timeline import TimelineTable
+from services.friendgraph import FriendGraphService
+from error.exception.customerror import *
+from db import get_db_session
+from utils.cursor import keyset_page
+
+
+FRIEND = 'friend'
+DISTRICT = 'district'
+
+# owner, kind별로 보관하는 최대 게시물 수
+TIMELINE_CAP = 500
+INSERT_CHUNK = 1000
+
+
+friendGraphService = FriendGraphService()
+
+
+class TimelineService:
+    """
+    피드 타임라인 (fan-out on write)
+    - 게시물 작성 시 작성자를 친구로 등록한 부모(friend)와 작성자의 지역(district)
+      타임라인에 post_id를 넣어두고, 피드는 (owner, kind, createTime) 범위 조회로 읽는다.
+    """
+
+    def _insert(self, db, rows: List[dict]):
+        for i in range(0, len(rows), INSERT_CHUNK):
+            db.execute(insert(TimelineTable), rows[i:i + INSERT_CHUNK])
+
+    def _trim(self, db, kind: str, owners: Optional[List[str]] = None):
+        # TIMELINE_CAP을 넘는 타임라인만 찾아 오래된 게시물을 제거한다.
+        q = db.query(TimelineTable.owner).filter(TimelineTable.kind == kind)
+        if owners is not None:
+            q = q.filter(TimelineTable.owner.in_(owners))
+        overflow = [i[0] for i in q.group_by(TimelineTable.owner).having(
+            func.count() > TIMELINE_CAP).all()]
+
+        for owner in overflow:
+            last = db.query(TimelineTable.createTime, TimelineTable.post_id).filter(
+                TimelineTable.owner == owner,
+                TimelineTable.kind == kind).order_by(
+                TimelineTable.createTime.desc(),
+                TimelineTable.post_id.desc()).offset(TIMELINE_CAP - 1).first()
+            db.execute(delete(TimelineTable).where(
+                TimelineTable.owner == owner,
+                TimelineTable.kind == kind,
+                tuple_(TimelineTable.createTime, TimelineTable.post_id) < tuple_(*last)))
+
+    # 게시물 배포 (createPost에서 호출)
+    def fanOut(self, post_id: int, author_id: str, createTime: datetime):
+        """
+        게시물을 친구/지역 타임라인에 배포
+        --input
+            - post_id: 게시물 아이디
+            - author_id: 작성자 부모 아이디
+            - createTime: 게시물 생성 시간
+        """
+        db = get_db_session()
+
+        followers = friendGraphService.getFollowerIds(author_id)
+        mainAddr = db.query(ParentTable.mainAddr).filter(
+            ParentTable.parent_id == author_id).scalar()
+
+        rows = [{'owner': follower, 'kind': FRIEND, 'post_id': post_id,
+                 'author_id': author_id, 'createTime': createTime}
+                for follower in followers]
+        if mainAddr:
+            rows.append({'owner': mainAddr, 'kind': DISTRICT, 'post_id': post_id,
+                         'author_id': author_id, 'createTime': createTime})
+        if not rows:
+            return
+
+        try:
+            self._insert(db, rows)
+            if followers:
+                self._trim(db, FRIEND, followers)
+            if mainAddr:
+                self._trim(db, DISTRICT, [mainAddr])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+    # 게시물 삭제 시 모든 타임라인에서 제거 (deletePost에서 호출)
+    def removePost(self, post_id: int):
+        db = get_db_session()
+
+        try:
+            db.execute(delete(TimelineTable).where(
+                TimelineTable.post_id == post_id))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+    # 친구 등록 시 친구의 최근 게시물을 내 타임라인에 채우기
+    def follow(self, parent_id: str, friend: str):
+        db = get_db_session()
+
+        posts = db.query(PostTable.post_id, PostTable.createTime).filter(
+            PostTable.parent_id == friend,
+            PostTable.deleteTime == None).order_by(
+            PostTable.createTime.desc()).limit(TIMELINE_CAP).all()
+
+        try:
+            db.execute(delete(TimelineTable).where(
+                TimelineTable.owner == parent_id,
+                TimelineTable.kind == FRIEND,
+                TimelineTable.author_id == friend))
+            self._insert(db, [{'owner': parent_id, 'kind': FRIEND, 'post_id': post_id,
+                               'author_id': friend, 'createTime': createTime}
+                              for post_id, createTime in posts])
+            self._trim(db, FRIEND, [parent_id])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+    # 친구 삭제 시 친구의 게시물을 내 타임라인에서 제거
+    def unfollow(self, parent_id: str, friend: str):
+        db = get_db_session()
+
+        try:
+            db.execute(delete(TimelineTable).where(
+                TimelineTable.owner == parent_id,
+                TimelineTable.kind == FRIEND,
+                TimelineTable.author_id == friend))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+    # 작성자의 지역이 바뀐 경우 작성자의 게시물을 새 지역 타임라인으로 이동
+    def moveDistrict(self, author_id: str, oldAddr: Optional[str], newAddr: Optional[str]):
+        if oldAddr == newAddr:
+            return
+
+        db = get_db_session()
+
+        try:
+            if oldAddr:
+                db.execute(delete(TimelineTable).where(
+                    TimelineTable.owner == oldAddr,
+                    TimelineTable.kind == DISTRICT,
+                    TimelineTable.author_id == author_id))
+            if newAddr:
+                posts = db.query(PostTable.post_id, PostTable.createTime).filter(
+                    PostTable.parent_id == author_id,
+                    PostTable.deleteTime == None).order_by(
+                    PostTable.createTime.desc()).limit(TIMELINE_CAP).all()
+                self._insert(db, [{'owner': newAddr, 'kind': DISTRICT, 'post_id': post_id,
+                                   'author_id': author_id, 'createTime': createTime}
+                                  for post_id, createTime in posts])
+                self._trim(db, DISTRICT, [newAddr])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+    # 타임라인 읽기
+    def read(self, owner: str, kind: str, size: int, cursor: Optional[str] = None,
+             offset: int = 0, since: Optional[datetime] = None,
+             excludeAuthor: Optional[str] = None) -> Tuple[List[int], Optional[str]]:
+        """
+        타임라인 읽기 (최신순)
+        --input
+            - owner: 부모 아이디(friend) 또는 지역(district)
+            - kind: FRIEND | DISTRICT
+            - size: 가져올 게시물 수
+            - cursor: 이전 결과의 nextCursor (없으면 처음부터)
+            - offset: cursor가 없을 때 건너뛸 게시물 수 (page 방식 호환용)
+            - since: 이 시간 이후에 작성된 게시물만
+            - excludeAuthor: 제외할 작성자 (지역 피드에서 내 게시물 제외)
+        --output
+            - (List<post_id>, nextCursor)
+        """
+        db = get_db_session()
+
+        q = db.query(TimelineTable.post_id, TimelineTable.createTime).filter(
+            TimelineTable.owner == owner,
+            TimelineTable.kind == kind)
+        if since is not None:
+            q = q.filter(TimelineTable.createTime >= since)
+        if excludeAuthor is not None:
+            q = q.filter(TimelineTable.author_id != excludeAuthor)
+
+        try:
+            rows, nextCursor = keyset_page(
+                q, [TimelineTable.createTime, TimelineTable.post_id], cursor, size,
+                key=lambda row: (row[1], row[0]), offset=offset)
+        except ValueError:
+            raise CustomException("Invalid cursor")
+
+        return [row[0] for row in rows], nextCursor
+
+    # 모든 타임라인 재생성
+    def rebuildAll(self) -> int:
+        """
+        모든 타임라인 재생성
+        --output
+            - 배포한 게시물 수
+        """
+        db = get_db_session()
+
+        posts = db.query(PostTable.post_id, PostTable.parent_id,
+                         PostTable.createTime, ParentTable.mainAddr).join(
+            ParentTable, ParentTable.parent_id == PostTable.parent_id).filter(
+            PostTable.deleteTime == None).all()
+
+        followers = {}
+        for owner, friend in db.query(FriendTable.parent_id, FriendTable.friend).all():
+            followers.setdefault(friend, []).append(owner)
+
+        rows = []
+        for post_id, author_id, createTime, mainAddr in posts:
+            for follower in followers.get(author_id, []):
+                rows.append({'owner': follower, 'kind': FRIEND, 'post_id': post_id,
+                             'author_id': author_id, 'createTime': createTime})
+            if mainAddr:
+                rows.append({'owner': mainAddr, 'kind': DISTRICT, 'post_id': post_id,
+                             'author_id': author_id, 'createTime': createTime})
+
+        try:
+            db.execute(delete(TimelineTable))
+            self._insert(db, rows)
+            self._trim(db, FRIEND)
+            self._trim(db, DISTRICT)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+        return len(posts)
@@ -0,0 +1,221 @@
+from typing import Optional
+import os
+import time
+import logging
+import threading
+
+from constants.path import *
+from core.env import env
+from error.exception.customerror import *
+
+
+# AI 의사 RAG 임베딩 모델, FAISS 인덱스 위치
+EMBEDDING_MODEL = 'jhgan/ko-sbert-nli'
+FAISS_INDEX_DIR = f'{ASSET_DIR}/faiss_index'
+
+# 서버가 검색에 사용할 인덱스 종류: flat | ivf_flat | ivf_pq | hnsw
+# flat이 아니면 rebuild.py aidoctor가 flat 인덱스로부터 index-<버전>.<종류>.faiss를 함께 만든다.
+RAG_INDEX_TYPE = env.get("RAG_INDEX_TYPE") or "flat"
+RAG_INDEX_TYPES = ('flat', 'ivf_flat', 'ivf_pq', 'hnsw')
+RAG_INDEX_MMAP = env.get_bool("RAG_INDEX_MMAP", True)
+
+# 검색 파라미터 (IVF가 찾아볼 클러스터 수, HNSW 탐색 폭)
+RAG_NPROBE = env.get_int("RAG_NPROBE", 16)
+RAG_EF_SEARCH = env.get_int("RAG_EF_SEARCH", 64)
+
+# MMR 후보 수, 다양성 (1이면 유사도만 사용)
+RAG_FETCH_K = env.get_int("RAG_FETCH_K", 20)
+RAG_MMR_LAMBDA = env.get_float("RAG_MMR_LAMBDA", 0.9)
+
+# 다른 프로세스(rebuild.py aidoctor)가 교체한 인덱스를 확인하는 주기(초)
+VECTORSTORE_RELOAD_CHECK = env.get_float("VECTORSTORE_RELOAD_CHECK", 30)
+
+logger = logging.getLogger(__name__)
+
+
+# 현재 인덱스 이름 (CURRENT 파일, 없으면 예전 형식의 index.faiss, 둘 다 없으면 None)
+def read_index_name(directory: str = FAISS_INDEX_DIR) -> Optional[str]:
+    try:
+        with open(os.path.join(directory, 'CURRENT'), encoding='UTF-8') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+    return 'index' if os.path.exists(os.path.join(directory, 'index.faiss')) else None
+
+
+# 검색 파라미터 적용 (해당하지 않는 인덱스 종류는 무시)
+def tune_index(index, nprobe: int = RAG_NPROBE, ef_search: int = RAG_EF_SEARCH):
+    import faiss
+
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except RuntimeError:
+        ivf = None
+    if ivf is not None:
+        ivf.nprobe = nprobe
+        # MMR이 후보 임베딩을 reconstruct()로 가져오기 때문에 필요하다.
+        ivf.make_direct_map()
+    if hasattr(index, 'hnsw'):
+        index.hnsw.efSearch = ef_search
+    return index
+
+
+# 서버용 벡터 저장소 불러오기
+def load_vectorstore(embeddings, index_name: str, directory: str = FAISS_INDEX_DIR,
+                     index_type: str = RAG_INDEX_TYPE, mmap: bool = RAG_INDEX_MMAP):
+    """
+    docstore(.pkl)와 검색 인덱스를 불러온다.
+    --input
+        - index_type: flat이 아니면 index-<버전>.<종류>.faiss를 사용 (없으면 flat)
+        - mmap: 인덱스를 메모리에 올리지 않고 파일을 매핑해서 읽는다 (지원하지 않는 종류는 일반 읽기)
+    --output
+        - langchain FAISS 벡터 저장소
+    """
+    import pickle
+    import faiss
+    from langchain_community.vectorstores import FAISS
+
+    path = os.path.join(directory, f'{index_name}.{index_type}.faiss')
+    if index_type == 'flat' or not os.path.exists(path):
+        if index_type != 'flat':
+            logger.warning("%s not found, using flat index", path)
+        path = os.path.join(directory, f'{index_name}.faiss')
+
+    index = None
+    if mmap:
+        try:
+            index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            pass
+    if index is None:
+        index = faiss.read_index(path)
+
+    with open(os.path.join(directory, f'{index_name}.pkl'), 'rb') as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+
+    return FAISS(embeddings, tune_index(index), docstore, index_to_docstore_id)
+
+
+class VectorStoreNotReady(CustomException):
+    pass
+
+
+class VectorStoreService:
+    """
+    AI 의사 RAG 벡터 저장소 (지연 로딩)
+    - import 시에는 sentence-transformers, FAISS를 불러오지 않는다.
+    - 서버 시작 후 warmup()이 백그라운드 스레드에서 임베딩 모델과 FAISS 인덱스를 불러온다.
+    - 준비되기 전의 요청은 get()에서 VectorStoreNotReady를 발생시켜 바로 503으로 응답한다.
+    - 인덱스가 교체되면(CURRENT 변경) 기존 인덱스로 응답하면서 새 인덱스를 불러와 바꾼다.
+    """
+
+    def __init__(self):
+        self._vectorstore = None
+        self._embeddings = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.state = 'idle'  # idle | loading | ready | failed
+        self.error: Optional[str] = None
+        self.loadSeconds: Optional[float] = None
+        self.indexName: Optional[str] = None
+        self.reloading = False
+        self._checkedAt = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.state == 'ready'
+
+    # 백그라운드 스레드에서 불러오기 시작 (이미 불러오는 중이거나 준비되었으면 무시)
+    def warmup(self) -> bool:
+        with self._lock:
+            if self.state in ('loading', 'ready'):
+                return False
+            self.state = 'loading'
+            self.error = None
+            self._thread = threading.Thread(
+                target=self._load, name='vectorstore-warmup', daemon=True)
+            self._thread.start()
+            return True
+
+    # 준비된 상태에서 교체된 인덱스를 백그라운드로 다시 불러온다.
+    def reload(self) -> bool:
+        with self._lock:
+            if self.state != 'ready' or self.reloading:
+                return False
+            self.reloading = True
+            self._thread = threading.Thread(
+                target=self._load, name='vectorstore-reload', daemon=True)
+            self._thread.start()
+            return True
+
+    def _load(self):
+        start = time.monotonic()
+        try:
+            index_name, vectorstore = self.build()
+        except Exception as e:
+            logger.exception("Failed to load vectorstore")
+            with self._lock:
+                # 다시 불러오기에 실패하면 기존 인덱스를 계속 사용한다.
+                if self.reloading:
+                    self.reloading = False
+                else:
+                    self.state = 'failed'
+                self.error = str(e)
+            return
+
+        with self._lock:
+            self._vectorstore = vectorstore
+            self.indexName = index_name
+            self.loadSeconds = round(time.monotonic() - start, 3)
+            self.state = 'ready'
+            self.reloading = False
+        logger.info("vectorstore %s ready in %ss", index_name, self.loadSeconds)
+
+    # 임베딩 모델 (처음 사용할 때 불러온다)
+    def get_embeddings(self):
+        if self._embeddings is None:
+            from langchain_community.embeddings import HuggingFaceEmbeddings
+
+            self._embeddings = HuggingFaceEmbeddings(
+                model_name=EMBEDDING_MODEL,
+                model_kwargs={'device': 'cpu'},
+                encode_kwargs={'normalize_embeddings': True}
+            )
+        return self._embeddings
+
+    # FAISS 인덱스를 불러오거나, 없으면 dataset/aidoctor/data.csv로 만든다. -> (인덱스 이름, 벡터 저장소)
+    def build(self):
+        index_name = read_index_name()
+        if index_name is None:
+            from services.ragindex import RagIndexService
+
+            index_name = RagIndexService().sync()['index']
+
+        return index_name, load_vectorstore(self.get_embeddings(), index_name)
+
+    # 인덱스가 교체되었는지 확인 (VECTORSTORE_RELOAD_CHECK마다)
+    def _check_index(self):
+        now = time.monotonic()
+        if self.reloading or now - self._checkedAt < VECTORSTORE_RELOAD_CHECK:
+            return
+        self._checkedAt = now
+        if read_index_name() not in (None, self.indexName):
+            self.reload()
+
+    # 벡터 저장소 가져오기 (준비되지 않았으면 불러오기를 시작하고 VectorStoreNotReady)
+    def get(self):
+        if self.state != 'ready':
+            self.warmup()
+            raise VectorStoreNotReady("AI doctor is warming up")
+        self._check_index()
+        return self._vectorstore
+
+    def status(self) -> dict:
+        return {'ready': self.ready, 'state': self.state,
+                'index': self.indexName, 'indexType': RAG_INDEX_TYPE,
+                'reloading': self.reloading,
+                'error': self.error, 'loadSeconds': self.loadSeconds}
+
+
+# 프로세스 내에서 공유하는 벡터 저장소
+vectorStoreService = VectorStoreService()
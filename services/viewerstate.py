@@ -0,0 +1,136 @@
+from typing import Optional, List, Dict
+from collections import Counter
+from sqlalchemy import delete
+
+from model.pheart import PHeartTable
+from model.pscript import PScriptTable
+from model.pview import PViewTable
+from services.counter import postCounterService
+from db import get_db_session
+from utils.cache import LRUCache
+from error.exception.customerror import *
+
+
+# 부모가 게시물에 하트/스크랩/조회를 했는지 여부
+STATE_TABLES = {
+    'heart': PHeartTable,
+    'script': PScriptTable,
+    'view': PViewTable,
+}
+
+# 종류별 게시물 카운터 컬럼
+STATE_COUNTERS = {
+    'heart': 'pHeart',
+    'script': 'pScript',
+    'view': 'pView',
+}
+
+# (kind, parent_id, post_id) -> bool
+# 다른 워커에서 변경된 상태도 반영되도록 짧은 TTL을 사용한다.
+state_cache = LRUCache(maxsize=65536, ttl=60)
+
+
+class ViewerStateService:
+
+    # 여러 게시물의 하트/스크랩/조회 여부 한 번에 가져오기
+    def getStates(self, parent_id: str, post_ids: List[int],
+                  kinds: Optional[List[str]] = None) -> Dict[int, Dict[str, bool]]:
+        """
+        여러 게시물의 하트/스크랩/조회 여부 가져오기
+        --input
+            - parent_id: 부모 아이디
+            - post_ids: 게시물 아이디 리스트
+            - kinds: 가져올 종류 ('heart', 'script', 'view'), 없으면 모두
+        --output
+            - {post_id: {heart, script, view}}
+        """
+        post_ids = list(dict.fromkeys(post_ids))
+        states = {post_id: {} for post_id in post_ids}
+        if not post_ids:
+            return states
+
+        db = get_db_session()
+
+        for kind in kinds or STATE_TABLES:
+            table = STATE_TABLES[kind]
+            cached = state_cache.get_many(
+                [(kind, parent_id, post_id) for post_id in post_ids])
+            for (_, _, post_id), value in cached.items():
+                states[post_id][kind] = value
+
+            # 캐시에 없는 게시물만 종류별로 한 번에 조회한다.
+            missing = [post_id for post_id in post_ids if kind not in states[post_id]]
+            if not missing:
+                continue
+
+            found = {i[0] for i in db.query(table.post_id).filter(
+                table.parent_id == parent_id,
+                table.post_id.in_(missing)).distinct().all()}
+            for post_id in missing:
+                states[post_id][kind] = post_id in found
+            state_cache.set_many({(kind, parent_id, post_id): post_id in found
+                                  for post_id in missing})
+
+        return states
+
+    # 하트/스크랩/조회 생성, 삭제 시 캐시 갱신
+    def mark(self, parent_id: str, kind: str, post_id: int, value: bool):
+        state_cache.set((kind, parent_id, int(post_id)), value)
+
+
+    # '1, 2,3' -> [1, 2, 3]
+    def parsePostIds(self, post_ids: str) -> List[int]:
+        try:
+            return [int(num.strip()) for num in post_ids.split(",") if num.strip()]
+        except ValueError:
+            raise CustomException("Invalid post_id")
+
+    # 하트/스크랩/조회 여러 개 한 번에 삭제
+    def deleteStates(self, parent_id: str, kind: str, post_ids: List[int]) -> Dict[str, list]:
+        """
+        하트/스크랩/조회 여러 개 한 번에 삭제 (하나의 트랜잭션)
+        --input
+            - parent_id: 부모 아이디
+            - kind: 'heart' | 'script' | 'view'
+            - post_ids: 게시물 아이디 리스트
+        --output
+            - deleted: 삭제한 행 리스트
+            - missing: 하트/스크랩/조회 기록이 없는 게시물 아이디 리스트
+        """
+        table = STATE_TABLES[kind]
+        post_ids = list(dict.fromkeys(post_ids))
+        if not post_ids:
+            return {'deleted': [], 'missing': []}
+
+        db = get_db_session()
+        pk = table.__mapper__.primary_key[0]
+
+        rows = db.query(table).filter(
+            table.parent_id == parent_id,
+            table.post_id.in_(post_ids)).all()
+
+        try:
+            if rows:
+                # 반환할 행은 세션에서 분리해 두고 기본키로 한 번에 삭제한다.
+                for row in rows:
+                    db.expunge(row)
+                db.execute(delete(table).where(
+                    pk.in_([getattr(row, pk.key) for row in rows])).execution_options(
+                    synchronize_session=False))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+
+        # 게시물별로 모아서 카운터를 한 번씩 보정한다.
+        for post_id, count in Counter(row.post_id for row in rows).items():
+            postCounterService.add(post_id, STATE_COUNTERS[kind], -count)
+        for post_id in post_ids:
+            self.mark(parent_id, kind, post_id, False)
+
+        found = {row.post_id for row in rows}
+        return {'deleted': rows,
+                'missing': [post_id for post_id in post_ids if post_id not in found]}
+
+
+viewerStateService = ViewerStateService()
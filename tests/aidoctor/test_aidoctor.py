@@ -0,0 +1,49 @@
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+from uuid import uuid4
+
+import apis.aidoctor as aidoctor
+from services.aidoctor import StubLLM
+from services.vectorstore import vectorStoreService
+from services.answercache import answerCacheService
+
+
+""" AI doctor ready test """
+def test_ready_warming_up(client, monkeypatch):
+    # 벡터 저장소를 불러오기 전이면 503
+    monkeypatch.setattr(vectorStoreService, 'state', 'idle')
+    monkeypatch.setattr(vectorStoreService, 'warmup', lambda: False)
+
+    response = client.get("/aidoctor/ready")
+
+    assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["ready"] is False
+
+
+""" AI doctor cached answer test """
+def test_chat_cached_answer(client, test_jwt, monkeypatch):
+    monkeypatch.setenv("AIDOCTOR_LLM", "stub")
+    llm = StubLLM()
+    monkeypatch.setattr(aidoctor, '_llm', llm)
+    # 병원 검색(카카오 API)은 호출하지 않는다.
+    monkeypatch.setattr(aidoctor.aiDoctorService, 'kakao_api_request',
+                        lambda region, hospital_name: None)
+
+    # 벡터 저장소가 준비되지 않아도 캐시된 답변은 바로 반환한다.
+    monkeypatch.setattr(vectorStoreService, 'state', 'idle')
+    monkeypatch.setattr(vectorStoreService, 'warmup', lambda: False)
+
+    ask = f"아기가 밤에 자주 깨요 {uuid4()}"
+    answerCacheService.set(ask, None, {"prompt": "cached prompt", "response": "cached response"})
+
+    response = client.post(
+        "/aidoctor/chat",
+        headers={"Authorization": f"Bearer {test_jwt['access_token']}"},
+        json={"ask": ask}
+    )
+
+    assert response.status_code == 200
+    response_json = response.json()
+    assert response_json["llm_prompt"] == "cached prompt"
+    assert response_json["chat"]["ask"] == ask
+    assert response_json["chat"]["res"] == "cached response"
+    assert llm.calls == 0
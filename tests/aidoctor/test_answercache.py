@@ -0,0 +1,106 @@
+import time
+import numpy as np
+import pytest
+
+from services.answercache import AnswerCacheService
+from services.vectorstore import vectorStoreService
+
+
+def vector(*values: float) -> np.ndarray:
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def answer(text: str) -> dict:
+    return {'prompt': text, 'response': f'{text} 답변'}
+
+
+@pytest.fixture(autouse=True)
+def index_name(monkeypatch):
+    monkeypatch.setattr(vectorStoreService, 'indexName', 'index-1')
+
+
+def test_answer_cache_exact():
+    cache = AnswerCacheService(maxsize=4, ttl=60, threshold=0.9)
+    cache.set('아기가  잠을 안 자요?', None, answer('q1'))
+
+    assert cache.get('아기가 잠을 안 자요') == answer('q1')
+    assert cache.get('다른 질문') is None
+    assert cache.get_similar(vector(1, 0)) is None
+    assert (cache.exactHits, cache.semanticHits, cache.misses) == (1, 0, 1)
+
+
+# 코사인 유사도가 threshold 이상인 가장 비슷한 질문의 답변
+def test_answer_cache_similar():
+    cache = AnswerCacheService(maxsize=4, ttl=60, threshold=0.9)
+    cache.set('q1', vector(1, 0, 0), answer('q1'))
+    cache.set('q2', vector(0, 1, 0), answer('q2'))
+
+    assert cache.get_similar(vector(1, 0.1, 0)) == answer('q1')
+    assert cache.get_similar(vector(0.1, 1, 0)) == answer('q2')
+    # cos = 0.707 < 0.9
+    assert cache.get_similar(vector(1, 1, 0)) is None
+    assert cache.get_similar(vector(0, 0, 1)) is None
+    assert (cache.semanticHits, cache.misses) == (2, 2)
+
+    # 1 이상이면 유사 질문 캐시를 쓰지 않는다.
+    cache.threshold = 1
+    assert cache.get_similar(vector(1, 0, 0)) is None
+
+
+# maxsize를 넘으면 가장 오래된 슬롯을 다시 쓰고, 같은 질문은 슬롯을 그대로 쓴다.
+def test_answer_cache_ring_buffer():
+    cache = AnswerCacheService(maxsize=2, ttl=60, threshold=0.9)
+    cache.set('q1', vector(1, 0, 0), answer('q1'))
+    cache.set('q2', vector(0, 1, 0), answer('q2'))
+    cache.set('q2', vector(0, 1, 0), answer('q2'))
+    assert cache._slots == {'q1': 0, 'q2': 1}
+
+    cache.set('q3', vector(0, 0, 1), answer('q3'))
+    assert cache._slots == {'q3': 0, 'q2': 1}
+    assert cache._keys == ['q3', 'q2']
+    assert cache.get_similar(vector(0, 0, 1)) == answer('q3')
+    assert cache.get_similar(vector(0, 1, 0)) == answer('q2')
+
+    # 슬롯이 덮어써진 q1은 유사 질문으로 찾지 않는다.
+    assert cache.get_similar(vector(1, 0, 0)) is None
+
+
+# 답변이 만료되면 같은 질문/유사 질문 모두 찾지 않는다.
+def test_answer_cache_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+
+    cache = AnswerCacheService(maxsize=4, ttl=10, threshold=0.9)
+    cache.set('q1', vector(1, 0), answer('q1'))
+    now[0] = 109
+    assert cache.get('q1') == answer('q1')
+    assert cache.get_similar(vector(1, 0)) == answer('q1')
+
+    now[0] = 111
+    assert cache.get('q1') is None
+    assert cache.get_similar(vector(1, 0)) is None
+
+
+# FAISS 인덱스가 바뀌면 모두 지운다.
+def test_answer_cache_index_change(monkeypatch):
+    cache = AnswerCacheService(maxsize=4, ttl=60, threshold=0.9)
+    cache.set('q1', vector(1, 0), answer('q1'))
+    assert cache.get('q1') == answer('q1')
+
+    monkeypatch.setattr(vectorStoreService, 'indexName', 'index-2')
+    assert cache.get('q1') is None
+    assert cache.get_similar(vector(1, 0)) is None
+    assert cache._slots == {} and cache._next == 0
+    assert cache.stats()['size'] == 0
+
+    cache.set('q2', vector(0, 1), answer('q2'))
+    assert cache.get_similar(vector(0, 1)) == answer('q2')
+
+
+def test_answer_cache_disabled():
+    cache = AnswerCacheService(maxsize=0)
+    cache.set('q1', vector(1, 0), answer('q1'))
+    assert not cache.enabled
+    assert cache.get('q1') is None
+    assert cache.get_similar(vector(1, 0)) is None
@@ -0,0 +1,86 @@
+import asyncio
+import numpy as np
+
+from services.embedding import EmbeddingDiskStore, EmbeddingService
+
+
+def vector(value: float) -> np.ndarray:
+    return np.full(2, value, dtype=np.float32)
+
+
+def test_disk_store_reload(tmp_path):
+    store = EmbeddingDiskStore(str(tmp_path))
+    store.set_many({'a': vector(1), 'b': vector(2)})
+
+    store = EmbeddingDiskStore(str(tmp_path))
+    found = store.get_many(['a', 'b', 'c'])
+    assert len(store) == 2
+    assert found['a'].tolist() == [1, 1]
+    assert found['b'].tolist() == [2, 2]
+    assert 'c' not in found
+
+
+# 쓰는 도중 종료되어 남은 벡터/키는 잘라내고, 새 행은 그 다음부터 매긴다.
+def test_disk_store_interrupted_write(tmp_path):
+    store = EmbeddingDiskStore(str(tmp_path))
+    store.set_many({'a': vector(1)})
+
+    # 벡터는 썼지만 키는 쓰지 못한 행, 쓰다가 끊긴 키
+    with open(tmp_path / 'vectors.f32', 'ab') as f:
+        f.write(vector(2).tobytes())
+    with open(tmp_path / 'keys.txt', 'a', encoding='UTF-8') as f:
+        f.write('b')
+
+    store = EmbeddingDiskStore(str(tmp_path))
+    assert len(store) == 1
+    assert (tmp_path / 'vectors.f32').stat().st_size == 2 * 4
+    assert (tmp_path / 'keys.txt').read_text(encoding='UTF-8') == 'a\n'
+
+    store.set_many({'c': vector(3)})
+    assert EmbeddingDiskStore(str(tmp_path)).get_many(['a', 'c'])['c'].tolist() == [3, 3]
+    assert store.get_many(['c'])['c'].tolist() == [3, 3]
+
+
+# 같은 디렉토리를 쓰는 두 워커
+def test_disk_store_shared_directory(tmp_path):
+    first = EmbeddingDiskStore(str(tmp_path))
+    second = EmbeddingDiskStore(str(tmp_path))
+
+    first.set_many({'a': vector(1)})
+    second.set_many({'b': vector(2), 'a': vector(9)})
+    first.set_many({'c': vector(3)})
+
+    for store in (first, second, EmbeddingDiskStore(str(tmp_path))):
+        found = store.get_many(['a', 'b', 'c'])
+        assert {key: value.tolist() for key, value in found.items()} == {
+            'a': [1, 1], 'b': [2, 2], 'c': [3, 3]}
+
+
+# 동시에 들어온 질문은 한 번에 계산하고, 같은 질문은 한 번만 계산한다.
+def test_embedding_batch_dedupe(tmp_path):
+    calls = []
+
+    def encode(texts):
+        calls.append(list(texts))
+        return [[len(text), 1.0] for text in texts]
+
+    service = EmbeddingService(encode=encode, directory=str(tmp_path))
+
+    async def run():
+        return await asyncio.gather(
+            service.embed('아기가 열이 나요?'),
+            service.embed('아기가  열이 나요'),
+            service.embed_many(['기저귀 발진', '아기가 열이 나요']))
+
+    first, second, many = asyncio.run(run())
+
+    assert calls == [['아기가 열이 나요', '기저귀 발진']]
+    assert first.tolist() == second.tolist() == many[1].tolist()
+    assert service.stats()['batches'] == 1
+    assert service.stats()['encoded'] == 2
+
+    # 다시 만든 서비스는 디스크에서 가져온다.
+    service = EmbeddingService(encode=encode, directory=str(tmp_path))
+    assert asyncio.run(service.embed('기저귀 발진')).tolist() == many[0].tolist()
+    assert len(calls) == 1
+    assert service.stats()['diskHits'] == 1
@@ -0,0 +1,158 @@
+import csv
+import hashlib
+import os
+import numpy as np
+import pytest
+
+pytest.importorskip('faiss')
+pytest.importorskip('pandas')
+pytest.importorskip('langchain_community')
+
+import services.ragindex as ragindex
+from services.ragindex import RagIndexService
+from services.vectorstore import vectorStoreService, read_index_name
+from error.exception.customerror import CustomException
+
+
+class FakeEmbeddings:
+    """질문 해시로 만든 정규화 벡터를 돌려주는 임베딩 모델 (임베딩한 질문을 기록)"""
+
+    def __init__(self):
+        self.embedded = []
+
+    def _vector(self, text: str) -> list:
+        seed = int(hashlib.sha1(text.encode('UTF-8')).hexdigest()[:8], 16)
+        vector = np.random.default_rng(seed).random(8, dtype=np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    embeddings = FakeEmbeddings()
+    monkeypatch.setattr(vectorStoreService, 'get_embeddings', lambda: embeddings)
+    monkeypatch.setattr(ragindex, 'EMBED_BATCH', 2)
+    return embeddings
+
+
+def write_csv(path, rows, with_id: bool = False):
+    header = ['id', '탭', '질문', '답변'] if with_id else ['탭', '질문', '답변']
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def make_service(tmp_path, rows, with_id: bool = False) -> RagIndexService:
+    write_csv(tmp_path / 'data.csv', rows, with_id)
+    return RagIndexService(directory=str(tmp_path / 'index'),
+                           csv_path=str(tmp_path / 'data.csv'))
+
+
+def question_id(text: str) -> str:
+    return hashlib.sha1(text.encode('UTF-8')).hexdigest()[:16]
+
+
+def docstore_ids(vectorstore) -> set:
+    return set(vectorstore.index_to_docstore_id.values())
+
+
+# 아이디 컬럼이 없으면 질문 해시를 쓰고, 같은 질문은 순서대로 번호를 붙인다.
+def test_rag_read_rows(tmp_path):
+    service = make_service(tmp_path, [('수면', 'q1', 'a'), ('수유', 'q1', 'b'),
+                                      ('수면', 'q1', 'c'), ('수면', 'q2', 'd')])
+    rows = service.read_rows()
+
+    base = question_id('q1')
+    assert list(rows) == [base, f'{base}-1', f'{base}-2', question_id('q2')]
+    assert rows[f'{base}-1']['metadata'] == {'탭': '수유', '질문': 'q1', '답변': 'b'}
+    assert rows[base]['fingerprint'] != rows[f'{base}-1']['fingerprint']
+
+    service = make_service(tmp_path, [(7, '수면', 'q1', 'a')], with_id=True)
+    assert list(service.read_rows()) == ['7']
+
+
+# 추가/변경/삭제된 행만 임베딩하고 manifest를 저장한다.
+def test_rag_sync(tmp_path, embeddings):
+    service = make_service(tmp_path, [('수면', 'q1', 'a'), ('수면', 'q2', 'b'),
+                                      ('수유', 'q3', 'c')])
+    result = service.sync()
+    assert (result['added'], result['changed'], result['deleted']) == (3, 0, 0)
+    assert embeddings.embedded == ['q1', 'q2', 'q3']
+    assert read_index_name(service.directory) == result['index']
+
+    rows = service.read_rows()
+    assert service._load_manifest(result['index']) == {
+        doc_id: row['fingerprint'] for doc_id, row in rows.items()}
+
+    # 변경 없음: 다시 임베딩하지 않고 현재 인덱스를 그대로 쓴다.
+    embeddings.embedded.clear()
+    assert service.sync()['index'] == result['index']
+    assert embeddings.embedded == []
+
+    # q2 답변 변경, q3 삭제, q4 추가
+    write_csv(tmp_path / 'data.csv', [('수면', 'q1', 'a'), ('수면', 'q2', 'B'),
+                                      ('수유', 'q4', 'd')])
+    result = service.sync()
+    assert (result['added'], result['changed'], result['deleted']) == (1, 1, 1)
+    assert sorted(embeddings.embedded) == ['q2', 'q4']
+
+    rows = service.read_rows()
+    assert docstore_ids(result['vectorstore']) == set(rows)
+    assert result['vectorstore'].docstore.search(question_id('q2')).metadata['답변'] == 'B'
+
+    # 다시 불러와도 manifest와 docstore가 맞는다.
+    manifest = service._load_manifest(read_index_name(service.directory))
+    assert manifest == {doc_id: row['fingerprint'] for doc_id, row in rows.items()}
+    assert docstore_ids(service._load(embeddings, result['index'])) == set(manifest)
+
+    # full이면 모두 다시 임베딩한다.
+    embeddings.embedded.clear()
+    assert service.sync(full=True)['added'] == 3
+    assert sorted(embeddings.embedded) == ['q1', 'q2', 'q4']
+
+
+def test_rag_delete(tmp_path, embeddings):
+    service = make_service(tmp_path, [('수면', 'q1', 'a'), ('수면', 'q2', 'b')])
+    with pytest.raises(CustomException):
+        service.delete([question_id('q1')])
+
+    first = service.sync()['index']
+    result = service.delete([question_id('q1'), question_id('q1'), 'missing'])
+    assert result['deleted'] == [question_id('q1')]
+    assert result['missing'] == ['missing']
+    assert result['index'] != first
+
+    manifest = service._load_manifest(result['index'])
+    assert list(manifest) == [question_id('q2')]
+    assert docstore_ids(service._load(embeddings, result['index'])) == {question_id('q2')}
+
+    # 없는 아이디만 지우면 인덱스를 바꾸지 않는다.
+    assert service.delete(['missing'])['index'] == result['index']
+
+
+# 현재 인덱스와 이전 KEEP_VERSIONS개만 남긴다.
+def test_rag_cleanup(tmp_path, embeddings):
+    service = make_service(tmp_path, [('수면', 'q1', 'a')])
+
+    names = []
+    for answer in ('a', 'b', 'c', 'd'):
+        write_csv(tmp_path / 'data.csv', [('수면', 'q1', answer)])
+        names.append(service.sync()['index'])
+
+    kept = names[-(ragindex.KEEP_VERSIONS + 1):]
+    versions = {name.split('.')[0] for name in os.listdir(service.directory)
+                if name.startswith('index-')}
+    assert versions == set(kept)
+    for name in kept:
+        assert os.path.exists(os.path.join(service.directory, f'{name}.faiss'))
+        assert os.path.exists(os.path.join(service.directory, f'{name}.pkl'))
+        assert service._load_manifest(name) is not None
+    for name in names[:-len(kept)]:
+        assert service._load_manifest(name) is None
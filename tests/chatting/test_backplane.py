@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+
+from services.backplane import Backplane, MemoryBackplane
+
+
+# 같은 채널을 구독한 모든 핸들러에 전달
+def test_memory_backplane_publish():
+    backplane = MemoryBackplane()
+    received = []
+
+    async def first(channel, data):
+        received.append(('first', channel, data))
+
+    async def second(channel, data):
+        received.append(('second', channel, data))
+
+    async def run():
+        await backplane.start({'chat:room': first, 'chat:parent': first})
+        await backplane.start({'chat:room': second})
+        await backplane.publish('chat:room', 'hello')
+        await backplane.publish('chat:parent', 'alert')
+        await backplane.publish('chat:unknown', 'ignored')
+
+    asyncio.run(run())
+    assert received == [('first', 'chat:room', 'hello'),
+                        ('second', 'chat:room', 'hello'),
+                        ('first', 'chat:parent', 'alert')]
+
+
+# 구독을 닫으면 더 이상 전달하지 않는다.
+def test_memory_backplane_close():
+    backplane = MemoryBackplane()
+    received = []
+
+    async def handler(channel, data):
+        received.append(data)
+
+    async def run():
+        await backplane.start({'chat:room': handler})
+        await backplane.close()
+        await backplane.publish('chat:room', 'hello')
+
+    asyncio.run(run())
+    assert received == []
+
+
+# 접속 등록/해제는 등록한 워커만 할 수 있다.
+def test_memory_backplane_presence():
+    backplane = MemoryBackplane()
+
+    async def run():
+        assert await backplane.claim('parent', 'node-a', 60)
+        # 같은 워커에서 다시 연결
+        assert await backplane.claim('parent', 'node-a', 60)
+        assert not await backplane.claim('parent', 'node-b', 60)
+        assert await backplane.get_node('parent') == 'node-a'
+
+        # 다른 워커의 해제는 무시
+        await backplane.release('parent', 'node-b')
+        assert await backplane.get_node('parent') == 'node-a'
+
+        await backplane.release('parent', 'node-a')
+        assert await backplane.get_node('parent') is None
+        assert await backplane.claim('parent', 'node-b', 60)
+        assert await backplane.get_node('parent') == 'node-b'
+
+    asyncio.run(run())
+
+
+# 필수 메서드를 구현하지 않은 백플레인은 만들 수 없다.
+def test_backplane_abstract():
+    class PublishOnly(Backplane):
+        async def publish(self, channel: str, data: str):
+            pass
+
+    with pytest.raises(TypeError):
+        Backplane()
+    with pytest.raises(TypeError):
+        PublishOnly()
@@ -0,0 +1,81 @@
+import json
+import asyncio
+import pytest
+
+from error.exception.customerror import CustomException
+from services.chatprotocol import ChatProtocol
+from services.chat import ChatService
+
+
+# 지원하지 않는 버전/인코딩
+def test_protocol_invalid():
+    with pytest.raises(CustomException):
+        ChatProtocol(version=3)
+    with pytest.raises(CustomException):
+        ChatProtocol(version=2, encoding='xml')
+
+
+# v1: 봉투 없이 문자열 하나를 보낸다.
+def test_protocol_v1_message():
+    chatService = ChatService()
+    websocket = object()
+    protocol = ChatProtocol(version=1)
+    assert not protocol.enveloped
+
+    async def run():
+        chatService.protocols[websocket] = protocol
+        chatService.send_queues[websocket] = asyncio.Queue()
+        chatService.send_message(websocket, {'type': 'chat', 'content': '안녕'}, text='chat: 닉네임: 안녕')
+        chatService.send_message(websocket, {'type': 'ack', 'id': 'a1'})
+        return [chatService.send_queues[websocket].get_nowait() for _ in range(2)]
+
+    text, fallback = asyncio.run(run())
+    assert text == 'chat: 닉네임: 안녕'
+    assert json.loads(fallback) == {'type': 'ack', 'id': 'a1'}
+    assert protocol.decode('{"type": "chat", "content": "안녕"}') == [{'type': 'chat', 'content': '안녕'}]
+
+
+# v2 json: 봉투 하나는 객체로, 여러 개는 리스트로 보낸다.
+def test_protocol_v2_json():
+    chatService = ChatService()
+    websocket = object()
+    protocol = ChatProtocol(version=2)
+    assert protocol.enveloped
+
+    async def run():
+        chatService.protocols[websocket] = protocol
+        chatService.send_queues[websocket] = asyncio.Queue()
+        chatService.send_message(websocket, {'type': 'chat', 'id': 'c1', 'content': '안녕'})
+        return chatService.send_queues[websocket].get_nowait()
+
+    message = asyncio.run(run())
+    assert message == {'v': 2, 'type': 'chat', 'id': 'c1', 'content': '안녕'}
+
+    frame = protocol.encode([message])
+    assert isinstance(frame, str)
+    assert json.loads(frame) == message
+    assert protocol.decode(frame) == [message]
+
+    messages = [message, {'v': 2, 'type': 'ack', 'id': 'c1'}]
+    assert protocol.decode(protocol.encode(messages)) == messages
+
+
+def test_protocol_v2_msgpack():
+    msgpack = pytest.importorskip('msgpack')
+    protocol = ChatProtocol(version=2, encoding='msgpack')
+
+    messages = [{'v': 2, 'type': 'chat', 'id': 'c1', 'content': '안녕'},
+                {'v': 2, 'type': 'ack', 'id': 'c1'}]
+    frame = protocol.encode(messages)
+    assert isinstance(frame, bytes)
+    assert msgpack.unpackb(frame, raw=False) == messages
+    assert protocol.decode(frame) == messages
+    assert protocol.decode(protocol.encode(messages[:1])) == messages[:1]
+
+
+def test_protocol_invalid_frame():
+    protocol = ChatProtocol(version=2)
+    with pytest.raises(CustomException):
+        protocol.decode('not json')
+    with pytest.raises(CustomException):
+        protocol.decode('[1, 2]')
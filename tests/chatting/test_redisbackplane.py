@@ -0,0 +1,226 @@
+import asyncio
+import pytest
+
+from services.backplane import (RespConnection, RespError, RedisBackplane,
+                                RELEASE_SCRIPT, REFRESH_SCRIPT)
+
+
+class RespStub:
+    """
+    테스트용 RESP 서버 (asyncio.start_server)
+    - SUBSCRIBE/PUBLISH/SET(NX, XX, EX)/GET/DEL/SELECT/AUTH
+    - EVAL은 RELEASE_SCRIPT, REFRESH_SCRIPT만 같은 동작으로 처리한다.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.ttl = {}
+        self.subscribers = {}
+        self.writers = set()
+        self.commands = []
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f'redis://127.0.0.1:{port}/0'
+
+    async def close(self):
+        for writer in list(self.writers):
+            writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    # 구독 연결을 끊는다. (재연결 확인용)
+    def drop_subscribers(self):
+        for writers in self.subscribers.values():
+            for writer in writers:
+                writer.close()
+        self.subscribers.clear()
+
+    @staticmethod
+    def _bulk(value) -> bytes:
+        if value is None:
+            return b'$-1\r\n'
+        value = str(value).encode()
+        return b'$%d\r\n%s\r\n' % (len(value), value)
+
+    async def _read_command(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            size = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(size + 2))[:-2].decode())
+        return args
+
+    def _set(self, key, value, options) -> bytes:
+        options = [option.upper() for option in options]
+        if 'NX' in options and key in self.data:
+            return b'$-1\r\n'
+        if 'XX' in options and key not in self.data:
+            return b'$-1\r\n'
+        self.data[key] = value
+        if 'EX' in options:
+            self.ttl[key] = int(options[options.index('EX') + 1])
+        return b'+OK\r\n'
+
+    def _reply(self, writer, args) -> bytes:
+        command = args[0].upper()
+        if command in ('SELECT', 'AUTH'):
+            return b'+OK\r\n'
+        if command == 'SUBSCRIBE':
+            reply = b''
+            for i, channel in enumerate(args[1:]):
+                self.subscribers.setdefault(channel, set()).add(writer)
+                reply += b'*3\r\n' + self._bulk('subscribe') + self._bulk(channel) + b':%d\r\n' % (i + 1)
+            return reply
+        if command == 'PUBLISH':
+            receivers = list(self.subscribers.get(args[1], ()))
+            for receiver in receivers:
+                receiver.write(b'*3\r\n' + self._bulk('message') + self._bulk(args[1]) + self._bulk(args[2]))
+            return b':%d\r\n' % len(receivers)
+        if command == 'SET':
+            return self._set(args[1], args[2], args[3:])
+        if command == 'GET':
+            return self._bulk(self.data.get(args[1]))
+        if command == 'DEL':
+            return b':%d\r\n' % (self.data.pop(args[1], None) is not None)
+        if command == 'EVAL':
+            script, key, node_id = args[1], args[3], args[4]
+            if self.data.get(key) != node_id:
+                return b':0\r\n' if script == RELEASE_SCRIPT else b'$-1\r\n'
+            if script == RELEASE_SCRIPT:
+                del self.data[key]
+                return b':1\r\n'
+            if script == REFRESH_SCRIPT:
+                return self._set(key, node_id, ['XX', 'EX', args[5]])
+        return b'-ERR unknown command\r\n'
+
+    async def _handle(self, reader, writer):
+        self.writers.add(writer)
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                self.commands.append(args)
+                writer.write(self._reply(writer, args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 10))
+
+
+# RESP2 응답 파싱
+def test_resp_read():
+    async def main():
+        conn = RespConnection('redis://localhost')
+        conn.reader = asyncio.StreamReader()
+        conn.reader.feed_data(b'+OK\r\n:42\r\n$5\r\nhello\r\n$-1\r\n'
+                              b'*3\r\n$7\r\nmessage\r\n$4\r\nroom\r\n$6\r\n\xec\x95\x88\xeb\x85\x95\r\n'
+                              b'*-1\r\n-ERR wrong type\r\n')
+        conn.reader.feed_eof()
+
+        assert await conn.read() == 'OK'
+        assert await conn.read() == 42
+        assert await conn.read() == 'hello'
+        assert await conn.read() is None
+        assert await conn.read() == ['message', 'room', '안녕']
+        assert await conn.read() is None
+        with pytest.raises(RespError):
+            await conn.read()
+        with pytest.raises(ConnectionError):
+            await conn.read()
+
+    run(main())
+
+
+# 파이프라인 중간에 오류가 있어도 나머지 응답을 모두 읽고, 연결을 계속 사용할 수 있다.
+def test_resp_pipeline_error():
+    async def main():
+        stub = RespStub()
+        url = await stub.start()
+
+        conn = RespConnection(url)
+        await conn.connect()
+        with pytest.raises(RespError):
+            await conn.execute_many([('SET', 'a', '1'), ('UNKNOWN',), ('GET', 'a')])
+        assert await conn.execute('GET', 'a') == '1'
+        assert await conn.execute_many([('SET', 'b', '2'), ('GET', 'b')]) == ['OK', '2']
+
+        conn.close()
+        await stub.close()
+
+    run(main())
+
+
+# 접속 등록/갱신/해제는 등록한 워커만 할 수 있다.
+def test_redis_presence():
+    async def main():
+        stub = RespStub()
+        url = await stub.start()
+        first, second = RedisBackplane(url), RedisBackplane(url)
+
+        assert await first.claim('parent', 'node-a', 60)
+        assert await first.claim('parent', 'node-a', 60)
+        assert not await second.claim('parent', 'node-b', 60)
+        assert await second.get_node('parent') == 'node-a'
+
+        # 다른 워커가 등록한 접속은 갱신/해제하지 않는다.
+        await second.refresh(['parent'], 'node-b', 90)
+        await second.release('parent', 'node-b')
+        assert await first.get_node('parent') == 'node-a'
+        assert stub.ttl['chat:presence:parent'] == 60
+
+        await first.refresh(['parent', 'missing'], 'node-a', 90)
+        assert stub.ttl['chat:presence:parent'] == 90
+        assert await first.get_node('missing') is None
+
+        await first.release('parent', 'node-a')
+        assert await first.get_node('parent') is None
+        assert await second.claim('parent', 'node-b', 60)
+
+        await first.close()
+        await second.close()
+        await stub.close()
+
+    run(main())
+
+
+# 구독 연결이 끊기면 다시 연결해서 메시지를 받는다.
+def test_redis_subscribe_reconnect():
+    async def main():
+        stub = RespStub()
+        url = await stub.start()
+        backplane = RedisBackplane(url)
+        received = asyncio.Queue()
+
+        async def handler(channel, data):
+            await received.put((channel, data))
+
+        async def subscribed():
+            while not stub.subscribers.get('chat:room'):
+                await asyncio.sleep(0.01)
+
+        await backplane.start({'chat:room': handler})
+        await subscribed()
+        await backplane.publish('chat:room', 'first')
+        assert await received.get() == ('chat:room', 'first')
+
+        stub.drop_subscribers()
+        await subscribed()
+        await backplane.publish('chat:room', 'second')
+        assert await received.get() == ('chat:room', 'second')
+
+        await backplane.close()
+        await stub.close()
+
+    run(main())
@@ -0,0 +1,41 @@
+import asyncio
+from datetime import datetime
+from sqlalchemy import select, insert
+
+import db
+from model.parent import ParentTable
+from model.post import PostTable
+
+
+# ASYNC_DB_URL(sqlite+aiosqlite)로 비동기 세션 사용
+def test_async_db_session_sqlite(tmp_path, monkeypatch):
+    monkeypatch.setenv("ASYNC_DB_URL", f"sqlite+aiosqlite:///{tmp_path}/async.db")
+    monkeypatch.setattr(db, "AsyncSessionLocal", None)
+
+    async def run():
+        async with db.get_async_db_session() as session:
+            async with session.bind.begin() as conn:
+                await conn.run_sync(db.DB_Base.metadata.create_all,
+                                    tables=[ParentTable.__table__, PostTable.__table__])
+
+            await session.execute(insert(ParentTable).values(
+                parent_id='async-parent', password='x', email='async@test.com',
+                name='name', nickname='nick', signInMethod='email', emailVerified=True))
+            await session.execute(insert(PostTable).values(
+                parent_id='async-parent', reveal=0, title='async title',
+                createTime=datetime.now()))
+            await session.commit()
+
+        # 새 세션에서 다시 읽기
+        async with db.get_async_db_session() as session:
+            nickname = await session.scalar(select(ParentTable.nickname).where(
+                ParentTable.parent_id == 'async-parent'))
+            titles = (await session.scalars(select(PostTable.title).where(
+                PostTable.parent_id == 'async-parent'))).all()
+            await session.bind.dispose()
+
+        return nickname, titles
+
+    nickname, titles = asyncio.run(run())
+    assert nickname == 'nick'
+    assert titles == ['async title']
@@ -0,0 +1,53 @@
+import time
+
+from utils.cache import LRUCache
+
+
+# maxsize를 넘으면 가장 오래 사용하지 않은 값부터 제거
+def test_lru_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+
+    cache.set('c', 3)
+    assert 'b' not in cache
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_lru_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+
+    cache = LRUCache(maxsize=10, ttl=5)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=20)
+
+    now[0] += 6
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    assert len(cache) == 1
+
+    now[0] += 20
+    assert cache.get('b', 'missing') == 'missing'
+
+
+def test_lru_many_and_stats():
+    cache = LRUCache(maxsize=10)
+    cache.set_many({'a': 1, 'b': None})
+
+    # None도 값으로 저장한다.
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'b': None}
+
+    cache.delete('a')
+    assert cache.get('a') is None
+
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 2
+    assert stats['hitRate'] == 0.5
+
+    cache.clear()
+    assert len(cache) == 0
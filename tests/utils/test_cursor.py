@@ -0,0 +1,33 @@
+from datetime import datetime
+import json
+import base64
+import pytest
+
+from utils.cursor import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    createTime = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor(createTime, 42, 'snapshot')
+
+    assert isinstance(cursor, str)
+    assert '=' not in cursor
+    assert decode_cursor(cursor, 3) == [createTime, 42, 'snapshot']
+
+
+def test_cursor_empty():
+    assert decode_cursor(None, 2) is None
+    assert decode_cursor('', 2) is None
+
+
+# 형식이 잘못되었거나 정렬 키 개수가 다르면 ValueError
+@pytest.mark.parametrize('cursor', ['not-a-cursor', '!!!', encode_cursor(1, 2, 3)])
+def test_cursor_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+def test_cursor_not_list():
+    cursor = base64.urlsafe_b64encode(json.dumps({'id': 1}).encode()).decode()
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 1)
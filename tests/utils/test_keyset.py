@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from model.post import PostTable
+from utils.cursor import keyset_page
+
+
+@pytest.fixture
+def db():
+    engine = create_engine('sqlite://')
+    PostTable.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+
+    # 같은 createTime이 있어도 post_id로 순서가 정해진다.
+    start = datetime(2024, 1, 1)
+    session.add_all([PostTable(post_id=i, parent_id='parent', reveal=0, title=f'post {i}',
+                               createTime=start + timedelta(minutes=i // 2))
+                     for i in range(1, 8)])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def read_all(db, descending: bool, size: int = 3):
+    columns = [PostTable.createTime, PostTable.post_id]
+    pages, cursor = [], None
+    while True:
+        rows, cursor = keyset_page(db.query(PostTable), columns, cursor, size,
+                                   key=lambda post: (post.createTime, post.post_id),
+                                   descending=descending)
+        pages.append([post.post_id for post in rows])
+        if cursor is None:
+            return pages
+
+
+def test_keyset_descending(db):
+    assert read_all(db, descending=True) == [[7, 6, 5], [4, 3, 2], [1]]
+
+
+def test_keyset_ascending(db):
+    assert read_all(db, descending=False) == [[1, 2, 3], [4, 5, 6], [7]]
+
+
+# 마지막 페이지가 size와 같으면 다음 페이지는 비어 있다.
+def test_keyset_exact_pages(db):
+    assert read_all(db, descending=True, size=7) == [[7, 6, 5, 4, 3, 2, 1], []]
+
+
+# cursor가 없으면 offset으로 건너뛴다. (page 방식 호환)
+def test_keyset_offset(db):
+    rows, cursor = keyset_page(db.query(PostTable), [PostTable.createTime, PostTable.post_id],
+                               None, 2, key=lambda post: (post.createTime, post.post_id),
+                               offset=4)
+    assert [post.post_id for post in rows] == [3, 2]
+    assert cursor is not None
+
+
+def test_keyset_invalid_cursor(db):
+    with pytest.raises(ValueError):
+        keyset_page(db.query(PostTable), [PostTable.createTime, PostTable.post_id],
+                    'invalid', 2, key=lambda post: (post.createTime, post.post_id))
@@ -0,0 +1,30 @@
+from collections import Counter
+
+from utils.ngram import normalize_text, ngrams, ngram_counts
+from services.searchindex import SearchIndexService, TITLE_WEIGHT, HASH_WEIGHT, BODY_WEIGHT, BODY_MAX_COUNT
+
+
+def test_normalize_text():
+    assert normalize_text('ＡＢＣ 아기-수면!!') == 'abc 아기 수면'
+    assert normalize_text(None) == ''
+
+
+def test_ngrams():
+    assert ngrams('아기수면') == ['아기', '기수', '수면']
+    # n보다 짧은 단어는 그대로 사용
+    assert ngrams('a 잠 아기') == ['a', '잠', '아기']
+    assert ngrams('아기수면', n=3) == ['아기수', '기수면']
+    assert ngram_counts('아기 아기') == Counter({'아기': 2})
+
+
+# 제목 > 해시태그 > 본문 순으로 가중치를 주고, 본문 반복은 BODY_MAX_COUNT까지만 센다.
+def test_build_grams_weight():
+    weights = SearchIndexService().buildGrams('아기', '아기,수면', '아기 ' * 10 + '수면')
+
+    assert weights['아기'] == TITLE_WEIGHT + HASH_WEIGHT + BODY_MAX_COUNT * BODY_WEIGHT
+    assert weights['수면'] == HASH_WEIGHT + BODY_WEIGHT
+
+
+# 본문의 사진 태그는 인덱싱하지 않는다.
+def test_build_grams_photo():
+    assert SearchIndexService().buildGrams('', None, '![[photo123.png]]') == Counter()
@@ -1,4 +1,7 @@
 from .log import *
 from .typing import *
 from .generate_cry_sample import *
-from .date import *
\ No newline at end of file
+from .date import *
+from .cache import *
+from .cursor import *
+from .ngram import *
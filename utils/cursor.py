@@ -0,0 +1,78 @@
+import json
+import base64
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    keyset 페이지네이션 위치를 불투명한 문자열로 변환
+    --input
+        - values: 마지막으로 반환한 행의 정렬 키 (예: createTime, id)
+    --output
+        - urlsafe base64 문자열
+    """
+    payload = [{'dt': v.isoformat()} if isinstance(v, datetime) else v
+               for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], length: int) -> Optional[List[Any]]:
+    """
+    encode_cursor로 만든 문자열을 정렬 키 리스트로 복원
+    --input
+        - cursor: 커서 문자열 (None이나 빈 문자열이면 None 반환)
+        - length: 정렬 키 개수
+    --output
+        - 정렬 키 리스트, 형식이 잘못된 경우 ValueError
+    """
+    if not cursor:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw.decode('utf-8'))
+    except Exception:
+        raise ValueError("invalid cursor")
+
+    if not isinstance(payload, list) or len(payload) != length:
+        raise ValueError("invalid cursor")
+
+    return [datetime.fromisoformat(v['dt']) if isinstance(v, dict) and 'dt' in v else v
+            for v in payload]
+
+
+def keyset_page(query, columns: list, cursor: Optional[str], size: int,
+                key: Callable[[Any], tuple], offset: int = 0, descending: bool = True):
+    """
+    SQLAlchemy 쿼리를 columns 기준 keyset 페이지네이션으로 조회
+    --input
+        - query: 정렬/limit이 적용되지 않은 쿼리
+        - columns: 정렬 키 컬럼 (마지막 컬럼은 유일해야 함. 예: [createTime, post_id])
+        - cursor: 이전 페이지의 nextCursor (없으면 처음부터)
+        - size: 가져올 행 수
+        - key: 행에서 정렬 키 값을 꺼내는 함수
+        - offset: cursor가 없을 때 건너뛸 행 수 (page 방식 호환용)
+        - descending: True면 내림차순(최신순), False면 오름차순
+    --output
+        - (rows, nextCursor), cursor 형식이 잘못된 경우 ValueError
+    """
+    from sqlalchemy import tuple_
+
+    last = decode_cursor(cursor, len(columns))
+    if last is not None:
+        if descending:
+            query = query.filter(tuple_(*columns) < tuple_(*last))
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*last))
+
+    query = query.order_by(*[column.desc() if descending else column.asc()
+                             for column in columns])
+    if last is None and offset:
+        query = query.offset(offset)
+
+    rows = query.limit(size).all()
+
+    nextCursor = encode_cursor(*key(rows[-1])) if rows and len(rows) == size else None
+    return rows, nextCursor
@@ -0,0 +1,35 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import List
+
+
+# 한글/영문/숫자 이외의 문자는 구분자로 취급한다.
+_SEPARATOR = re.compile(r'[^0-9a-zA-Z가-힣ㄱ-ㆎ]+')
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return _SEPARATOR.sub(' ', text).strip()
+
+
+def ngrams(text: str, n: int = 2) -> List[str]:
+    """
+    문자 n-gram 생성 (띄어쓰기가 불규칙한 한글 검색용)
+    --input
+        - text: 원문
+        - n: gram 길이. n보다 짧은 단어는 단어 자체를 gram으로 사용
+    --output
+        - gram 리스트 (중복 포함, 등장 순서)
+    """
+    grams = []
+    for token in normalize_text(text).split():
+        if len(token) <= n:
+            grams.append(token)
+        else:
+            grams.extend(token[i:i + n] for i in range(len(token) - n + 1))
+    return grams
+
+
+def ngram_counts(text: str, n: int = 2) -> Counter:
+    return Counter(ngrams(text, n))
@@ -1,4 +1,21 @@
 import os
+import tempfile
 
 def create_file_exist(file_path: str) -> bool:
-    return os.path.exists(file_path)
\ No newline at end of file
+    return os.path.exists(file_path)
+
+
+def write_file_atomic(file_path: str, data: str, encoding: str = 'UTF-8'):
+    # 같은 디렉토리에 임시 파일을 쓴 뒤 교체하여, 읽는 쪽이 쓰는 도중의 파일을 보지 않도록 한다.
+    dir_name = os.path.dirname(file_path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise